@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+\descr: Loader of the networks in the compact binary format (.hgb), which is produced by contrib/tohig.py
+	alongside the .hig. The file is memory-mapped and the arrays are zero-copy views of the mapping.
+
+	.hgb format (native byte order, the arrays are aligned to 8 bytes):
+		header  - magic 'HGB1', uint32 flags (bit 0: weighted), int64 nodes number (n),
+			int64 links number (m), int64 max length of the node ids (w)
+		ids  - n node ids, each is null-padded to w bytes, the node index is its position
+		offsets  - n + 1 int64 offsets of the node links (CSR row pointers)
+		neighbors  - m int32 indices of the destination nodes
+		weights  - m float32 weights of the links, present only for the weighted networks
+	Links of the edges are stored in both directions, links of the arcs only from their source node.
+
+\author: (c) Artem Lutov <artem@exascale.info>
+\organizations: eXascale Infolab <http://exascale.info/>, Lumais <http://www.lumais.com/>, ScienceWise <http://sciencewise.info/>
+\date: 2015-12
+"""
+from __future__ import print_function  # Required for stderr output, must be the first import
+import sys
+import os
+import struct
+from collections import namedtuple
+import numpy as np
+
+
+EXTBINNET = '.hgb'  # Extension of the binary network files
+MAGIC = b'HGB1'
+HEADER = struct.Struct('=4sIqqq')  # magic, flags, nodes, links, idwidth
+FLAG_WEIGHTED = 0b1
+ALIGNMENT = 8
+
+
+Graph = namedtuple('Graph', 'ids offsets neighbors weights')
+"""Network in the CSR form
+
+ids  - node ids array (bytes), the node index is its position
+offsets  - offsets of the node links in the neighbors, n + 1 items
+neighbors  - destination nodes indices of the links
+weights  - weights of the links or None for the unweighted network
+"""
+
+
+def binName(fname):
+	"""Name of the binary network file corresponding to the network file
+
+	fname  - network file name in any format
+	"""
+	return os.path.splitext(fname)[0] + EXTBINNET
+
+
+def aligned(pos):
+	"""Position aligned to the arrays alignment"""
+	return (pos + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def load(fname):
+	"""Load the binary network memory-mapping the file
+
+	fname  - .hgb network file name
+
+	return  - Graph with the read-only arrays mapped to the file
+	"""
+	if not os.path.getsize(fname):
+		raise ValueError('The binary network is empty: ' + fname)
+	mm = np.memmap(fname, dtype=np.uint8, mode='r')
+	magic, flags, nodes, links, idwidth = HEADER.unpack(mm[:HEADER.size].tostring())
+	if magic != MAGIC:
+		raise ValueError('Invalid format of the binary network: ' + fname)
+	pos = aligned(HEADER.size)
+	ids = np.frombuffer(mm, dtype='S{}'.format(max(idwidth, 1)), count=nodes, offset=pos)
+	pos = aligned(pos + nodes * idwidth)
+	offsets = np.frombuffer(mm, dtype=np.int64, count=nodes + 1, offset=pos)
+	pos += offsets.nbytes
+	neighbors = np.frombuffer(mm, dtype=np.int32, count=links, offset=pos)
+	pos = aligned(pos + neighbors.nbytes)
+	weights = None
+	if flags & FLAG_WEIGHTED:
+		weights = np.frombuffer(mm, dtype=np.float32, count=links, offset=pos)
+	return Graph(ids, offsets, neighbors, weights)
+
+
+def loadFresh(fname):
+	"""Load the binary form of the network if it is not older than the network file
+
+	fname  - network file name in any format
+
+	return  - Graph or None if the binary form is absent or outdated
+	"""
+	binfile = binName(fname)
+	if binfile == fname:
+		return load(fname)
+	if not os.path.exists(binfile) or os.path.getmtime(binfile) < os.path.getmtime(fname):
+		return None
+	return load(binfile)
+
+
+if __name__ == '__main__':
+	if len(sys.argv) == 2:
+		graph = load(sys.argv[1])
+		print('nodes: {}, links: {}, weighted: {}'.format(len(graph.ids), len(graph.neighbors)
+			, graph.weights is not None))
+	else:
+		print('Usage: {} <network.hgb>\n  Outputs the summary of the binary network'.format(sys.argv[0]))
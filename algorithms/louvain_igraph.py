@@ -3,6 +3,16 @@
 """
 \descr: Implementation of the Louvain algorithm using igraph framework with input/
 	output formats adapted to the NMIs evaluation.
+
+	Multiple randomized runs are performed on the single loading of the network: the run 0 clusters
+	the network in its original vertex order, each following run permutes the vertex order by the random
+	generator seeded with <seed> + <run>, the seeds are logged to reproduce the runs. The runs are executed
+	either sequentially or by the fork-based pool of the worker processes sharing the loaded graph
+	(copy-on-write).
+
+	The binary form of the network (.hgb) produced by contrib/tohig.py is loaded in bulk instead of the
+	ncol network if it is not older than the network file, otherwise the undirected ncol network is
+	loaded from the parsed files cache (parsecache).
 \author: Artem Lutov <luart@ya.ru>
 \organizations: eXascale lab <http://exascale.info/>, ScienceWise <http://sciencewise.info/>, Lumais <http://www.lumais.com/>
 \date: 2015-07
@@ -10,11 +20,21 @@
 from __future__ import print_function  # Required for stderr output, must be the first import
 import sys
 import os  # Pathes processing
+import random
+from multiprocessing import Pool, cpu_count
+import numpy as np
 import igraph as ig
+import hgb
+import parsecache
+from modularity import parseNet
 
 
 inpfmt = 'ncol'  # NCOL input format
 outpfile = "clusters.cnl"  # Default file for the communities output
+runmark = '{r}'  # Placeholder of the run number in the output name
+runsuffix = '_r' + runmark  # Suffix of the run results if the placeholder is not specified
+
+_graph = None  # Loaded graph shared with the forked worker processes
 
 
 def parseParams(args):
@@ -27,6 +47,9 @@ def parseParams(args):
 		perlev  - output communities per level instead of the solid hierarchy
 		outpcoms  - base name of the output file
 		outpext  - extension of the output file
+		runs  - number of the randomized runs
+		seed  - base seed of the random generator of the runs, None if not specified
+		workers  - number of the worker processes executing the runs, 0 - sequential execution
 	"""
 	assert isinstance(args, (tuple, list)) and args, 'Input arguments must be specified'
 	network = None
@@ -34,6 +57,9 @@ def parseParams(args):
 	dirnet = False  # ~ Asymmetric links
 	perlev = None
 	outpcoms, outpext = os.path.splitext(outpfile)
+	runs = 1
+	seed = None
+	workers = 0
 
 	for arg in args:
 		# Validate input format
@@ -71,81 +97,263 @@ def parseParams(args):
 				if not netname:
 					raise ValueError('Unexpected argument: ' + arg)
 				outpcoms = os.path.join(outpcoms, netname)
+		elif arg[1] in 'rs':
+			if len(arg) <= 3 or arg[2] != '=':
+				raise ValueError('Unexpected argument: ' + arg)
+			val = int(arg[3:])
+			if arg[1] == 'r':
+				runs = val
+				if runs <= 0:
+					raise ValueError('Positive number of the runs is expected: ' + arg)
+			else:
+				seed = val
+		elif arg[1] == 'p':
+			workers = cpu_count()
+			if len(arg) > 2:
+				if len(arg) == 3 or arg[2] != '=':
+					raise ValueError('Unexpected argument: ' + arg)
+				workers = int(arg[3:])
+				if workers < 0:
+					raise ValueError('Non-negative number of the workers is expected: ' + arg)
 		else:
 			raise ValueError('Unexpected argument: ' + arg)
 
 	if not network:
 		raise ValueError('Input network file name must be specified')
 
-	return network, netfmt, dirnet, perlev, outpcoms, outpext
+	return network, netfmt, dirnet, perlev, outpcoms, outpext, runs, seed, workers
 
 
-def louvain(*args):
-	"""Execute Louvain algorithm on the specified network and output resulting communities to the specified file"""
-	network, netfmt, dirnet, perlev, outpcoms, outpext = parseParams(args)
+def binGraph(bgraph):
+	"""Undirected igraph Graph of the binary network
 
-	print('Starting Louvain (igraph) clustering:'
-		'\n\t{} network: {}'
-		'\n\tnetwork format: {}'
-		'\n\tperlev output: {}, communities: {}'
-		.format('directed' if dirnet else 'undirected', network, netfmt
-			, perlev, outpcoms + outpext))
-	# Load Data from simple real-world networks
-	graph = None
-	if netfmt == 'ncol':
-		graph = ig.Graph.Read_Ncol(network, directed=dirnet)  # , weights=False
-	elif netfmt == 'pajek':
-		graph = ig.Graph.Read_Pajek(network)
-	else:
-		raise ValueError('Unknown network format: ' + netfmt)
+	bgraph  - hgb.Graph
+
+	return  - igraph Graph with the named vertices
+	"""
+	n = len(bgraph.ids)
+	srcs = np.repeat(np.arange(n, dtype=np.int32), np.diff(bgraph.offsets))
+	graph = ig.Graph(n=n, edges=np.column_stack((srcs, bgraph.neighbors)).tolist(), directed=False)
+	graph.vs['name'] = bgraph.ids.tolist()
+	if bgraph.weights is not None:
+		graph.es['weight'] = bgraph.weights.tolist()
+	# Edges are stored in both directions in the binary form, opposite arcs are averaged
+	graph.simplify(multiple=True, loops=False, combine_edges='mean')
+	return graph
+
+
+def buildGraph(arrays):
+	"""Build the undirected igraph Graph from the parsed network
+
+	arrays  - dict of the arrays produced by modularity.parseNet()
+
+	return  - igraph Graph with the named vertices
+	"""
+	# The symmetric adjacency matrix holds the links in both directions like the binary form
+	return binGraph(hgb.Graph(arrays['ids'], arrays['indptr'], arrays['indices'], arrays['data']))
+
+
+def louvainRun(graph, run, seed):
+	"""Louvain clustering of the graph in the randomly permuted vertex order
+
+	graph  - the graph to be clustered
+	run  - run number, the vertex order is not permuted for the run 0
+	seed  - seed of the random generator of the run
+
+	return  - hierarchy levels of the clustering (VertexClustering of the graph)
+	"""
+	random.seed(seed)  # igraph uses the random generator of Python
+	if not run:
+		return graph.community_multilevel(return_levels=True)
+	perm = range(graph.vcount())
+	random.shuffle(perm)
+	# Vertex i of the graph is the vertex perm[i] of the permuted graph
+	hier = graph.permute_vertices(perm).community_multilevel(return_levels=True)
+	perm = np.array(perm)
+	return [ig.VertexClustering(graph, np.asarray(lev.membership)[perm].tolist(), modularity=lev.q) for lev in hier]
+
+
+def levelCommunities(membership):
+	"""Group nodes of the clustering level into the communities by the membership vector
+
+	membership  - community ids of the nodes
+
+	return  - nodes, bounds
+		nodes  - node ids ordered by the communities, ascending within each community
+		bounds  - offsets of the communities in the nodes, len(communities) + 1 items
+	"""
+	membership = np.asarray(membership, dtype=np.int64)
+	nodes = np.argsort(membership, kind='mergesort')
+	if not len(nodes):
+		return nodes, np.zeros(1, dtype=np.int64)
+	bounds = np.flatnonzero(np.diff(membership[nodes])) + 1
+	return nodes, np.concatenate(([0], bounds, [len(nodes)]))
+
+
+def descriptors(nodes, bounds):
+	"""Descriptors (len, sum, sum2) of the communities for the fast comparison,
+	the sums are evaluated modulo 2^64
 
-	hier = graph.community_multilevel(return_levels=True)
-	# Output levels
-	#fname = 'level'
+	nodes  - node ids ordered by the communities
+	bounds  - offsets of the communities in the nodes
 
-	communs = []  # All distinct communities of the hierarchy
+	return  - list of the descriptors
+	"""
+	if len(bounds) <= 1:
+		return []
+	ids = nodes.astype(np.uint64)
+	sums = np.add.reduceat(ids, bounds[:-1])
+	sums2 = np.add.reduceat(ids * ids, bounds[:-1])
+	return zip(np.diff(bounds).tolist(), sums.tolist(), sums2.tolist())
+
+
+def writeCommunities(fout, names, nodes, bounds, comms=None):
+	"""Write communities to the file, a line of the space separated node names per community
+
+	fout  - output file
+	names  - node names indexed by the node ids
+	nodes  - node ids ordered by the communities
+	bounds  - offsets of the communities in the nodes
+	comms  - indices of the communities to be written, all communities by default
+	"""
+	cnames = [names[nid] for nid in nodes.tolist()]
+	bounds = bounds.tolist()
+	if comms is None:
+		comms = xrange(len(bounds) - 1)
+	fout.writelines(' '.join(cnames[bounds[ic]:bounds[ic + 1]]) + '\n' for ic in comms)
+
+
+def outputLevels(graph, hier, perlev, outpcoms, outpext, prefix=''):
+	"""Output the hierarchy levels of the clustering
+
+	graph  - the clustered graph
+	hier  - hierarchy levels of the clustering
+	perlev  - output communities per level instead of the solid hierarchy
+	outpcoms  - base name of the output file
+	outpext  - extension of the output file
+	prefix  - prefix of the statistics messages
+	"""
+	communs = []  # All distinct communities of the hierarchy: (nodes, bounds, comms) per level
 	descrs = set()  # Communs descriptors for the fast comparison
 	props = 0  # Number of propagated (duplicated communities)
-
+	names = graph.vs['name']  # Fetch names of all nodes at once
 
 	# Create output dir if not exists
 	outdir = os.path.split(outpcoms)[0]
 	if outdir and not os.path.exists(outdir):
-		os.makedirs(outdir)
+		try:
+			os.makedirs(outdir)
+		except OSError:
+			# The parent dirs might be created concurrently by the workers
+			if not os.path.isdir(outdir):
+				raise
 
 	for i, lev in enumerate(hier):
 		# Output statistics to the stderr
-		print('Q: {:.6f}, lev: {}. {}.'.format(hier[i].q, i, hier[i].summary()), file=sys.stderr)
+		print('{}Q: {:.6f}, lev: {}. {}.'.format(prefix, hier[i].q, i, hier[i].summary()), file=sys.stderr)
+		nodes, bounds = levelCommunities(lev.membership)
 		if perlev:
 			with open('{}_{}{}'.format(outpcoms, i, outpext), 'w') as fout:
-				for cl in lev:
-					fout.write(' '.join([graph.vs[nid]['name'] for nid in cl]))
-					fout.write('\n')
+				writeCommunities(fout, names, nodes, bounds)
 		else:
 			# Merge all hier levels excluding identical communities, use idNums comparison (len, sum, sum2)
-			for cl in lev:
-				clen = len(cl)
-				csum = 0
-				csum2 = 0
-				for nid in cl:
-					csum += nid
-					csum2 += nid * nid
-				dsr = (clen, csum, csum2)
+			comms = []
+			for ic, dsr in enumerate(descriptors(nodes, bounds)):
 				if i == 0 or dsr not in descrs:
 					descrs.add(dsr)
-					communs.append(cl)
+					comms.append(ic)
 				else:
 					props += 1
+			communs.append((nodes, bounds, comms))
 	# Output communs
 	del descrs
 	if not perlev:
 		if props:
-			print('Number of propagated (duplicated) communities in the hieratchy: '
-				+ str(props), file=sys.stderr)
+			print('{}Number of propagated (duplicated) communities in the hieratchy: {}'
+				.format(prefix, props), file=sys.stderr)
 		with open(outpcoms + outpext, 'w') as fout:
-			for cl in communs:
-				fout.write(' '.join([graph.vs[nid]['name'] for nid in cl]))
-				fout.write('\n')
+			for nodes, bounds, comms in communs:
+				writeCommunities(fout, names, nodes, bounds, comms)
+
+
+def execRun(task):
+	"""Execute the Louvain run on the shared graph and output its results
+
+	task  - (run, seed, perlev, outpcoms, outpext, prefix)
+		run  - run number
+		seed  - seed of the random generator of the run
+		perlev  - output communities per level instead of the solid hierarchy
+		outpcoms  - base name of the output file with the placeholder of the run number
+		outpext  - extension of the output file
+		prefix  - prefix of the statistics messages
+	"""
+	run, seed, perlev, outpcoms, outpext, prefix = task
+	outpcoms = outpcoms.replace(runmark, str(run))
+	outputLevels(_graph, louvainRun(_graph, run, seed), perlev, outpcoms, outpext, prefix)
+
+
+def louvain(*args):
+	"""Execute Louvain algorithm on the specified network and output resulting communities to the specified file"""
+	global _graph
+	network, netfmt, dirnet, perlev, outpcoms, outpext, runs, seed, workers = parseParams(args)
+	if seed is None:
+		seed = random.SystemRandom().randint(0, sys.maxint - runs)
+	workers = min(workers, runs) if workers != 1 else 0
+	if runs > 1 and runmark not in outpcoms:
+		# Note: the run suffix should be distinct from the shuffle suffix of the network (.<shuffle>)
+		if perlev:
+			outdir, outpcoms = os.path.split(outpcoms)
+			outpcoms = os.path.join(outdir + runsuffix, outpcoms + runsuffix)
+		else:
+			outpcoms += runsuffix
+
+	print('Starting Louvain (igraph) clustering:'
+		'\n\t{} network: {}'
+		'\n\tnetwork format: {}'
+		'\n\tperlev output: {}, communities: {}'
+		'\n\truns: {}, seed: {}, workers: {}'
+		.format('directed' if dirnet else 'undirected', network, netfmt
+			, perlev, outpcoms + outpext, runs, seed, workers))
+	# Load Data from simple real-world networks
+	graph = None
+	if netfmt == 'ncol':
+		bgraph = hgb.loadFresh(network) if not dirnet else None
+		if bgraph is not None:
+			print('The binary form of the network is loaded: ' + hgb.binName(network))
+			graph = binGraph(bgraph)
+			del bgraph
+		elif not dirnet:
+			graph = parsecache.load(network, parseNet, buildGraph)
+		else:
+			graph = ig.Graph.Read_Ncol(network, directed=dirnet)  # , weights=False
+	elif netfmt == 'pajek':
+		graph = ig.Graph.Read_Pajek(network)
+	else:
+		raise ValueError('Unknown network format: ' + netfmt)
+
+	# Record seeds of the runs to make them reproducible
+	tasks = []
+	for run in range(runs):
+		prefix = ''
+		if runs > 1:
+			prefix = 'Run {}, '.format(run)
+			print('{}seed: {}'.format(prefix, seed + run), file=sys.stderr)
+		tasks.append((run, seed + run, perlev, outpcoms, outpext, prefix))
+	# The graph is shared with the forked workers copy-on-write
+	_graph = graph
+	try:
+		if workers:
+			pool = Pool(workers)
+			try:
+				pool.map(execRun, tasks, chunksize=1)
+			finally:
+				pool.close()
+				pool.join()
+		else:
+			for task in tasks:
+				execRun(task)
+	finally:
+		_graph = None
 	print('Hierarchy levels have been successfully outputted')
 
 
@@ -153,7 +361,8 @@ if __name__ == '__main__':
 	if len(sys.argv) > 1:
 		louvain(*sys.argv[1:])
 	else:
-		print('\n'.join(('Usage: {} -i[{{a, s}}]=<input_network> [-f={{ncol, pajek}}] [-o[l]=<output_communities>]',
+		print('\n'.join(('Usage: {} -i[{{a, s}}]=<input_network> [-f={{ncol, pajek}}] [-o[l]=<output_communities>]'
+			' [-r=<runs>] [-s=<seed>] [-p[=<workers>]]',
 			'  -i[X]=<input_network>  - file of the input network in the format: <src_id> <dst_id> [<weight>]',
 			'    Xa  - asymmetric network links (in/outbound weights of the link migh differ), arcs',
 			'    Xs  - symmetric network links, edges (but both directions can be specified in the input file). Default option.',
@@ -164,5 +373,11 @@ if __name__ == '__main__':
 			'    ncol  - ncol format: <src_id> <dst_id> [<weight>]',
 			'    pajek  - pajek format',
 			'  -o[l]=<output_communities>  - output all distinct communities of the hierarchy to the <output_communities>. Default: {}',
-			'    ol  - output all communities in each hier level to the seaparate file <output_communities>/<output_communities>_<lev_num>'
+			'    ol  - output all communities in each hier level to the seaparate file <output_communities>/<output_communities>_<lev_num>',
+			'  -r=<runs>  - number of the randomized runs on the single loading of the network. Default: 1',
+			'    The run 0 keeps the vertex order, each following run permutes it. {{r}} placeholder in the'
+			' <output_communities> is replaced with the run number <r>, otherwise _r<r> is appended to the output name',
+			'  -s=<seed>  - base seed of the random generator, the run <r> uses <seed> + <r>. Default: random, logged',
+			'  -p[=<workers>]  - execute the runs by the fork-based pool of the worker processes sharing the loaded graph.'
+			' Default: sequential execution, the number of CPUs if <workers> is omitted'
 		)).format(sys.argv[0], inpfmt, outpfile))
@@ -0,0 +1,218 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+\descr: Modularity (Q) of the clusterings of the undirected (possibly weighted) network.
+
+	Q = sum_c (L_c / 2w - (D_c / 2w)^2), where L_c is the doubled weight of the links inside the
+	cluster c, D_c is the total degree (weight) of the cluster nodes and w is the total weight
+	of the network links. The membership of the node shared by K clusters is split evenly among
+	them (1/K per cluster), which yields the standard modularity for the non-overlapping clusters.
+	ATTENTION: the value on the overlapping clusters can differ from the modularity evaluated by
+	`hirecs -e`, which has its own treatment of the shared nodes. The values coincide for the
+	non-overlapping clusters, where both yield the standard modularity. So the benchmark stores
+	this modularity as the distinct measure (mod_n).
+
+	The network is parsed into the CSR adjacency matrix, which is cached in the binary form and
+	in the memory of the process (reused by the persistent workers), all levels of the clustering are evaluated in a single call by the
+	sparse nodes membership matrices.
+
+	Input network formats (by the file extension):
+		hig  - HiReCS format: /Nodes, /Edges and /Arcs sections of the links: <src_id>> <dst_id>[:<weight>] ...
+		nse  - newline / space/tab separated possibly weighted edges: <src_id> <dst_id> [<weight>]
+		nsa  - newline / space/tab separated possibly weighted arcs: <src_id> <dst_id> [<weight>]
+		hgb  - binary CSR network produced by contrib/tohig.py, which is used instead of the specified
+			network if it is not older than the network file
+	Arcs are symmetrized averaging the weights of the opposite arcs, self-links are considered as arcs
+	(the node weight) like in the .hig produced by contrib/tohig.py.
+
+	Output: a line per each clustering (in the order of the arguments):
+		<Q>	<clustering>
+
+\author: (c) Artem Lutov <artem@exascale.info>
+\organizations: eXascale Infolab <http://exascale.info/>, Lumais <http://www.lumais.com/>, ScienceWise <http://sciencewise.info/>
+\date: 2015-12
+"""
+from __future__ import print_function  # Required for stderr output, must be the first import
+import sys
+import os
+import numpy as np
+from scipy import sparse
+
+import parsecache
+import hgb
+from onmi import loadCover
+
+
+def parseLinks(fname):
+	"""Parse links of the network
+
+	fname  - network file name in the .hig, .nse or .nsa format
+
+	return
+		nodes  - mapping of the node ids to their indices
+		srcs  - indices of the source nodes of the links
+		dsts  - indices of the destination nodes of the links
+		weights  - weights of the links
+		arcs  - flags of the links being arcs (otherwise edges), self-links are arcs
+	"""
+	nodes = {}
+	srcs = []
+	dsts = []
+	weights = []
+	arcs = []
+	higfmt = os.path.splitext(fname)[1] == '.hig'
+	isarc = not higfmt and os.path.splitext(fname)[1] != '.nse'
+	with open(fname, 'r') as fnet:
+		for ln in fnet:
+			ln = ln.strip()
+			if not ln or ln[0] in '#%':
+				continue
+			if higfmt:
+				if ln[0] == '/':
+					sect = ln[1:].split(None, 1)[0].lower()
+					if sect in ('edges', 'arcs'):
+						isarc = sect == 'arcs'
+					continue
+				src, links = ln.split('>', 1)
+				src = nodes.setdefault(src.strip(), len(nodes))
+				for link in links.split():
+					link = link.split(':', 1)
+					srcs.append(src)
+					dsts.append(nodes.setdefault(link[0], len(nodes)))
+					weights.append(float(link[1]) if len(link) == 2 else 1.)
+					arcs.append(isarc or dsts[-1] == src)
+			else:
+				link = ln.split()
+				if len(link) < 2:
+					raise SyntaxError('Invalid format of the link specification: ' + ln)
+				srcs.append(nodes.setdefault(link[0], len(nodes)))
+				dsts.append(nodes.setdefault(link[1], len(nodes)))
+				weights.append(float(link[2]) if len(link) >= 3 else 1.)
+				arcs.append(isarc or srcs[-1] == dsts[-1])
+	return nodes, srcs, dsts, weights, arcs
+
+
+def parseNet(fname):
+	"""Parse the network into the arrays of the symmetric CSR adjacency matrix
+
+	fname  - network file name
+
+	return  - dict of the arrays:
+		ids  - node ids ordered by their indices
+		indptr, indices, data  - CSR adjacency matrix
+	"""
+	if os.path.splitext(fname)[1] == hgb.EXTBINNET:
+		return binArrays(hgb.load(fname))
+	nodes, srcs, dsts, weights, arcs = parseLinks(fname)
+	srcs = np.array(srcs, dtype=np.int32)
+	dsts = np.array(dsts, dtype=np.int32)
+	weights = np.array(weights, dtype=np.float64)
+	# Edges are counted in both directions, opposite arcs are averaged
+	weights[np.array(arcs, dtype=np.bool_)] *= 0.5
+	n = len(nodes)
+	adj = sparse.coo_matrix((weights, (srcs, dsts)), shape=(n, n)).tocsr()
+	ids = [None] * n
+	for nd, i in nodes.iteritems():
+		ids[i] = nd
+	ids = np.array(ids, dtype=str)
+	adj = (adj + adj.T).tocsr()
+	return {'ids': ids, 'indptr': adj.indptr, 'indices': adj.indices, 'data': adj.data}
+
+
+def binArrays(graph):
+	"""Arrays of the symmetric CSR adjacency matrix of the binary network
+
+	graph  - hgb.Graph
+
+	return  - dict of the arrays like parseNet()
+	"""
+	ids = graph.ids
+	n = len(ids)
+	weights = graph.weights.astype(np.float64) if graph.weights is not None \
+		else np.ones(len(graph.neighbors), dtype=np.float64)
+	# Edges are stored in both directions in the binary form, so all links are considered as arcs
+	adj = sparse.csr_matrix((weights * 0.5, graph.neighbors, graph.offsets), shape=(n, n))
+	adj = (adj + adj.T).tocsr()
+	return {'ids': ids, 'indptr': adj.indptr, 'indices': adj.indices, 'data': adj.data}
+
+
+def buildNet(arrays):
+	"""Build the network from the parsed arrays
+
+	arrays  - dict of the arrays produced by parseNet()
+
+	return
+		nodes  - mapping of the node ids to their indices
+		adj  - symmetric CSR adjacency matrix of the network
+	"""
+	n = len(arrays['ids'])
+	nodes = {nd: i for i, nd in enumerate(arrays['ids'].tolist())}
+	return nodes, sparse.csr_matrix((arrays['data'], arrays['indices'], arrays['indptr']), shape=(n, n))
+
+
+def loadNet(fname):
+	"""Load the network from the parsed files cache, the binary form of the network is preferred if exists
+
+	fname  - network file name
+
+	return
+		nodes  - mapping of the node ids to their indices
+		adj  - symmetric CSR adjacency matrix of the network
+	"""
+	# The memory-mapped binary form is loaded in bulk, so it is not cached
+	graph = hgb.loadFresh(fname)
+	if graph is not None:
+		return buildNet(binArrays(graph))
+	return parsecache.load(fname, parseNet, buildNet)
+
+
+def modularity(adj, cover):
+	"""Modularity of the clusters
+
+	adj  - symmetric CSR adjacency matrix of the network
+	cover  - list of the arrays of the node indices of the clusters
+
+	return  - modularity
+	"""
+	n = adj.shape[0]
+	# Omit the nodes missed in the network
+	cover = [cl[cl < n] for cl in cover]
+	cover = [cl for cl in cover if len(cl)]
+	w2 = adj.sum()  # Doubled total weight
+	if not cover or not w2:
+		return 0.
+	indices = np.concatenate(cover)
+	indptr = np.zeros(len(cover) + 1, dtype=np.int64)
+	np.cumsum([len(cl) for cl in cover], out=indptr[1:])
+	# Split the membership of the shared nodes evenly
+	shares = 1. / np.bincount(indices, minlength=n)[indices]
+	membs = sparse.csc_matrix((shares, indices, indptr), shape=(n, len(cover)))
+	inner = membs.multiply(adj.dot(membs)).sum()
+	degs = np.asarray(adj.sum(axis=1)).ravel()
+	cldegs = membs.T.dot(degs)
+	return inner / w2 - np.square(cldegs / w2).sum()
+
+
+def evalModularity(*args):
+	"""Evaluate modularity of the clusterings
+
+	args  - file names of the network and clusterings
+	"""
+	if len(args) < 2:
+		raise ValueError('The network and clusterings must be specified')
+	netnodes, adj = loadNet(args[0])
+	for clsfile in args[1:]:
+		cover = loadCover(clsfile, netnodes.copy())
+		print('{:.6f}\t{}'.format(modularity(adj, cover), clsfile))
+
+
+if __name__ == '__main__':
+	if len(sys.argv) > 2:
+		evalModularity(*sys.argv[1:])
+	else:
+		print('\n'.join(('Evaluates modularity of the clusterings of the undirected network\n',
+			'Usage: {} <network> <clusters1> [<clusters2> ...]',
+			'  <network>  - network in the .hig, .nse or .nsa format',
+			'  <clustersX>  - clusters to be evaluated',
+			'Output: a line per each clustering: <Q>\\t<clustering>'
+		)).format(sys.argv[0]))
@@ -0,0 +1,227 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+\descr: Overlapping NMI (McDaid et al. "Normalized Mutual Information to evaluate overlapping
+	community finding algorithms", arXiv:1110.2515) of the clusterings to the ground truth,
+	compatible with the onmi tool: NMI_max normalized by the max of the entropies (default NMI
+	of onmi) and NMI_sum normalized by the mean of the entropies (onmi_sum).
+
+	Each cluster is considered as a binary random variable over the nodes. The clusters of all
+	levels of the clustering are evaluated in a single call by the sparse nodes membership matrices,
+	the parsed ground truth is cached in the binary form and in the memory of the process (reused by
+	the persistent workers).
+
+	Output: a line per each clustering (in the order of the arguments):
+		<NMI_max>	<NMI_sum>	<clustering>
+
+\author: (c) Artem Lutov <artem@exascale.info>
+\organizations: eXascale Infolab <http://exascale.info/>, Lumais <http://www.lumais.com/>, ScienceWise <http://sciencewise.info/>
+\date: 2015-12
+"""
+from __future__ import print_function  # Required for stderr output, must be the first import
+import sys
+import numpy as np
+from scipy import sparse
+
+import parsecache
+
+
+_CHUNK = 1024 * 1024  # Max number of the pairs of clusters evaluated at once, bounds the memory consumption
+
+
+def loadCover(fname, nodes):
+	"""Load clusters (communities) from the file
+
+	fname  - file name of the clusters, each line is a cluster: <node1> <node2> ...
+		Lines starting with '#' are comments, <cluster_id>> prefix and :<share> suffix of the nodes are omitted
+	nodes  - mapping of the node ids to their indices, extended with the new nodes
+
+	return  - list of the arrays of node indices of the distinct non-empty clusters
+	"""
+	cover = []
+	descrs = set()  # Clusters descriptors to skip duplicates
+	with open(fname, 'r') as fcls:
+		for ln in fcls:
+			ln = ln.strip()
+			if not ln or ln[0] == '#':
+				continue
+			members = set()
+			for nd in ln.split():
+				if nd[-1] == '>':
+					continue  # Cluster id
+				nd = nd.split(':', 1)[0]
+				members.add(nodes.setdefault(nd, len(nodes)))
+			if not members:
+				continue
+			members = np.array(sorted(members), dtype=np.int32)
+			descr = members.tostring()
+			if descr not in descrs:
+				descrs.add(descr)
+				cover.append(members)
+	return cover
+
+
+def parseCover(fname):
+	"""Parse clusters into the arrays
+
+	fname  - file name of the clusters
+
+	return  - dict of the arrays:
+		ids  - node ids ordered by their indices
+		indptr  - offsets of the clusters in the indices
+		indices  - node indices of the clusters
+	"""
+	nodes = {}
+	cover = loadCover(fname, nodes)
+	ids = [None] * len(nodes)
+	for nd, i in nodes.iteritems():
+		ids[i] = nd
+	indptr = np.zeros(len(cover) + 1, dtype=np.int64)
+	np.cumsum([len(cl) for cl in cover], out=indptr[1:])
+	return {'ids': np.array(ids, dtype=str), 'indptr': indptr
+		, 'indices': np.concatenate(cover) if cover else np.empty(0, dtype=np.int32)}
+
+
+def buildCover(arrays):
+	"""Build clusters from the parsed arrays
+
+	arrays  - dict of the arrays produced by parseCover()
+
+	return
+		nodes  - mapping of the node ids to their indices
+		cover  - list of the arrays of the node indices of the clusters
+	"""
+	nodes = {nd: i for i, nd in enumerate(arrays['ids'].tolist())}
+	indptr = arrays['indptr']
+	cover = np.split(arrays['indices'], indptr[1:-1]) if len(indptr) >= 2 else []
+	return nodes, cover
+
+
+def groundTruth(fname):
+	"""Load the ground truth from the parsed files cache
+
+	fname  - file name of the ground truth clusters
+
+	return
+		nodes  - mapping of the node ids to their indices
+		cover  - list of the arrays of the node indices of the clusters
+	"""
+	return parsecache.load(fname, parseCover, buildCover)
+
+
+def membership(cover, nnodes):
+	"""Sparse nodes membership matrix of the clusters
+
+	cover  - list of the arrays of the node indices of the clusters
+	nnodes  - number of the nodes
+
+	return  - CSC matrix nnodes x len(cover)
+	"""
+	indices = np.concatenate(cover) if cover else np.empty(0, dtype=np.int32)
+	indptr = np.zeros(len(cover) + 1, dtype=np.int64)
+	np.cumsum([len(cl) for cl in cover], out=indptr[1:])
+	return sparse.csc_matrix((np.ones(len(indices), dtype=np.float64), indices, indptr), shape=(nnodes, len(cover)))
+
+
+def entropy(w, n):
+	"""Entropy term -w/n * log2(w/n) of the counts, 0 for the zero counts
+
+	w  - counts array
+	n  - total count
+
+	return  - entropy terms in bits (the multiplier 1/n is omitted, it is cancelled by the normalization)
+	"""
+	w = np.asarray(w, dtype=np.float64)
+	res = np.zeros_like(w)
+	nz = w > 0
+	res[nz] = -w[nz] * np.log2(w[nz] / n)
+	return res
+
+
+def condEntropies(xsizes, ysizes, inters, n):
+	"""Conditional entropies H(X_i|Y) of each cluster of X given the clustering Y
+
+	xsizes  - sizes of the clusters X_i
+	ysizes  - sizes of the clusters Y_j
+	inters  - sparse matrix of the intersections |X_i & Y_j|
+	n  - number of the nodes
+
+	return
+		hcond  - H(X_i|Y), the min H(X_i|Y_j) among the Y_j satisfying the constraint
+			h(a) + h(d) >= h(b) + h(c), otherwise H(X_i)
+		hx  - H(X_i)
+	"""
+	hx = entropy(xsizes, n) + entropy(n - xsizes, n)
+	hcond = hx.copy()
+	if not len(ysizes):
+		return hcond, hx
+	hy = entropy(ysizes, n) + entropy(n - ysizes, n)
+	inters = inters.tocsr()
+	step = max(_CHUNK // len(ysizes), 1)
+	for beg in range(0, len(xsizes), step):
+		end = min(beg + step, len(xsizes))
+		d = inters[beg:end].toarray()
+		xs = xsizes[beg:end, np.newaxis]
+		c = xs - d
+		b = ysizes[np.newaxis, :] - d
+		a = n - xs - b
+		ha = entropy(a, n)
+		hb = entropy(b, n)
+		hc = entropy(c, n)
+		hd = entropy(d, n)
+		hxy = np.where(ha + hd >= hb + hc, ha + hb + hc + hd - hy[np.newaxis, :], np.inf)
+		hcond[beg:end] = np.minimum(hxy.min(axis=1), hx[beg:end])
+	return hcond, hx
+
+
+def nmis(gtcover, cover, n):
+	"""Overlapping NMIs of the clustering to the ground truth
+
+	gtcover  - ground truth clusters
+	cover  - evaluating clusters
+	n  - number of the nodes of both clusterings
+
+	return  - NMI_max, NMI_sum
+	"""
+	if not gtcover or not cover:
+		return 0., 0.
+	xmembs = membership(gtcover, n)
+	ymembs = membership(cover, n)
+	xsizes = np.asarray(xmembs.sum(axis=0)).ravel()
+	ysizes = np.asarray(ymembs.sum(axis=0)).ravel()
+	inters = xmembs.T.dot(ymembs)
+	hxcond, hx = condEntropies(xsizes, ysizes, inters, n)
+	hycond, hy = condEntropies(ysizes, xsizes, inters.T, n)
+	hx = hx.sum()
+	hy = hy.sum()
+	mi = 0.5 * (hx - hxcond.sum() + hy - hycond.sum())
+	nmimax = mi / max(hx, hy) if max(hx, hy) else 1.
+	nmisum = 2 * mi / (hx + hy) if hx + hy else 1.
+	return nmimax, nmisum
+
+
+def onmi(*args):
+	"""Evaluate overlapping NMIs of the clusterings to the ground truth
+
+	args  - file names of the ground truth and clusterings
+	"""
+	if len(args) < 2:
+		raise ValueError('The ground truth and clusterings must be specified')
+	gtnodes, gtcover = groundTruth(args[0])
+	for clsfile in args[1:]:
+		nodes = gtnodes.copy()
+		cover = loadCover(clsfile, nodes)
+		nmimax, nmisum = nmis(gtcover, cover, len(nodes))
+		print('{:.6f}\t{:.6f}\t{}'.format(nmimax, nmisum, clsfile))
+
+
+if __name__ == '__main__':
+	if len(sys.argv) > 2:
+		onmi(*sys.argv[1:])
+	else:
+		print('\n'.join(('Evaluates overlapping NMI (NMI_max and NMI_sum) of the clusterings to the ground truth\n',
+			'Usage: {} <ground_truth> <clusters1> [<clusters2> ...]',
+			'  <ground_truth>  - ground truth clusters, each line is a cluster of the space separated nodes',
+			'  <clustersX>  - clusters to be evaluated',
+			'Output: a line per each clustering: <NMI_max>\\t<NMI_sum>\\t<clustering>'
+		)).format(sys.argv[0]))
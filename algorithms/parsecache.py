@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+\descr: Cache of the parsed input files (networks, ground-truth communities) shared by the evaluators
+	and algorithms.
+
+	The parsed file is held in two forms:
+	- binary form on the disk: numpy arrays of the parsed file stored in the uncompressed
+		<filename>.<path_hash>.<parser>.npz in the cache dir of the benchmark results (results/.cache/parsed/),
+		where path_hash is the hash of the absolute path of the source file. So the datasets dirs are not
+		polluted and the following loadings by any process read the arrays in milliseconds instead of
+		the text tokenizing;
+	- built form in the memory: the objects built from the arrays are kept in the LRU cache of
+		the process (the persistent workers reuse them by the consequent jobs).
+	Both forms are invalidated on the modification (size or mtime change) of the source file or the parser.
+
+\author: (c) Artem Lutov <artem@exascale.info>
+\organizations: eXascale Infolab <http://exascale.info/>, Lumais <http://www.lumais.com/>, ScienceWise <http://sciencewise.info/>
+\date: 2015-12
+"""
+from __future__ import print_function  # Required for stderr output, must be the first import
+import sys
+import os
+import hashlib
+from collections import OrderedDict
+import numpy as np
+
+
+_LRUSIZE = 8  # Max number of the parsed files held in the memory by the process
+_STAMP = '_stamp'  # Name of the array of the source file stamp in the binary form
+# Dir of the binary forms located in the results cache of the benchmark (_RESDIR + _CACHEDIR of benchevals),
+# specified relative to this module, because the evaluators and algorithms are executed from various dirs
+_CACHEDIR = os.path.join(os.path.split(os.path.split(os.path.abspath(__file__))[0])[0], 'results', '.cache', 'parsed')
+
+
+class LruCache(object):
+	"""Least Recently Used cache of the limited size"""
+	def __init__(self, maxsize):
+		"""Constructor
+
+		maxsize  - max number of the items
+		"""
+		assert maxsize >= 1, 'Invalid size of the cache'
+		self.maxsize = maxsize
+		self._items = OrderedDict()
+
+	def get(self, key):
+		"""Fetch the item marking it as recently used
+
+		key  - key of the item
+
+		return  - value of the item or None
+		"""
+		val = self._items.pop(key, None)
+		if val is not None:
+			self._items[key] = val
+		return val
+
+	def put(self, key, val):
+		"""Add the item evicting the least recently used one if required
+
+		key  - key of the item
+		val  - value of the item, not None
+		"""
+		self._items.pop(key, None)
+		self._items[key] = val
+		if len(self._items) > self.maxsize:
+			self._items.popitem(last=False)
+
+
+_memcache = LruCache(_LRUSIZE)  # Built forms of the parsed files: (fname, parse, build): (stamp, built)
+
+
+def binName(fname, form):
+	"""Name of the binary form of the parsed file
+
+	fname  - source file name
+	form  - name of the parsed form
+	"""
+	fname = os.path.abspath(fname)
+	return os.path.join(_CACHEDIR, '{}.{}.{}.npz'.format(os.path.split(fname)[1]
+		, hashlib.sha1(fname).hexdigest()[:16], form))
+
+
+def fileStamp(fname, parse):
+	"""Stamp of the parsed file identifying its content: (size, mtime, parser mtime)
+
+	fname  - source file name
+	parse  - parser of the source file, modification of its module invalidates the parsed forms
+	"""
+	fstat = os.stat(fname)
+	parser = getattr(sys.modules.get(parse.__module__), '__file__', None)
+	if parser and os.path.splitext(parser)[1] in ('.pyc', '.pyo'):
+		parser = parser[:-1]
+	return np.array((fstat.st_size, fstat.st_mtime, os.path.getmtime(parser) if parser and os.path.exists(parser) else 0)
+		, dtype=np.float64)
+
+
+def loadArrays(fname, parse, stamp):
+	"""Load the binary form of the parsed file, parse and store it if the binary form is outdated
+
+	fname  - source file name
+	parse  - parser of the source file returning the dict of the named numpy arrays,
+		its name identifies the binary form
+	stamp  - stamp of the source file
+
+	return  - dict of the named numpy arrays
+	"""
+	binfile = binName(fname, parse.__name__)
+	try:
+		with np.load(binfile) as bins:
+			if np.array_equal(bins[_STAMP], stamp):
+				return {name: bins[name] for name in bins.files if name != _STAMP}
+	except (IOError, OSError, ValueError, KeyError):
+		pass  # The binary form is absent or inconsistent
+	arrays = parse(fname)
+	# Store the binary form atomically, the stored form is optional (the dir might be read-only)
+	tmpfile = '{}.{}.tmp.npz'.format(binfile[:-len('.npz')], os.getpid())
+	try:
+		if not os.path.exists(_CACHEDIR):
+			try:
+				os.makedirs(_CACHEDIR)
+			except OSError:
+				# The dir might be created concurrently by another process
+				if not os.path.isdir(_CACHEDIR):
+					raise
+		np.savez(tmpfile, **dict(arrays, **{_STAMP: stamp}))
+		os.rename(tmpfile, binfile)
+	except (IOError, OSError) as err:
+		print('WARNING, the binary form of "{}" can not be stored: {}'.format(fname, err), file=sys.stderr)
+		if os.path.exists(tmpfile):
+			os.remove(tmpfile)
+	return arrays
+
+
+def load(fname, parse, build):
+	"""Load the parsed file from the cache, parsing it only if the source file is modified
+
+	fname  - source file name
+	parse  - parser of the source file returning the dict of the named numpy arrays
+	build  - builder of the resulting object from the dict of the arrays
+		Note: parse and build should be defined on the module level, their names identify the cached forms
+
+	return  - built object
+	"""
+	stamp = fileStamp(fname, parse)
+	key = (os.path.abspath(fname), parse.__module__, parse.__name__, build.__module__, build.__name__)
+	cached = _memcache.get(key)
+	if cached is not None and np.array_equal(cached[0], stamp):
+		return cached[1]
+	res = build(loadArrays(fname, parse, stamp))
+	_memcache.put(key, (stamp, res))
+	return res
@@ -7,6 +7,7 @@
 	randomly selected nodes from the input network with all their neighbors.
 	Note: Produced result is a random disjoint partitioning, so if the 'ground truth' had overlapping clusters, then
 	the number of nodes in the last cluster will be less than in the sample.
+	The network is loaded from the parsed files cache (parsecache) considering the links in both directions.
 
 \author: Artem Lutov <luart@ya.ru>
 \organizations: eXascale lab <http://exascale.info/>, ScienceWise <http://sciencewise.info/>, Lumais <http://www.lumais.com/>
@@ -14,8 +15,8 @@
 """
 import sys
 import os  # Pathes processing
-import igraph as ig
 import random as rand
+from modularity import loadNet
 
 
 # Default number of the resulting clusterings (partitions, i.e files that contain disjoint clusters)
@@ -94,7 +95,10 @@ def randcommuns(*args):
 		.format(groundtruth, 'directed' if dirnet else 'undirected', network
 			, outnum, outname + outext, outdir, randseed))
 	# Load Data from simple real-world networks
-	graph = ig.Graph.Read_Ncol(network, directed=dirnet)  # , weights=False
+	netnodes, adj = loadNet(network)
+	names = [None] * len(netnodes)  # Original labels of the nodes by their indices
+	for nd, i in netnodes.iteritems():
+		names[i] = nd
 
 	# Load statistics from the ground thruth
 	groundstat = []
@@ -109,7 +113,7 @@ def randcommuns(*args):
 	rand.seed(randseed)
 	while outnum > 0:
 		outnum -= 1
-		actnodes = set(graph.vs.indices)  # Active (remained) nodes indices of the input network
+		actnodes = set(range(len(names)))  # Active (remained) nodes indices of the input network
 		clusters = []  # Forming clusters
 		# Reference size of the ground truth clusters (they migh have overlaps unlike the current partitioning)
 		for clmarg in groundstat:
@@ -124,11 +128,12 @@ def randcommuns(*args):
 			inds = 0  # Index of the node in the current cluster
 			# Select neighbors of the selected nodes to fill the clusters
 			while len(nodes) < clmarg and actnodes:
-				for nd in graph.vs[nodes[inds]].neighbors():
-					if nd.index not in actnodes:
+				ind = nodes[inds]
+				for nd in adj.indices[adj.indptr[ind]:adj.indptr[ind + 1]].tolist():
+					if nd not in actnodes:
 						continue
-					actnodes.remove(nd.index)
-					nodes.append(nd.index)
+					actnodes.remove(nd)
+					nodes.append(nd)
 					if len(nodes) >= clmarg or not actnodes:
 						break
 				inds += 1
@@ -138,7 +143,7 @@ def randcommuns(*args):
 					nodes.append(ind)
 
 			# Use original labels of the nodes
-			clusters.append([graph.vs[ind]['name'] for ind in nodes])
+			clusters.append([names[ind] for ind in nodes])
 		# Output resulting clusters
 		with open('/'.join((outdir, ''.join((outname, '_', str(outnum), outext)))), 'w') as fout:
 			for cl in clusters:
@@ -20,9 +20,25 @@ Changelog by Artem Lutov (luart@ya.ru):
 - Automatic evaluation of start and stop step for the given number of evaluations:
 	stop = linksnum, start = log(stop)
 - Community structure levels (dendrogram) output to the files
+- Array-backed network of the relabelled integer nodes for the k-cliques detection
+- Single pass percolation for the range of clique sizes kmin-kmax
+- Array-based disjoint-set forest of the (k-1)-cliques for the Phase II
+- Incremental community structure snapshots of the changed communities only
+- Weighted k-cliques ordering by the once evaluated weights with the bounded memory
+- Single pass bulk loading of the network
+- K-cliques as the sorted tuples of nodes and (k-1)-cliques as the packed keys in the Phase II
 """
-import sys,array,math
-from operator import mul
+import sys,array,math,struct,tempfile,warnings
+from bisect import bisect_left, insort
+from heapq import merge
+from itertools import izip
+try:
+	import numpy as np
+except ImportError:
+	np=None # The bulk loading of the network is not available (e.g. on PyPy), loadNet_edg() is used
+
+CLIQUES_RUN=1000000 # Max number of the weighted k-cliques held in memory, others are sorted in the temporary files
+RUN_BLOCK=4096 # Number of the k-cliques read at once from the sorted runs
 
 #---- A networking framework -----
 
@@ -148,7 +164,70 @@ class SymmNet(Net):
 		return True
 
 
+class ArrayNet(object):
+	"""
+	Unweighted symmetric network of the integer nodes 0 .. size-1 (relabelled by the
+	Enumerator) with the sorted arrays of neighbors per node, which takes 8 bytes per edge.
+	It is filled by the edges incrementally in the k-cliques detection.
+	"""
+	def __init__(self,size=0):
+		self._adj=[array.array('i') for _ in xrange(size)]
+
+	def _reserve(self,node):
+		for _ in xrange(len(self._adj),node+1):
+			self._adj.append(array.array('i'))
+
+	def addEdge(self,src,dst):
+		if max(src,dst)>=len(self._adj):
+			self._reserve(max(src,dst))
+		insort(self._adj[src],dst)
+		insort(self._adj[dst],src)
+
+	def hasEdge(self,src,dst):
+		if src>=len(self._adj):
+			return False
+		neighs=self._adj[src]
+		i=bisect_left(neighs,dst)
+		return i<len(neighs) and neighs[i]==dst
+
+	def neighbors(self,node):
+		return self._adj[node] if node<len(self._adj) else array.array('i')
+
+	def commonNeighbors(self,src,dst):
+		"""
+		Returns a set of the common neighbors of the nodes (tips of the triangles on the edge)
+		intersecting their neighbor arrays
+		"""
+		neighs=self.neighbors(src)
+		others=self.neighbors(dst)
+		if len(neighs)>len(others):
+			neighs,others=others,neighs
+		if not neighs:
+			return set()
+		if len(others)<=8*len(neighs):
+			return set(neighs).intersection(others)
+		# Binary search of the few neighbors in the large array
+		common=set()
+		for node in neighs:
+			i=bisect_left(others,node)
+			if i<len(others) and others[i]==node:
+				common.add(node)
+		return common
 
+	def __len__(self):
+		return len(self._adj)
+
+
+def relabelEdges(edges,nodeIndex):
+	"""
+	Relabels nodes of the edges to the dense integer indices by the Enumerator
+	passing through the EvaluationEvent objects
+	"""
+	for edge in edges:
+		if isinstance(edge,EvaluationEvent):
+			yield edge
+		else:
+			yield (nodeIndex[edge[0]],nodeIndex[edge[1]],edge[2])
 
 
 # ----- Extra functions for general networking framework -----
@@ -247,6 +326,131 @@ def loadNet_edg(input, mutualEdges = False, splitterChar = None,symmetricNet=Tru
 
 	return newNet, linksnum
 
+def parseNet_edg(data,splitterChar=None):
+	"""
+	Parses the network data in edg format into the arrays of the links.
+	Numerical edge lists of the uniform rows are parsed by NumPy, otherwise the
+	lines are split once detecting the numerical ids on the fly.
+
+	Returns srcs, dsts, weights, ids: indices of the link nodes, weights
+	of the links and ids of the nodes by the indices or None if the ids are
+	numerical (the indices are the ids).
+	"""
+	if splitterChar is None:
+		first=data.lstrip().split('\n',1)[0].split()
+		lines=data.count('\n')+(not data.endswith('\n'))
+		if 2<=len(first)<=3 and lines:
+			with warnings.catch_warnings():
+				warnings.simplefilter('ignore') # NumPy warns on the malformed data
+				links=np.fromstring(data,dtype=np.float64,sep=' ')
+			if links.size==len(first)*lines:
+				links=links.reshape(lines,len(first))
+				nodes=links[:,:2]
+				if np.array_equal(nodes,np.floor(nodes)) and np.abs(nodes).max()<2**53:
+					weights=links[:,2] if len(first)==3 else np.ones(lines,dtype=np.float64)
+					return nodes[:,0].astype(np.int64),nodes[:,1].astype(np.int64),weights,None
+
+	srcs=[]
+	dsts=[]
+	weights=[]
+	numerical=True
+	for line in data.splitlines():
+		fields=line.split(splitterChar)
+		if len(fields)>=2:
+			if numerical:
+				try:
+					fields[0]=int(fields[0])
+					fields[1]=int(fields[1])
+				except ValueError:
+					numerical=False # All ids are considered as strings
+			srcs.append(fields[0])
+			dsts.append(fields[1])
+			weights.append(float(fields[2]) if len(fields)>=3 else 1.)
+	weights=np.array(weights,dtype=np.float64)
+	if numerical:
+		return np.array(srcs,dtype=np.int64),np.array(dsts,dtype=np.int64),weights,None
+	nodeIndex=Enumerator()
+	srcs=np.array([nodeIndex[str(node)] for node in srcs],dtype=np.int64)
+	dsts=np.array([nodeIndex[str(node)] for node in dsts],dtype=np.int64)
+	return srcs,dsts,weights,nodeIndex.item
+
+def lexOrder(major,minor):
+	"""
+	Returns the stable order of the items sorted by the major and then by the
+	minor non-negative integer keys
+	"""
+	if not len(major):
+		return np.arange(0)
+	span=int(minor.max())+1
+	if int(major.max())<(2**63-1)//span:
+		return np.argsort(major.astype(np.int64)*span+minor,kind='mergesort')
+	return np.lexsort((minor,major))
+
+def loadNet_edgBulk(input,splitterChar=None,symmetricNet=True):
+	"""
+	Reads a network data from input in edg format in a single pass building
+	the network in bulk. Works as loadNet_edg() without mutualEdges, the
+	latest weight of the duplicated links is used and the links with zero
+	weight are omitted.
+	"""
+	srcs,dsts,weights,ids=parseNet_edg(input.read(),splitterChar)
+	# Skip self links
+	links=srcs!=dsts
+	linksnum=int(links.sum())
+	srcs,dsts,weights=srcs[links],dsts[links],weights[links]
+	# The node ids and weights are shared by the links as in loadNet_edg()
+	if ids is None:
+		ids,links=np.unique(np.concatenate((srcs,dsts)),return_inverse=True)
+		links=links.astype(np.int32) if len(ids)<2**31 else links
+		srcs,dsts=links[:len(srcs)],links[len(srcs):]
+		ids=ids.tolist()
+	ids=np.array(ids,dtype=object)
+	# Retain the latest weight of the duplicated links at the position of their
+	# first occurrence
+	if symmetricNet:
+		order=lexOrder(np.minimum(srcs,dsts),np.maximum(srcs,dsts))
+	else:
+		order=lexOrder(srcs,dsts)
+	keys=(srcs[order],dsts[order]) if not symmetricNet else \
+		(np.minimum(srcs,dsts)[order],np.maximum(srcs,dsts)[order])
+	starts=np.ones(len(order),dtype=np.bool_)
+	starts[1:]=(keys[0][1:]!=keys[0][:-1])|(keys[1][1:]!=keys[1][:-1])
+	del keys
+	latest=order[np.append(starts[1:],True)]
+	order=order[starts]
+	del starts
+	weights=weights[latest]
+	links=weights!=0
+	order=order[links]
+	weights=np.array(weights[links].tolist(),dtype=object)
+	del latest,links
+	# Arcs of the links with their insertion positions in loadNet_edg()
+	if symmetricNet:
+		srcs,dsts=np.concatenate((srcs[order],dsts[order])),np.concatenate((dsts[order],srcs[order]))
+		positions=np.concatenate((order*2,order*2+1))
+		weights=np.concatenate((weights,weights))
+		newNet=SymmNet()
+	else:
+		srcs,dsts=srcs[order],dsts[order]
+		positions=order
+		newNet=Net()
+	order=lexOrder(srcs,positions)
+	srcs,dsts,weights=srcs[order],dsts[order],weights[order]
+	positions=positions[order]
+	del order
+	# Fill the adjacency dicts per each source node in the order of the insertion
+	bounds=np.flatnonzero(srcs[1:]!=srcs[:-1])+1
+	starts=np.concatenate(([0],bounds)) if len(srcs) else bounds
+	nodes=ids[srcs[starts]].tolist()
+	order=np.argsort(positions[starts],kind='mergesort').tolist()
+	starts=starts.tolist()
+	ends=bounds.tolist()+[len(srcs)]
+	dsts=ids[dsts].tolist()
+	for i in order:
+		beg,end=starts[i],ends[i]
+		newNet._nodes[nodes[i]]=dict(izip(dsts[beg:end],weights[beg:end]))
+	return newNet, linksnum
+
 
 
 class Enumerator:
@@ -319,7 +523,7 @@ class NodeFamily:
 		return string
 
 	def _sortBySize(self):
-		self.comm.sort(lambda x,y:cmp(len(x),len(y)),reverse=True)	 
+		self.comm.sort(key=len,reverse=True)	 
 		
 	def _addCommunity(self,newCommunity):
 		self.comm.append(set(newCommunity))
@@ -563,6 +767,117 @@ class Ktree(KtreeInteger):
 			newcs.comm.append(newc)
 		return newcs
 
+class KtreeArray(object):
+	"""
+	Compact disjoint-set forest of the (k-1)-subcliques of the k-cliques
+	specified by the sorted tuples of nodes. The subcliques are enumerated by a
+	dict of their keys: the integer nodes packed into a string (or the tuples of
+	other nodes), the forest is held in the arrays of parents and set sizes with
+	the union by size and the iterative path halving.
+	Nodes of the sets are maintained incrementally, so the community structure
+	snapshot rebuilds only the communities changed since the former snapshot.
+	"""
+	def __init__(self,names=None):
+		"""
+		names  - names of the nodes indexed by the nodes to be used in the
+			community structure, the nodes are used if None
+		"""
+		self.index={} # Ids of the cliques
+		self.parent=array.array('l')
+		self.size=array.array('l')
+		self.names=names
+		self.members={} # Nodes of the sets by their roots
+		self.changed=set() # Roots of the sets changed since the former snapshot
+		self.communities={} # Communities of the former snapshot by their roots
+		self.packer=None # Packer of the integer nodes of the k-cliques
+
+	def getId(self,clique):
+		cid=self.index.get(clique)
+		if cid is None:
+			cid=len(self.parent)
+			self.index[clique]=cid
+			self.parent.append(cid)
+			self.size.append(1)
+		return cid
+
+	def getParent(self,cid):
+		parent=self.parent
+		while parent[cid]!=cid:
+			parent[cid]=parent[parent[cid]]
+			cid=parent[cid]
+		return cid
+
+	def union(self,first,second):
+		"""
+		Merges the sets of the clique ids and returns the root of the merged set
+		"""
+		first=self.getParent(first)
+		second=self.getParent(second)
+		if first!=second:
+			if self.size[first]<self.size[second]:
+				first,second=second,first
+			self.parent[second]=first
+			self.size[first]+=self.size[second]
+			# Merge the smaller set of nodes into the larger one
+			merged=self.members.pop(second,None)
+			if merged:
+				nodes=self.members.setdefault(first,merged)
+				if nodes is not merged:
+					if len(nodes)<len(merged):
+						nodes,merged=merged,nodes
+						self.members[first]=nodes
+					nodes.update(merged)
+			self.changed.add(second)
+		return first
+
+	def getSubcliqueKeys(self,kclique):
+		"""
+		Returns keys of the (k-1)-subcliques of the k-clique
+		"""
+		if self.packer is None or self.packer.size!=4*len(kclique):
+			self.packer=struct.Struct('=%dI'%len(kclique))
+		try:
+			packed=self.packer.pack(*kclique)
+		except struct.error:
+			return [kclique[:i]+kclique[(i+1):] for i in xrange(len(kclique))]
+		return [packed[:4*i]+packed[4*(i+1):] for i in xrange(len(kclique))]
+
+	def addKClique(self,kclique):
+		"""
+		Merges the sets of the (k-1)-subcliques of the k-clique
+		"""
+		keys=self.getSubcliqueKeys(kclique)
+		root=self.getParent(self.getId(keys[0]))
+		for i in xrange(1,len(keys)):
+			root=self.union(root,self.getId(keys[i]))
+		nodes=self.members.get(root)
+		if nodes is None:
+			nodes=self.members[root]=set()
+		nodes.update(kclique)
+		self.changed.add(root)
+
+	def getCommStruct(self):
+		"""
+		Returns the community structure of the nodes, i.e. the sets of
+		cliques collapsed to their (named) nodes. Only the communities changed
+		since the former snapshot are rebuilt, others are shared with it.
+		"""
+		names=self.names
+		for root in self.changed:
+			if self.parent[root]==root:
+				nodes=self.members[root]
+				self.communities[root]=set(nodes) if names is None else set([names[node] for node in nodes])
+			else:
+				self.communities.pop(root,None)
+		self.changed.clear()
+		cs=NodeFamily({})
+		cs.comm=self.communities.values()
+		cs._sortBySize()
+		return cs
+
+	def __len__(self):
+		return len(self.parent)
+
 
 
 class EvaluationList:
@@ -630,10 +945,11 @@ def getKCliqueComponents(net,k):
 		for edge in edges:
 			yield edge
 		yield EvaluationEvent()
-	edgesAndEvaluations=evaluateAtEnd(net.edges)
+	nodeIndex=Enumerator()
+	edgesAndEvaluations=relabelEdges(evaluateAtEnd(net.edges),nodeIndex)
 
-	kcliques=kcliquesByEdges(edgesAndEvaluations,k) #unweighted clique percolation		
-	for community in communitiesByKCliques(kcliques):
+	kcliques=kcliquesByEdges(edgesAndEvaluations,k,ArrayNet(len(net))) #unweighted clique percolation
+	for community in communitiesByKCliques(kcliques,nodeIndex.item):
 		return community
 
 class KClique(object):
@@ -648,7 +964,7 @@ class KClique(object):
 		self.hash=None
 	def __hash__(self):
 		if self.hash==None:
-			self.hash=hash(reduce(mul,map(self.nodes[0].__class__.__hash__,self.nodes)))
+			self.hash=hash(tuple(self.nodes))
 		return self.hash
 	def __iter__(self):
 		for node in self.nodes:
@@ -704,7 +1020,31 @@ def kcliquesAtSubnet(nodes,net,k):
 			for kclique in kcliquesByEdges(subnet.edges,k):
 				yield kclique
 
-def kcliquesByEdges(edges,k):
+def cliquesAtNodes(nodes,net,kmax):
+	"""
+	List all cliques of sizes 1 .. kmax at the subnetwork of the ArrayNet
+	induced by the nodes. Each (j+1)-clique is built by extending a j-clique
+	with a common succeeding neighbor of its nodes, so the cliques of all sizes
+	are listed in a single pass. Cliques are lists of the sorted nodes.
+	"""
+	if kmax<1:
+		return
+	nodes=set(nodes)
+	# Neighbors of each node that succeed it at the subnetwork
+	if kmax>=2:
+		successors=dict((node,set(neigh for neigh in nodes.intersection(net.neighbors(node)) if neigh>node))
+			for node in nodes)
+	else:
+		successors=dict((node,set()) for node in nodes)
+	stack=[([node],successors[node]) for node in nodes]
+	while stack:
+		clique,candidates=stack.pop()
+		yield clique
+		if len(clique)<kmax:
+			for node in candidates:
+				stack.append((clique+[node],candidates.intersection(successors[node])))
+
+def kcliquesByEdges(edges,k,newNet=None):
 	"""
 	Phase I in the SCP-algorithm.
 	
@@ -714,8 +1054,16 @@ def kcliquesByEdges(edges,k):
 	arbitrary.
 	This generator will pass through any EvaluationEvent objects that are passed to
 	it in the 'edges' generator.
+	If newNet is an empty ArrayNet then the nodes of the edges should be relabelled to
+	integer indices (see relabelEdges) and the k-cliques are generated as the sorted
+	tuples of nodes, otherwise SymmNet is used and the k-cliques are KClique objects.
 	"""
-	newNet=SymmNet() # Edges are added to a empty network one by one
+	if newNet is None:
+		newNet=SymmNet() # Edges are added to a empty network one by one
+	if isinstance(newNet,ArrayNet):
+		for kclique in kcliquesByEdgesRange(edges,k,k,newNet):
+			yield kclique
+		return
 	for edge in edges:
 		if isinstance(edge,EvaluationEvent):
 			yield edge
@@ -733,29 +1081,122 @@ def kcliquesByEdges(edges,k):
 
 			newNet[edge[0],edge[1]]=edge[2] # Finally we add the new edge to the network
 
-def kcliquesWeight(net,k,weightFunction):
-	kcliques=list(kcliquesByEdges(net.edges,k))
-	kcliques.sort(lambda x,y: cmp(weightFunction(x,net),weightFunction(y,net)))
-	for kclique in kcliques:
-		yield kclique
+def kcliquesByEdgesRange(edges,kmin,kmax,newNet):
+	"""
+	Phase I in the SCP-algorithm for the range of clique sizes kmin .. kmax.
 
-def communitiesByKCliques(kcliques):
+	Works as kcliquesByEdges() on the ArrayNet, but the new cliques of all sizes
+	are generated in a single pass over the edges: (k-2)-cliques at the triangle
+	ends are built from the (k-3)-cliques. The k-cliques are generated as the
+	sorted tuples of nodes.
+	"""
+	assert 3<=kmin<=kmax, "Clique sizes should satisfy 3 <= kmin <= kmax"
+	for edge in edges:
+		if isinstance(edge,EvaluationEvent):
+			yield edge
+		else:
+			triangleEnds=newNet.commonNeighbors(edge[0],edge[1])
+			if len(triangleEnds)>=kmin-2:
+				for clique in cliquesAtNodes(triangleEnds,newNet,kmax-2):
+					if len(clique)>=kmin-2:
+						yield tuple(sorted(clique+[edge[0],edge[1]]))
+			if not newNet.hasEdge(edge[0],edge[1]):
+				newNet.addEdge(edge[0],edge[1])
+
+def readRun(frun,record):
+	"""
+	Generates the records of the sorted run of the weighted k-cliques
+	"""
+	frun.seek(0)
+	while True:
+		block=frun.read(record.size*RUN_BLOCK)
+		if not block:
+			break
+		for pos in xrange(0,len(block),record.size):
+			yield record.unpack_from(block,pos)
+
+def kcliquesWeight(net,k,weightFunction,nodeIndex,maxcliques=CLIQUES_RUN):
+	"""
+	Generates the k-cliques in the order of their weights, the cliques with the
+	same weight are in the order of their formation.
+
+	The weight of each clique is evaluated once. The cliques are held as the
+	relabelled nodes packed with their weights into the typed arrays. If there are
+	more than maxcliques cliques, they are sorted in runs which are spilled to the
+	temporary files and merged by the heap.
+	The cliques are generated as (weight, kclique) with the kclique being the
+	sorted tuple of nodes relabelled by the nodeIndex.
+	"""
+	weights=array.array('d')
+	nodes=array.array('l')
+	record=struct.Struct('=dl'+'l'*k) # weight, index, nodes
+	runs=[]
+	def sortedOrder():
+		return sorted(xrange(len(weights)),key=weights.__getitem__)
+	def spill(base):
+		frun=tempfile.TemporaryFile()
+		frun.write(''.join([record.pack(weights[i],base+i,*nodes[i*k:(i+1)*k]) for i in sortedOrder()]))
+		runs.append(frun)
+		del weights[:]
+		del nodes[:]
+
+	numberOfCliques=0
+	for kclique in kcliquesByEdges(relabelEdges(net.edges,nodeIndex),k,ArrayNet(len(net))):
+		weights.append(weightFunction(KClique([nodeIndex.getReverse(node) for node in kclique],notSorted=False),net))
+		nodes.extend(kclique)
+		numberOfCliques+=1
+		if len(weights)>=maxcliques:
+			spill(numberOfCliques-len(weights))
+
+	if not runs:
+		for i in sortedOrder():
+			yield weights[i],tuple(nodes[i*k:(i+1)*k])
+		return
+	if weights:
+		spill(numberOfCliques-len(weights))
+	try:
+		for rec in merge(*[readRun(frun,record) for frun in runs]):
+			yield rec[0],rec[2:]
+	finally:
+		for frun in runs:
+			frun.close()
+
+def communitiesByKCliques(kcliques,names=None):
 	"""
 	Phase II in the SCP algorithm. Finds communities in the order they
 	appear as the cliques are added to the network.
+	The k-cliques are the sorted tuples of nodes or KClique objects.
+	The nodes are renamed in the communities if the names list is specified.
 	"""
 	# Calculate the neighboring relations
-	krTree=Ktree()
+	krTree=KtreeArray(names)
 	for kclique in kcliques:
 		if isinstance(kclique,EvaluationEvent):
-			communityStructure=krTree.getCommStruct().getCollapsed()
+			communityStructure=krTree.getCommStruct()
 			communityStructure.threshold=kclique.threshold
 			yield communityStructure
 		else:
-			#for fewer operations at ktree, names of new cliques should be saved
-			#and given to ktree when merging the sets
-			krcliques=list(kclique.getSubcliques()) #list all k-1 cliques that are subcliques
-			krTree.mergeSetsWithElements(krcliques) #merge the sets of k-1 cliques at the list 
+			if isinstance(kclique,KClique):
+				kclique=tuple(kclique.nodes)
+			krTree.addKClique(kclique) #merge the sets of k-1 cliques that are subcliques
+
+def communitiesByKCliquesRange(kcliques,kmin,kmax,names=None):
+	"""
+	Phase II in the SCP algorithm for the range of clique sizes. Works as
+	communitiesByKCliques() for each k, the community structures of each
+	evaluation are yielded as a list indexed by k-kmin.
+	"""
+	krTrees=[KtreeArray(names) for k in range(kmin,kmax+1)]
+	for kclique in kcliques:
+		if isinstance(kclique,EvaluationEvent):
+			communityStructures=[]
+			for krTree in krTrees:
+				communityStructure=krTree.getCommStruct()
+				communityStructure.threshold=kclique.threshold
+				communityStructures.append(communityStructure)
+			yield communityStructures
+		else:
+			krTrees[len(kclique)-kmin].addKClique(kclique)
 
 def kcliquePercolator(net,k,start,stop,evaluations,reverse=False,weightFunction=None):
 	"""
@@ -763,19 +1204,38 @@ def kcliquePercolator(net,k,start,stop,evaluations,reverse=False,weightFunction=
 	helpstring below for explanation of the arguments.
 	"""
 	assert evaluations >= 1, "At least one evaluation should be performed"
+	# Nodes are relabelled in the order of the edges to use the array-backed network
+	nodeIndex=Enumerator()
 	if weightFunction==None: #unweighted clique percolation with thresholding
 		edges=list(net.edges)
 		edges.sort(lambda x, y: cmp(x[2],y[2]),reverse=reverse)
 		edgesAndEvaluations=EvaluationList(edges)
 		edgesAndEvaluations.setLinearEvaluations(start,stop,evaluations)
-		kcliques=kcliquesByEdges(edgesAndEvaluations,k) 
+		kcliques=kcliquesByEdges(relabelEdges(edgesAndEvaluations,nodeIndex),k,ArrayNet(len(net)))
 	else: #weighted clique percolation
-		kcliques=EvaluationList(kcliquesWeight(net,k,weightFunction),weightFunction=lambda x:getIntensity(x,net))
+		kcliques=EvaluationList(kcliquesWeight(net,k,weightFunction,nodeIndex),weightFunction=lambda x:x[0])
 		kcliques.setLinearEvaluations(start,stop,evaluations) 
+		kcliques=(kclique if isinstance(kclique,EvaluationEvent) else kclique[1] for kclique in kcliques)
 
-	for community in communitiesByKCliques(kcliques):
+	for community in communitiesByKCliques(kcliques,nodeIndex.item):
 		yield community
 
+def kcliquePercolatorRange(net,kmin,kmax,start,stop,evaluations,reverse=False):
+	"""
+	Unweighted k-clique percolator for the range of clique sizes kmin .. kmax.
+	The edges are sorted and the cliques are enumerated once for all k, the
+	community structures of each evaluation are yielded as a list indexed by k-kmin.
+	"""
+	assert evaluations >= 1, "At least one evaluation should be performed"
+	edges=list(net.edges)
+	edges.sort(lambda x, y: cmp(x[2],y[2]),reverse=reverse)
+	edgesAndEvaluations=EvaluationList(edges)
+	edgesAndEvaluations.setLinearEvaluations(start,stop,evaluations)
+	nodeIndex=Enumerator()
+	kcliques=kcliquesByEdgesRange(relabelEdges(edgesAndEvaluations,nodeIndex),kmin,kmax,ArrayNet(len(net)))
+	for communities in communitiesByKCliquesRange(kcliques,kmin,kmax,nodeIndex.item):
+		yield communities
+
 
 # ---- Main program and parsing arguments ----
 
@@ -793,13 +1253,53 @@ helpstring=("Incremental k-clique percolation algorithm.\n"
 		"Example: python kclique.py mynet.edg 5 1000 5000 5 intensty\n"
 		"This example returns nodes in 5-clique communities when 1000, 2000, 3000, 4000 and 5000 first 5-cliques are"
 		" added to the network after sorting them with respect to intensity.\n"
-		"Output is given as a list of nodes separated by space and communities separated by line change.")
+		"Output is given as a list of nodes separated by space and communities separated by line change.\n"
+		"The range of clique sizes can be specified as k=kmin-kmax to evaluate all of them in a single pass"
+		" over the network, then {{k}} in the outpfile is replaced with the clique size (otherwise _k<k> suffix is"
+		" added to the base name).")
+
+def levelFile(outbase,k,lev,krange=False):
+	"""
+	Output file name of the community structure level.
+
+	outbase  - base name of the output files, {k} is replaced with the clique size
+	k  - clique size
+	lev  - level in the dendrogram
+	krange  - the range of clique sizes is evaluated
+	"""
+	if '{k}' in outbase:
+		outbase=outbase.replace('{k}',str(k))
+		krange=False
+	outfile = outbase.rsplit('.', 1)  # Fetch extension
+	return ''.join((outfile[0], '_k' + str(k) if krange else '', '_', str(lev)
+		, '' if len(outfile) <= 1 else '.' + outfile[1]))
+
+def outputLevel(cs,k,lev,i):
+	"""
+	Output the community structure level to the stdout or to the file if outbase is specified.
+
+	cs  - community structure
+	k  - clique size
+	lev  - level in the dendrogram
+	i  - index of the evaluation
+	"""
+	if not outbase:
+		toplinks = int(round(start if evaluations <= 1 else start + (stop - start) * i / (evaluations - 1)))
+		print "# {}. Communities for the top heaviest {}-cliques at the threshold {}:".format(
+			lev, toplinks, k, cs.threshold)
+		print cs
+	else:
+		with open(levelFile(outbase, k, lev, kmin < kmax), 'w') as fout:
+			fout.write(str(cs))
 
 if len(sys.argv)>2:
 	filename=sys.argv[1]
-	k=int(sys.argv[2])
+	# Clique size or the range of clique sizes: kmin-kmax
+	ks=[int(k) for k in sys.argv[2].split('-',1)]
+	kmin,kmax=ks[0],ks[-1]
+	assert kmin<=kmax, "Invalid range of clique sizes"
 	f=open(filename,'r')
-	net,stop=loadNet_edg(f)
+	net,stop=loadNet_edg(f) if np is None else loadNet_edgBulk(f)
 	assert stop >= 3, "Network must have at least 3 links"
 	outbase = None
 if len(sys.argv)>3:
@@ -817,23 +1317,26 @@ if len(sys.argv)==7:
 		weightFunction=getIntensity
 
 if len(sys.argv)==3:
-	cs=getKCliqueComponents(net,k)
-	print cs
+	for k in range(kmin,kmax+1):
+		cs=getKCliqueComponents(net,k)
+		print cs
 elif len(sys.argv)>=4 and len(sys.argv)<=7:
-	lev = 0  # Level in the dendrogram
-	for i, cs in enumerate(kcliquePercolator(net,k,start,stop,evaluations,weightFunction=weightFunction)):
-		if not cs:
-			continue  # Skip empty levels
-		if not outbase:
-			toplinks = int(round(start if evaluations <= 1 else start + (stop - start) * i / (evaluations - 1)))
-			print "# {}. Communities for the top heaviest {}-cliques at the threshold {}:".format(
-				lev, toplinks, k, cs.threshold)
-			print cs
-		else:
-			outfile = outbase.rsplit('.', 1)  # Fetch extension
-			outfile = ''.join((outfile[0], '_', str(lev), '' if len(outfile) <= 1 else '.' + outfile[1]))
-			with open(outfile, 'w') as fout:
-				fout.write(str(cs))
-		lev += 1
+	if kmin<kmax and weightFunction==None:
+		levs=[0]*(kmax+1-kmin)  # Levels in the dendrograms of each k
+		for i, css in enumerate(kcliquePercolatorRange(net,kmin,kmax,start,stop,evaluations)):
+			for ik, cs in enumerate(css):
+				if not cs:
+					continue  # Skip empty levels
+				outputLevel(cs,kmin+ik,levs[ik],i)
+				levs[ik] += 1
+	else:
+		# The weighted percolation orders the cliques of each k separately reusing the loaded network
+		for k in range(kmin,kmax+1):
+			lev = 0  # Level in the dendrogram
+			for i, cs in enumerate(kcliquePercolator(net,k,start,stop,evaluations,weightFunction=weightFunction)):
+				if not cs:
+					continue  # Skip empty levels
+				outputLevel(cs,k,lev,i)
+				lev += 1
 else:
 	print helpstring.format(sys.argv[0])
@@ -6,7 +6,7 @@
 
 	Execution function for each algorithm must be named "exec<Algname>" and have the following signature:
 
-	def execAlgorithm(execpool, netfile, asym, timeout, pathid='', selfexec=False):
+	def execAlgorithm(execpool, netfile, asym, timeout, pathid='', selfexec=False, exectask=None, rcache=None):
 		Execute the algorithm (stub)
 
 		execpool  - execution pool to perform execution of current task
@@ -16,6 +16,8 @@
 		pathid  - path id of the net to distinguish nets with the same name located in different dirs.
 			Note: pathid is prepended with the separator symbol
 		selfexec  - current execution is the external or internal self call
+		exectask  - task to which the executing jobs belong, None by default
+		rcache  - results cache to reuse the results of the former executions, None by default
 
 		return  - number of executions (jobs) made
 
@@ -30,6 +32,7 @@ import shutil
 import glob
 import sys
 import inspect  # To automatically fetch algorithm name
+import types
 import traceback  # Stacktrace
 
 from datetime import datetime
@@ -39,6 +42,7 @@ from benchutils import *
 
 from sys import executable as PYEXEC  # Full path to the current Python interpreter
 from benchutils import _SEPPARS
+from benchutils import _SEPRUN
 from benchevals import _SEPNAMEPART
 from benchevals import _ALGSDIR
 from benchevals import _RESDIR
@@ -58,10 +62,14 @@ def aggexec(algs):
 
 	Aggregate execution results of all networks instances and shuffles and output average,
 	and avg, min, max values for each network type per each algorithm.
+	The time is aggregated as the total of the rows and the memory as the average. Note: each row
+	of scp covers all clique sizes (!k<kmin>-<kmax>), so its per item values correspond to the
+	whole range of the clique sizes rather than to a single clique size. Similarly, each row of
+	louvain_igraph marked with !r<runs> covers all its randomized runs on the network.
 
 	Expected format of the aggregating files:
 	# ExecTime(sec)	CPU_time(sec)	CPU_usr(sec)	CPU_kern(sec)	RSS_RAM_peak(Mb)	TaskName
-	0.550262	0.526599	0.513438	0.013161	2.086	syntmix/1K10/1K10^1!k7.1#1
+	0.550262	0.526599	0.513438	0.013161	2.086	syntmix/1K10/1K10^1!k3-8.1#1
 	...
 
 	algs  - algorithms were executed, which resource consumption  should be aggregated
@@ -149,18 +157,19 @@ def aggexec(algs):
 				.format(measure, err, traceback.format_exc()), file=sys.stderr)
 
 
-def	preparePath(taskpath):
+def	preparePath(taskpath, backup=True):
 	"""Create the path if required, otherwise move existent data to backup.
 	All itnstances and shuffles of each network are handled all together and only once,
 	even on calling this function for each shuffle.
 	NOTE: To process files starting with taskpath, it should not contain '/' in the end
 
 	taskpath  - the path to be prepared
+	backup  - move existent data to backup, otherwise keep it (the interrupted execution is resumed)
 	"""
 	# Backup existent files & dirs with such base only if this path exists and is not empty
 	# ATTENTION: do not use only basePathExists(taskpath) here to avoid movement to the backup
 	# processing paths when xxx.mod.net is processed before the xxx.net (have the same base)
-	if os.path.exists(taskpath) and not dirempty(taskpath):
+	if backup and os.path.exists(taskpath) and not dirempty(taskpath):
 		mainpath = delPathSuffix(taskpath)
 		backupPath(mainpath, True)
 	# Create target path if not exists
@@ -168,8 +177,143 @@ def	preparePath(taskpath):
 		os.makedirs(taskpath)
 
 
+_rcpstats = {}  # Peak RSS RAM and execution time of the former executions: algname: {netname: [rssmem, exectime]}
+_EXECRATE = 1E-6  # Default execution rate of the algorithms to estimate their execution time, sec per byte of the network
+_execrates = {}  # Execution rates of the algorithms on the networks with known execution time: algname: {net: (exectime, netsize)}
+
+
+def rcpStats(algname):
+	"""Peak RSS RAM and execution time of the former executions of the algorithm on the
+	instances and shuffles of each network stored in the resources consumption profile
+
+	algname  - name of the algorithm
+
+	return  - {netname: [rssmem, exectime]}, where netname is the name of the network without the
+		instance, shuffle and pathid suffixes, rssmem is the max peak RSS RAM in Mb and exectime
+		is the max execution time in sec
+	"""
+	stats = _rcpstats.get(algname)
+	if stats is None:
+		stats = {}
+		try:
+			with open(''.join((_RESDIR, algname, _EXTEXECTIME)), 'r') as aest:
+				for ln in aest:
+					ln = ln.lstrip()
+					if not ln or ln[0] == '#':
+						continue
+					fields = ln.split(None, 5)
+					try:
+						exectime = float(fields[0])
+						rssmem = float(fields[4])
+						net = delPathSuffix(fields[5].rstrip(), True)
+					except (IndexError, ValueError):
+						continue  # Skip the malformed line
+					netstat = stats.setdefault(net, [0, 0])
+					netstat[0] = max(netstat[0], rssmem)
+					netstat[1] = max(netstat[1], exectime)
+		except IOError:
+			pass  # The algorithm was not executed yet
+		_rcpstats[algname] = stats
+	return stats
+
+
+def memPeak(algname, task):
+	"""Expected memory consumption of the algorithm on the network estimated by
+	the peak RSS RAM of the former executions on the instances and shuffles
+	of this network stored in the resources consumption profile
+
+	algname  - name of the algorithm
+	task  - name of the network, which can include instance, shuffle and pathid suffixes
+
+	return  - peak RSS RAM in Mb, 0 if the former executions are unknown
+	"""
+	return rcpStats(algname).get(delPathSuffix(task, True), (0, 0))[0]
+
+
+def execTime(algname, task, netfile):
+	"""Expected execution time of the algorithm on the network to schedule the longest jobs first
+
+	The time is estimated by the former executions on the instances and shuffles of this network
+	stored in the resources consumption profile. Otherwise the size of the network is scaled by
+	the execution rate of the algorithm on the networks with the known execution time, or by the
+	rate of all algorithms if it is unknown for this one.
+
+	algname  - name of the algorithm
+	task  - name of the network, which can include instance, shuffle and pathid suffixes
+	netfile  - the network file
+
+	return  - expected execution time in sec
+	"""
+	try:
+		netsize = os.path.getsize(netfile)
+	except OSError:
+		netsize = 0
+	net = delPathSuffix(task, True)
+	exectime = rcpStats(algname).get(net, (0, 0))[1]
+	if exectime:
+		# Each network is considered once in the rate regardless of the number of its instances and shuffles
+		if netsize:
+			_execrates.setdefault(algname, {})[net] = (exectime, netsize)
+		return exectime
+	rates = _execrates.get(algname)
+	if rates:
+		rates = rates.itervalues()
+	else:
+		rates = [rate for algrates in _execrates.itervalues() for rate in algrates.itervalues()]
+	exectime = 0
+	totsize = 0
+	for netexec, netbytes in rates:
+		exectime += netexec
+		totsize += netbytes
+	return netsize * (exectime / totsize if totsize else _EXECRATE)
+
+
+
+def execJob(execpool, job, rcache=None, inputs=(), outputs=(), randomized=False):
+	"""Execute the job unless its results are cached, cache the results on the successful completion
+
+	execpool  - execution pool to perform execution of the job
+	job  - the job to be executed
+	rcache  - results cache, None means execution without the caching
+	inputs  - input files of the job besides its executables (networks, ground-truth, etc.)
+	outputs  - output paths (files or dirs) of the job besides its stdout and stderr files
+	randomized  - the job is nondeterministic (randomized without the fixed seed), so its results
+		are never fetched from or stored to the cache: each execution yields the new sample
+
+	return  - whether the job results are fetched from the cache
+	"""
+	# The outputs are also validated on the restoration of the job from the journal
+	job.outputs = tuple(outputs)
+	if not rcache or randomized:
+		execpool.execute(job)
+		return False
+	outputs = list(outputs)
+	outputs.extend(outp for outp in (job.stdout, job.stderr) if isinstance(outp, str) and outp != os.devnull)
+	key = rcache.jobKey(job, inputs)
+	if rcache.fetch(key, outputs):
+		# Complete the job as a stub to release its task and the dependent jobs
+		job.args = ()
+		job.pycall = None
+		job.ondone = None
+		job.rcpoutp = None
+		execpool.execute(job)
+		return True
+
+	ondone = job.ondone
+	def cacheResults(job):
+		"""Cache the results after the postprocessing of the successfully completed job"""
+		if ondone:
+			ondone()
+		# Results of the crashed job should not be reused
+		if job.retcode == 0:
+			rcache.store(key, outputs)
+
+	job.ondone = types.MethodType(cacheResults, job)
+	execpool.execute(job)
+	return False
+
 # ATTENTION: this function should not be defined to not beight automatically executed
-#def execAlgorithm(execpool, netfile, asym, timeout, pathid='', selfexec=False, **kwargs):
+#def execAlgorithm(execpool, netfile, asym, timeout, pathid='', selfexec=False, exectask=None, rcache=None, **kwargs):
 #	"""Execute the algorithm (stub)
 #
 #	execpool  - execution pool to perform execution of current task
@@ -179,6 +323,8 @@ def	preparePath(taskpath):
 #	pathid  - path id of the net to distinguish nets with the same name located in different dirs.
 #		Note: pathid is prepended with the separator symbol
 #	selfexec=False  - current execution is the external or internal self call
+#	exectask  - task to which the executing jobs belong, None by default
+#	rcache  - results cache to reuse the results of the former executions, None by default
 #	kwargs  - optional algorithm-specific keyword agguments
 #
 #	return  - number of executions (executed jobs)
@@ -227,11 +373,18 @@ def funcToAppName(funcname):
 #	return
 
 
-def execLouvain_igraph(execpool, netfile, asym, timeout, pathid='', selfexec=False):
+def execLouvain_igraph(execpool, netfile, asym, timeout, pathid='', selfexec=False, exectask=None, rcache=None, runs=1):
 	"""Execute Louvain
 	Results are not stable => multiple execution is desirable.
 
-	returns number of executions or None
+	runs  - number of the randomized runs performed by the single job on the single loading of
+		the network. Results of the run r are named <task>@<r>[.<shuffle>][#<pathid>] and evaluated
+		as the repetitions: like the shuffles, each run yields its best level, which are averaged
+		rather than maximized as the algorithm parameters. The log and the resources consumption
+		profile row (<task>!r<runs>[.<shuffle>][#<pathid>]) are common for all runs and the job
+		timeout is scaled by the number of the runs
+
+	returns number of executions (jobs) or None
 	"""
 	assert execpool and netfile and (asym is None or isinstance(asym, bool)) and timeout + 0 >= 0, (
 		'Invalid input parameters:\n\texecpool: {},\n\tnet: {},\n\tasym: {},\n\ttimeout: {}'
@@ -246,9 +399,18 @@ def execLouvain_igraph(execpool, netfile, asym, timeout, pathid='', selfexec=Fal
 	# ATTENTION: for the correct execution algname must be always the same as func lower case name without the prefix "exec"
 	algname = funcToAppName(inspect.currentframe().f_code.co_name)  # 'louvain_igraph'
 	# ./louvain_igraph.py -i=../syntnets/1K5.nsa -ol=louvain_igoutp/1K5/1K5.cnl
-	taskpath = ''.join((_RESDIR, algname, '/', _CLSDIR, task, pathid))
-
-	preparePath(taskpath)
+	# Embed the run into the task name before the shuffle, {r} is substituted by louvain_igraph with the run number
+	taskbasex, taskshuf = os.path.splitext(task)
+	if runs > 1:
+		rtask = ''.join((taskbasex, _SEPRUN, '{r}', taskshuf))
+		rcpname = ''.join((taskbasex, _SEPPARS, 'r', str(runs), taskshuf, pathid))
+	else:
+		rtask = task
+		rcpname = task + pathid
+	taskpath = ''.join((_RESDIR, algname, '/', _CLSDIR, rtask, pathid))
+	taskpaths = [taskpath.replace('{r}', str(r)) for r in range(runs)]
+	for path in taskpaths:
+		preparePath(path, not execpool.restore)
 
 	## Louvain accumulated statistics over shuffled modification of the network or total statistics for all networks
 	#extres = '.acs'
@@ -269,13 +431,18 @@ def execLouvain_igraph(execpool, netfile, asym, timeout, pathid='', selfexec=Fal
 	#		# TODO: Evaluate the average
 	#		subprocess.call(('tail', '-n 1', taskpath + _EXTLOG), stdout=accres)
 
-	args = ('../exectime', ''.join(('-o=../', _RESDIR, algname, _EXTEXECTIME)), ''.join(('-n=', task, pathid)), '-s=/etime_' + algname
-		# Note: igraph-python is a Cython wrapper around C igraph lib. Calls are much faster on CPython than on PyPy
-		, 'python', ''.join(('./', algname, '.py')), ''.join(('-i=../', netfile, netext))
-		, ''.join(('-ol=../', taskpath, _EXTCLNODES)))
-	execpool.execute(Job(name=_SEPNAMEPART.join((algname, task)), workdir=_ALGSDIR, args=args, timeout=timeout
+	# Note: the algorithm is called by the persistent Python worker of the pool to import igraph only once.
+	# igraph-python is a Cython wrapper around C igraph lib. Calls are much faster on CPython than on PyPy
+	pyargs = [''.join(('-i=../', netfile, netext)), ''.join(('-ol=../', taskpath, _EXTCLNODES))]
+	if runs > 1:
+		pyargs.append('-r={}'.format(runs))
+	pycall = (algname, 'louvain', tuple(pyargs))
+	execJob(execpool, Job(name=_SEPNAMEPART.join((algname, task)), task=exectask, workdir=_ALGSDIR, pycall=pycall, timeout=timeout * runs
 		#, ondone=postexec
-		, stdout=os.devnull, stderr=''.join((taskpath, _EXTLOG))))
+		, stdout=os.devnull, stderr=''.join((_RESDIR, algname, '/', _CLSDIR, task, pathid, _EXTLOG))
+		, rcpoutp=''.join((_RESDIR, algname, _EXTEXECTIME)), rcpname=rcpname
+		, memory=memPeak(algname, task), priority=execTime(algname, task, netfile + netext)), rcache
+		, (netfile + netext,), taskpaths, randomized=True)
 
 	execnum = 1
 	# Note: execution on shuffled network instances is now generalized for all algorithms
@@ -291,7 +458,17 @@ def execLouvain_igraph(execpool, netfile, asym, timeout, pathid='', selfexec=Fal
 
 
 # SCP (Sequential algorithm for fast clique percolation)
-def execScp(execpool, netfile, asym, timeout, pathid=''):
+def execScp(execpool, netfile, asym, timeout, pathid='', exectask=None, rcache=None):
+	"""Execute SCP, Sequential algorithm for fast Clique Percolation
+	All clique sizes (k) are evaluated by a single job in a single pass over the network.
+
+	The resources consumption profile has a single row per the network (instance shuffle)
+	covering all clique sizes, the row is named <net>!k<kmin>-<kmax>[.<shuffle>][#<pathid>].
+	The timeout is applied to each clique size, so the job timeout is scaled by the number
+	of the clique sizes.
+
+	return  - the number of the clique sizes, i.e. the produced clusterings
+	"""
 	assert execpool and netfile and (asym is None or isinstance(asym, bool)) and timeout + 0 >= 0, (
 		'Invalid input parameters:\n\texecpool: {},\n\tnet: {},\n\tasym: {},\n\ttimeout: {}'
 		.format(execpool, netfile, asym, timeout))
@@ -303,40 +480,42 @@ def execScp(execpool, netfile, asym, timeout, pathid=''):
 	algname = funcToAppName(inspect.currentframe().f_code.co_name)  # 'scp'
 	kmin = 3  # Min clique size to be used for the communities identificaiton
 	kmax = 8  # Max clique size (~ min node degree to be considered)
-	# Run for range of clique sizes
-	for k in range(kmin, kmax + 1):
-		kstr = str(k)
-		kstrex = 'k' + kstr
-		# Embed params into the task name
-		taskbasex, taskshuf = os.path.splitext(task)
-		ktask = ''.join((taskbasex, _SEPPARS, kstrex, taskshuf))
-		# Backup previous results if exist
-		taskpath = ''.join((_RESDIR, algname, '/', _CLSDIR, ktask, pathid))
-
-		preparePath(taskpath)
-
-		# ATTENTION: a single argument is k-clique size, specified later
-		steps = '10'  # Use 10 levels in the hierarchy Ganxis
-		resbase = ''.join(('../', taskpath, '/', ktask))  # Base name of the result
-		# scp.py netname k [start_linksnum end__linksnum numberofevaluations] [weight]
-		args = ('../exectime', ''.join(('-o=../', _RESDIR, algname, _EXTEXECTIME)), ''.join(('-n=', ktask, pathid)), '-s=/etime_' + algname
-			, PYEXEC, ''.join(('./', algname, '.py')), '../' + netfile, kstr, steps, resbase + _EXTCLNODES)
-
-		def tidy(job):
-			"""Remove empty resulting folders"""
-			# Note: GANXiS leaves empty ./output dir in the _ALGSDIR, which should be deleted
-			path = os.path.split(job.args[-1])[0][3:]  # Skip '../' prefix
+	# Embed params into the task name, {k} is substituted by scp with the clique size
+	taskbasex, taskshuf = os.path.splitext(task)
+	ktask = ''.join((taskbasex, _SEPPARS, 'k{k}', taskshuf))
+	# Backup previous results if exist
+	taskpaths = [''.join((_RESDIR, algname, '/', _CLSDIR, ktask.replace('{k}', str(k)), pathid))
+		for k in range(kmin, kmax + 1)]
+	for taskpath in taskpaths:
+		preparePath(taskpath, not execpool.restore)
+
+	# The whole range of clique sizes is evaluated in a single pass over the network
+	steps = '10'  # Use 10 levels in the hierarchy Ganxis
+	resbase = ''.join(('../', _RESDIR, algname, '/', _CLSDIR, ktask, pathid, '/', ktask))  # Base name of the result
+	# scp.py netname kmin-kmax [start_linksnum end__linksnum numberofevaluations] [weight]
+	args = (PYEXEC, ''.join(('./', algname, '.py')), '../' + netfile, '{}-{}'.format(kmin, kmax), steps
+		, resbase + _EXTCLNODES)
+
+	def tidy(job):
+		"""Remove empty resulting folders"""
+		for path in taskpaths:
 			if os.path.exists(path) and dirempty(path):
 				os.rmdir(path)
 
-		#print('> Starting job {} with args: {}'.format('_'.join((ktask, algname, kstrex)), args + [kstr]))
-		execpool.execute(Job(name=_SEPNAMEPART.join((algname, ktask)), workdir=_ALGSDIR, args=args, timeout=timeout
-			, ondone=tidy, stderr=taskpath + _EXTLOG))
+	# Logs and resource consumption are common for all clique sizes
+	logpath = ''.join((_RESDIR, algname, '/', _CLSDIR, task, pathid))
+	knum = kmax - kmin + 1
+	execJob(execpool, Job(name=_SEPNAMEPART.join((algname, task)), task=exectask, workdir=_ALGSDIR, args=args
+		, timeout=timeout * knum, ondone=tidy, stderr=logpath + _EXTLOG
+		, rcpoutp=''.join((_RESDIR, algname, _EXTEXECTIME))
+		, rcpname=''.join((taskbasex, _SEPPARS, 'k{}-{}'.format(kmin, kmax), taskshuf, pathid))
+		, memory=memPeak(algname, task), priority=execTime(algname, task, netfile)), rcache
+		, (netfile,), taskpaths)
 
-	return kmax + 1 - kmin
+	return knum
 
 
-def execRandcommuns(execpool, netfile, asym, timeout, pathid='', instances=5):  # _netshuffles + 1
+def execRandcommuns(execpool, netfile, asym, timeout, pathid='', instances=5, exectask=None, rcache=None):  # _netshuffles + 1
 	"""Execute Randcommuns, Random Disjoint Clustering
 	Results are not stable => multiple execution is desirable.
 
@@ -353,21 +532,24 @@ def execRandcommuns(execpool, netfile, asym, timeout, pathid='', instances=5):
 	# Backup previous results if exist
 	taskpath = ''.join((_RESDIR, algname, '/', _CLSDIR, task, pathid))
 
-	preparePath(taskpath)
+	preparePath(taskpath, not execpool.restore)
 
 	# ./randcommuns.py -g=../syntnets/1K5.cnl -i=../syntnets/1K5.nsa -n=10
-	args = ('../exectime', ''.join(('-o=../', _RESDIR, algname, _EXTEXECTIME)), ''.join(('-n=', task, pathid)), '-s=/etime_' + algname
-		# Note: igraph-python is a Cython wrapper around C igraph lib. Calls are much faster on CPython than on PyPy
-		, 'python', ''.join(('./', algname, '.py')), ''.join(('-g=../', os.path.splitext(netfile)[0], _EXTCLNODES))
+	# Note: the algorithm is called by the persistent Python worker of the pool to import numpy/scipy only once
+	# and reuse the network held in the memory by the parsed files cache
+	pycall = (algname, algname, (''.join(('-g=../', os.path.splitext(netfile)[0], _EXTCLNODES))
 		, ''.join(('-i=../', netfile, netext)), ''.join(('-o=../', taskpath))
-		, ''.join(('-n=', str(instances))))
-	execpool.execute(Job(name=_SEPNAMEPART.join((algname, task)), workdir=_ALGSDIR, args=args, timeout=timeout
-		, stdout=os.devnull, stderr=taskpath + _EXTLOG))
+		, ''.join(('-n=', str(instances)))))
+	execJob(execpool, Job(name=_SEPNAMEPART.join((algname, task)), task=exectask, workdir=_ALGSDIR, pycall=pycall, timeout=timeout
+		, stdout=os.devnull, stderr=taskpath + _EXTLOG
+		, rcpoutp=''.join((_RESDIR, algname, _EXTEXECTIME)), rcpname=task + pathid
+		, memory=memPeak(algname, task), priority=execTime(algname, task, netfile + netext)), rcache
+		, (netfile + netext, os.path.splitext(netfile)[0] + _EXTCLNODES), (taskpath,), randomized=True)
 	return 1
 
 
 # HiReCS
-def execHirecs(execpool, netfile, asym, timeout, pathid=''):
+def execHirecs(execpool, netfile, asym, timeout, pathid='', exectask=None, rcache=None):
 	assert execpool and netfile and (asym is None or isinstance(asym, bool)) and timeout + 0 >= 0, (
 		'Invalid input parameters:\n\texecpool: {},\n\tnet: {},\n\tasym: {},\n\ttimeout: {}'
 		.format(execpool, netfile, asym, timeout))
@@ -379,17 +561,19 @@ def execHirecs(execpool, netfile, asym, timeout, pathid=''):
 	algname = funcToAppName(inspect.currentframe().f_code.co_name)  # 'hirecs'
 	taskpath = ''.join((_RESDIR, algname, '/', _CLSDIR, task, pathid))
 
-	preparePath(taskpath)
+	preparePath(taskpath, not execpool.restore)
 
-	args = ('../exectime', ''.join(('-o=../', _RESDIR, algname, _EXTEXECTIME)), ''.join(('-n=', task, pathid)), '-s=/etime_' + algname
-		, './hirecs', '-oc', ''.join(('-cls=../', taskpath, '/', task, '_', algname, _EXTCLNODES))
+	args = ('./hirecs', '-oc', ''.join(('-cls=../', taskpath, '/', task, '_', algname, _EXTCLNODES))
 		, '../' + netfile)
-	execpool.execute(Job(name=_SEPNAMEPART.join((algname, task)), workdir=_ALGSDIR, args=args
-		, timeout=timeout, stdout=os.devnull, stderr=taskpath + _EXTLOG))
+	execJob(execpool, Job(name=_SEPNAMEPART.join((algname, task)), task=exectask, workdir=_ALGSDIR, args=args
+		, timeout=timeout, stdout=os.devnull, stderr=taskpath + _EXTLOG
+		, rcpoutp=''.join((_RESDIR, algname, _EXTEXECTIME)), rcpname=task + pathid
+		, memory=memPeak(algname, task), priority=execTime(algname, task, netfile)), rcache
+		, (netfile,), (taskpath,))
 	return 1
 
 
-def execHirecsOtl(execpool, netfile, asym, timeout, pathid=''):
+def execHirecsOtl(execpool, netfile, asym, timeout, pathid='', exectask=None, rcache=None):
 	"""Hirecs which performs the clustering, but does not unwrappes the hierarchy into levels,
 	just outputs the folded hierarchy"""
 	assert execpool and netfile and (asym is None or isinstance(asym, bool)) and timeout + 0 >= 0, (
@@ -403,17 +587,19 @@ def execHirecsOtl(execpool, netfile, asym, timeout, pathid=''):
 	algname = funcToAppName(inspect.currentframe().f_code.co_name)  # 'hirecsotl'
 	taskpath = ''.join((_RESDIR, algname, '/', _CLSDIR, task, pathid))
 
-	preparePath(taskpath)
+	preparePath(taskpath, not execpool.restore)
 
-	args = ('../exectime', ''.join(('-o=../', _RESDIR, algname, _EXTEXECTIME)), ''.join(('-n=', task, pathid)), '-s=/etime_' + algname
-		, './hirecs', '-oc', ''.join(('-cols=../', taskpath, '/', task, '_', algname, _EXTCLNODES))
+	args = ('./hirecs', '-oc', ''.join(('-cols=../', taskpath, '/', task, '_', algname, _EXTCLNODES))
 		, '../' + netfile)
-	execpool.execute(Job(name=_SEPNAMEPART.join((algname, task)), workdir=_ALGSDIR, args=args
-		, timeout=timeout, stdout=os.devnull, stderr=taskpath + _EXTLOG))
+	execJob(execpool, Job(name=_SEPNAMEPART.join((algname, task)), task=exectask, workdir=_ALGSDIR, args=args
+		, timeout=timeout, stdout=os.devnull, stderr=taskpath + _EXTLOG
+		, rcpoutp=''.join((_RESDIR, algname, _EXTEXECTIME)), rcpname=task + pathid
+		, memory=memPeak(algname, task), priority=execTime(algname, task, netfile)), rcache
+		, (netfile,), (taskpath,))
 	return 1
 
 
-def execHirecsAhOtl(execpool, netfile, asym, timeout, pathid=''):
+def execHirecsAhOtl(execpool, netfile, asym, timeout, pathid='', exectask=None, rcache=None):
 	"""Hirecs which performs the clustering, but does not unwrappes the hierarchy into levels,
 	just outputs the folded hierarchy"""
 	assert execpool and netfile and (asym is None or isinstance(asym, bool)) and timeout + 0 >= 0, (
@@ -427,17 +613,19 @@ def execHirecsAhOtl(execpool, netfile, asym, timeout, pathid=''):
 	algname = funcToAppName(inspect.currentframe().f_code.co_name)  # 'hirecsahotl'
 	taskpath = ''.join((_RESDIR, algname, '/', _CLSDIR, task, pathid))
 
-	preparePath(taskpath)
+	preparePath(taskpath, not execpool.restore)
 
-	args = ('../exectime', ''.join(('-o=../', _RESDIR, algname, _EXTEXECTIME)), ''.join(('-n=', task, pathid)), '-s=/etime_' + algname
-		, './hirecs', '-oc', ''.join(('-coas=../', taskpath, '/', task, '_', algname, _EXTCLNODES))
+	args = ('./hirecs', '-oc', ''.join(('-coas=../', taskpath, '/', task, '_', algname, _EXTCLNODES))
 		, '../' + netfile)
-	execpool.execute(Job(name=_SEPNAMEPART.join((algname, task)), workdir=_ALGSDIR, args=args
-		, timeout=timeout, stdout=os.devnull, stderr=taskpath + _EXTLOG))
+	execJob(execpool, Job(name=_SEPNAMEPART.join((algname, task)), task=exectask, workdir=_ALGSDIR, args=args
+		, timeout=timeout, stdout=os.devnull, stderr=taskpath + _EXTLOG
+		, rcpoutp=''.join((_RESDIR, algname, _EXTEXECTIME)), rcpname=task + pathid
+		, memory=memPeak(algname, task), priority=execTime(algname, task, netfile)), rcache
+		, (netfile,), (taskpath,))
 	return 1
 
 
-def execHirecsNounwrap(execpool, netfile, asym, timeout, pathid=''):
+def execHirecsNounwrap(execpool, netfile, asym, timeout, pathid='', exectask=None, rcache=None):
 	"""Hirecs which performs the clustering, but does not unwrappes the hierarchy into levels,
 	just outputs the folded hierarchy"""
 	assert execpool and netfile and (asym is None or isinstance(asym, bool)) and timeout + 0 >= 0, (
@@ -451,18 +639,20 @@ def execHirecsNounwrap(execpool, netfile, asym, timeout, pathid=''):
 	algname = funcToAppName(inspect.currentframe().f_code.co_name)  # Or 'hirecshfold'
 	taskpath = ''.join((_RESDIR, algname, '/', _CLSDIR, task, pathid))
 
-	preparePath(taskpath)
+	preparePath(taskpath, not execpool.restore)
 
-	args = ('../exectime', ''.join(('-o=../', _RESDIR, algname, _EXTEXECTIME)), ''.join(('-n=', task, pathid)), '-s=/etime_' + algname
-		, './hirecs', '-oc', '../' + netfile)
-	execpool.execute(Job(name=_SEPNAMEPART.join((algname, task)), workdir=_ALGSDIR, args=args
+	args = ('./hirecs', '-oc', '../' + netfile)
+	execJob(execpool, Job(name=_SEPNAMEPART.join((algname, task)), task=exectask, workdir=_ALGSDIR, args=args
 		, timeout=timeout, stdout=''.join((taskpath, '.hoc'))
-		, stderr=taskpath + _EXTLOG))
+		, stderr=taskpath + _EXTLOG
+		, rcpoutp=''.join((_RESDIR, algname, _EXTEXECTIME)), rcpname=task + pathid
+		, memory=memPeak(algname, task), priority=execTime(algname, task, netfile)), rcache
+		, (netfile,), (taskpath,))
 	return 1
 
 
 # Oslom2
-def execOslom2(execpool, netfile, asym, timeout, pathid=''):
+def execOslom2(execpool, netfile, asym, timeout, pathid='', exectask=None, rcache=None):
 	assert execpool and netfile and (asym is None or isinstance(asym, bool)) and timeout + 0 >= 0, (
 		'Invalid input parameters:\n\texecpool: {},\n\tnet: {},\n\tasym: {},\n\ttimeout: {}'
 		.format(execpool, netfile, asym, timeout))
@@ -475,10 +665,9 @@ def execOslom2(execpool, netfile, asym, timeout, pathid=''):
 	taskpath = ''.join((_RESDIR, algname, '/', _CLSDIR, task, pathid))
 	# Note: wighted networks (-w) stands for the used null model, not for the input file format.
 	# Link weight is set to 1 if not specified in the file for weighted network.
-	args = ('../exectime', ''.join(('-o=../', _RESDIR, algname, _EXTEXECTIME)), ''.join(('-n=', task, pathid)), '-s=/etime_' + algname
-		, './oslom_undir' if not asym else './oslom_dir', '-f', '../' + netfile, '-w')
+	args = ('./oslom_undir' if not asym else './oslom_dir', '-f', '../' + netfile, '-w')
 
-	preparePath(taskpath)
+	preparePath(taskpath, not execpool.restore)
 
 	netdir = os.path.split(netfile)[0] + '/'
 	# Copy results to the required dir on postprocessing
@@ -502,13 +691,16 @@ def execOslom2(execpool, netfile, asym, timeout, pathid=''):
 		if os.path.exists(fname):
 			os.remove(fname)
 
-	execpool.execute(Job(name=_SEPNAMEPART.join((algname, task)), workdir=_ALGSDIR, args=args, timeout=timeout, ondone=postexec
-		, stdout=taskpath + _EXTLOG, stderr=taskpath + _EXTERR))
+	execJob(execpool, Job(name=_SEPNAMEPART.join((algname, task)), task=exectask, workdir=_ALGSDIR, args=args, timeout=timeout, ondone=postexec
+		, stdout=taskpath + _EXTLOG, stderr=taskpath + _EXTERR
+		, rcpoutp=''.join((_RESDIR, algname, _EXTEXECTIME)), rcpname=task + pathid
+		, memory=memPeak(algname, task), priority=execTime(algname, task, netfile)), rcache
+		, (netfile,), (taskpath,), randomized=True)
 	return 1
 
 
 # Ganxis (SLPA)
-def execGanxis(execpool, netfile, asym, timeout, pathid=''):
+def execGanxis(execpool, netfile, asym, timeout, pathid='', exectask=None, rcache=None):
 	#print('> exec params:\n\texecpool: {}\n\tnetfile: {}\n\tasym: {}\n\ttimeout: {}'
 	#	.format(execpool, netfile, asym, timeout))
 	assert execpool and netfile and (asym is None or isinstance(asym, bool)) and timeout + 0 >= 0, (
@@ -520,12 +712,11 @@ def execGanxis(execpool, netfile, asym, timeout, pathid=''):
 
 	algname = funcToAppName(inspect.currentframe().f_code.co_name)  # 'ganxis'
 	taskpath = ''.join((_RESDIR, algname, '/', _CLSDIR, task, pathid))
-	args = ['../exectime', ''.join(('-o=../', _RESDIR, algname, _EXTEXECTIME)), ''.join(('-n=', task, pathid)), '-s=/etime_' + algname
-		, 'java', '-jar', './GANXiSw.jar', '-i', '../' + netfile, '-d', '../' + taskpath]
+	args = ['java', '-jar', './GANXiSw.jar', '-i', '../' + netfile, '-d', '../' + taskpath]
 	if not asym:
 		args.append('-Sym 1')  # Check existance of the back links and generate them if requried
 
-	preparePath(taskpath)
+	preparePath(taskpath, not execpool.restore)
 
 	def tidy(job):
 		# Note: GANXiS leaves empty ./output dir in the _ALGSDIR, which should be deleted
@@ -534,8 +725,11 @@ def execGanxis(execpool, netfile, asym, timeout, pathid=''):
 			#os.rmdir(tmp)
 			shutil.rmtree(tmp)
 
-	execpool.execute(Job(name=_SEPNAMEPART.join((algname, task)), workdir=_ALGSDIR, args=args, timeout=timeout, ondone=tidy
-		, stdout=taskpath + _EXTLOG, stderr=taskpath + _EXTERR))
+	execJob(execpool, Job(name=_SEPNAMEPART.join((algname, task)), task=exectask, workdir=_ALGSDIR, args=args, timeout=timeout, ondone=tidy
+		, stdout=taskpath + _EXTLOG, stderr=taskpath + _EXTERR
+		, rcpoutp=''.join((_RESDIR, algname, _EXTEXECTIME)), rcpname=task + pathid
+		, memory=memPeak(algname, task), priority=execTime(algname, task, netfile)), rcache
+		, (netfile,), (taskpath,), randomized=True)
 	return 1
 
 
@@ -18,6 +18,7 @@ import shutil
 import glob
 import sys
 import traceback  # Stacktrace
+import types
 
 from datetime import datetime
 
@@ -28,16 +29,20 @@ from benchutils import _SEPINST
 from benchutils import _SEPPATHID
 from benchutils import _PATHID_FILE
 from benchutils import _SEPPARS
+from benchutils import _SEPRUN
 
 
 # Note: '/' is required in the end of the dir to evaluate whether it is already exist and distinguish it from the file
 _ALGSDIR = 'algorithms/'  # Default directory of the benchmarking algorithms
 _RESDIR = 'results/'  # Final accumulative results of .mod, .nmi and .rcp for each algorithm, specified RELATIVE to _ALGSDIR
 _CLSDIR = 'clusters/'  # Clusters directory for the resulting clusters of algorithms execution
+_CACHEDIR = '.cache/'  # Content-addressed cache of the clustering and evaluation results, located in the _RESDIR
 _EXTERR = '.err'
 _EXTEXECTIME = '.rcp'  # Resource Consumption Profile
 _EXTAGGRES = '.res'  # Aggregated results
 _EXTAGGRESEXT = '.resx'  # Extended aggregated results
+_ONMIOUT = 'onmi.out'  # Output of the batched overlapping NMI evaluation in the logs dir
+_MODOUT = 'mod.out'  # Output of the batched modularity evaluation in the logs dir
 _SEPNAMEPART = '/'  # Job/Task name parts separator ('/' is the best choice, because it can not apear in a file name, which can be part of job name)
 
 
@@ -321,7 +326,7 @@ def aggEvaluations(respaths):
 			algname, measure, netname = resfile.rsplit('/', 2)
 			algname = os.path.split(algname)[1]
 			netname = os.path.splitext(netname)[0]
-			assert measure in ('mod', 'nmi', 'nmi_s'), 'Invalid evaluation measure "{}" from file: {}'.format(measure, resfile)
+			assert measure in ('mod', 'mod_n', 'nmi', 'nmi_s', 'nmi_max'), 'Invalid evaluation measure "{}" from file: {}'.format(measure, resfile)
 
 			# Fetch corresponding evaluations aggregator
 			eagg = evalaggs.get(measure)
@@ -347,7 +352,8 @@ def aggEvaluations(respaths):
 	print('Evaluation results aggregation is finished.')
 
 
-def evalGeneric(execpool, measure, algname, basefile, measdir, timeout, evaljob, resagg, pathid='', tidy=True):
+def evalGeneric(execpool, measure, algname, basefile, measdir, timeout, evaljob, resagg, pathid='', tidy=True, rcache=None
+, batched=False):
 	"""Generic evaluation on the specidied file
 	NOTE: all paths are given relative to the root benchmark directory.
 
@@ -360,10 +366,16 @@ def evalGeneric(execpool, measure, algname, basefile, measdir, timeout, evaljob,
 	timeout  - execution timeout for this task
 	evaljob  - evaluatoin job to be performed on the evaluating file, signature:
 		evaljob(cfile, task, taskoutp, clslev, shuffle, rcpoutp, logsbase)
+		The job outputs the evaluation to the PIPE, which is passed to the ondone
+		callback of the job as job.params['output']. The randomized runs of the algorithm
+		(<task>@<run>[.<shuffle>]) are evaluated like the shuffles, the shuffle includes the run
 	resagg  - results aggregator
 	pathid  - path id of the basefile to distinguish files with the same name located in different dirs.
 		Note: pathid includes pathid separator
 	tidy  - delete previously existent resutls. Must be False if a few apps output results into the same dir
+	rcache  - results cache to reuse the evaluations of the same clusters, None by default
+	batched  - evaluate all levels of the clusters by a single job, the evaljob takes lists of
+		the cfiles and clslevs and the logs dir as logsbase
 	"""
 	assert execpool and basefile and measure and algname, "Parameters must be defined"
 	assert not pathid or pathid[0] == _SEPPATHID, 'pathid must include pathid separator'
@@ -427,6 +439,19 @@ def evalGeneric(execpool, measure, algname, basefile, measdir, timeout, evaljob,
 					.format('.', clsname, err), file=sys.stderr)
 				# Continue processing skipping such index
 				shuffle = ''
+		itask = ish - 1 if shuffle else icnpid  # Index of the end of the task name without the run and shuffle
+		# Fetch the randomized run index if exists, the runs are aggregated as the shuffles (repetitions)
+		irun = clsname[:itask].rfind(_SEPRUN)
+		if irun >= tcapLen:
+			try:
+				int(clsname[irun + 1:itask])
+			except ValueError as err:
+				print('WARNING, invalid suffix or the separator "{}" represents part of the path "{}", exception: {}. Skipped.'
+					.format(_SEPRUN, clsname, err), file=sys.stderr)
+			else:
+				# The run is traced together with the shuffle: [<shuffle>]@<run>
+				shuffle += clsname[irun:itask]
+				itask = irun
 
 		# Note: separate dir is created, because modularity is evaluated for all files in the target dir,
 		# which are different granularity / hierarchy levels
@@ -437,11 +462,11 @@ def evalGeneric(execpool, measure, algname, basefile, measdir, timeout, evaljob,
 		if tidy or not os.path.exists(logsbase):
 			os.makedirs(logsbase)
 
-		# Skip shuffle indicator to accumulate values from all shuffles into the single file
-		taskoutp = os.path.splitext(logsbase)[0] if shuffle else logsbase
-		# Recover lost pathid if required
-		if shuffle and pathid:
-			taskoutp += pathid
+		# Skip shuffle and run indicators to accumulate values from all shuffles and runs into the single file
+		taskoutp = logsbase
+		if itask != icnpid:
+			# Recover lost pathid if required
+			taskoutp = logsbase[:len(logsbase) - clsnameLen + itask] + pathid
 		taskoutp = '.'.join((taskoutp, measure))  # evalext  # Name of the file with modularity values for each level
 		if tidy and os.path.exists(taskoutp):
 			os.remove(taskoutp)
@@ -451,6 +476,8 @@ def evalGeneric(execpool, measure, algname, basefile, measdir, timeout, evaljob,
 		shagg = ShufflesAgg(resagg, _SEPNAMEPART.join((measure, algname, taskname)))
 		task = Task(name=taskname, params=shagg, ondone=shagg.fix)  # , params=EvalState(taskcapt, )
 		# Traverse over all resulting communities for each ground truth, log results
+		cfiles = []  # Clusters files to be evaluated by the batched job
+		clslevs = []  # Clusters levels of the batched job
 		for cfile in glob.iglob(escapePathWildcards(clsbase) + '/*'):
 			if os.path.isdir(cfile):  # Skip dirs among the resulting clusters (extra/, generated by OSLOM)
 				continue
@@ -473,15 +500,21 @@ def evalGeneric(execpool, measure, algname, basefile, measdir, timeout, evaljob,
 			#if shuffle:
 			#	clslev = _SEPNAMEPART.join((clslev, shuffle))
 
+			if batched:
+				cfiles.append(cfile)
+				clslevs.append(clslev)
+				continue
 			#jobname = _SEPNAMEPART.join((measure, algname, clsname))
 			logfilebase = '/'.join((logsbase, jbasename))
 			# pathid must be part of jobname, and  bun not of the clslev
-			jobs.append(evaljob(cfile, task, taskoutp, clslev, shuffle, rcpoutp, logfilebase))
+			jobs.append((evaljob(cfile, task, taskoutp, clslev, shuffle, rcpoutp, logfilebase), (cfile,)))
+		if cfiles:
+			jobs.append((evaljob(cfiles, task, taskoutp, clslevs, shuffle, rcpoutp, logsbase), tuple(cfiles)))
 	# Run all jobs after all of them were added to the task
 	if jobs:
-		for job in jobs:
+		for job, cfiles in jobs:
 			try:
-				execpool.execute(job)
+				execEval(execpool, job, rcache, cfiles + (basefile,))
 			except StandardError as err:
 				print('WARNING, "{}" job is interrupted by the exception: {}. {}'
 					.format(job.name, err, traceback.format_exc()), file=sys.stderr)
@@ -490,18 +523,70 @@ def evalGeneric(execpool, measure, algname, basefile, measdir, timeout, evaljob,
 			.format(algname, basefile), file=sys.stderr)
 
 
-def evalAlgorithm(execpool, algname, basefile, measure, timeout, resagg, pathid=''):
+def execEval(execpool, job, rcache=None, inputs=()):
+	"""Execute the evaluation job unless its output is cached, cache the output on the successful completion
+
+	execpool  - execution pool of worker processes
+	job  - the evaluation job outputting to the PIPE or to the stdout file, which is consumed,
+		the output is passed to the ondone of the job as job.params['output']
+	rcache  - results cache, None means execution without the caching
+	inputs  - input files of the job besides its executables (clusters, ground-truth, etc.)
+
+	return  - whether the job output is fetched from the cache
+	"""
+	key = rcache.jobKey(job, inputs) if rcache else None
+	output = rcache.value(key) if key else None
+	if output is not None:
+		# Complete the job as a stub passing the cached output to its ondone
+		job.params['output'] = output
+		job.args = ()
+		job.pycall = None
+		job.stdout = None
+		job.rcpoutp = None
+		execpool.execute(job)
+		return True
+
+	ondone = job.ondone
+	def fetchOutput(job):
+		"""Fetch the buffered output of the job caching it"""
+		if job.stdout is PIPE:
+			output = job.proc.communicate()[0]
+		else:
+			with open(job.stdout, 'r') as fout:
+				output = fout.read()
+			os.remove(job.stdout)
+		job.params['output'] = output
+		if key:
+			rcache.setValue(key, output)
+		if ondone:
+			ondone()
+
+	job.ondone = types.MethodType(fetchOutput, job)
+	# The results are produced by the ondone, which is not called for the restored jobs
+	job.journal = False
+	execpool.execute(job)
+	return False
+
+
+def evalAlgorithm(execpool, algname, basefile, measure, timeout, resagg, pathid='', rcache=None, native=False):
 	"""Evaluate the algorithm by the specified measure.
 	NOTE: all paths are given relative to the root benchmark directory.
 
 	execpool  - execution pool of worker processes
 	algname  - a name of the algorithm being under evaluation
 	basefile  - ground truth result, or initial network file or another measure-related file
-	measure  - target measure to be evaluated: {nmi, nmi_s, mod}
+	measure  - target measure to be evaluated: {nmi, nmi_s, nmi_max, mod, mod_n}
+		mod_n  - modularity evaluated in-process (natively), which splits the membership of the nodes
+			shared by K clusters evenly (1/K per cluster), so on the overlapping clusters it differs
+			from the modularity (mod) of HiReCS and is stored separately
 	timeout  - execution timeout for this task
 	resagg  - results aggregator
 	pathid  - path id of the basefile to distinguish files with the same name located in different dirs
 		Note: pathid includes pathid separator
+	rcache  - results cache to reuse the evaluations of the same clusters, None by default
+	native  - evaluate the overlapping NMIs (nmi_s) by the in-process vectorized implementation,
+		which evaluates all levels of the clusters by a single job instead of the external app per level.
+		nmi_max and mod_n are evaluated only natively
 	"""
 	assert not pathid or pathid[0] == _SEPPATHID, 'pathid must include pathid separator'
 	if DEBUG_TRACE:
@@ -515,7 +600,7 @@ def evalAlgorithm(execpool, algname, basefile, measure, timeout, resagg, pathid=
 		task  - task to wich the job belongs
 		taskoutp  - accumulative output file for all jobs of the current task
 		clslev  - clusters level name
-		shuffle  - shuffle index as string or ''
+		shuffle  - shuffle index with the optional run ([<shuffle>][@<run>]) as string or ''
 		rcpoutp  - file name for the aggregated output of the jobs resources consumption
 		logsbase  - base part of the file name for the logs including errors
 
@@ -532,7 +617,7 @@ def evalAlgorithm(execpool, algname, basefile, measure, timeout, resagg, pathid=
 		# Job postprocessing
 		def aggLevs(job):
 			"""Aggregate results over all levels, appending final value for each level to the dedicated file"""
-			result = job.proc.communicate()[0]  # Read buffered stdout
+			result = job.params['output']  # Buffered stdout
 			# Find require value to be aggregated
 			targpref = 'mod: '
 			# Match float number
@@ -563,6 +648,61 @@ def evalAlgorithm(execpool, algname, basefile, measure, timeout, resagg, pathid=
 			, stdout=PIPE, stderr=logsbase + _EXTERR)
 
 
+	def evaljobModBatch(cfiles, task, taskoutp, clslevs, shuffle, rcpoutp, logsbase):
+		"""Produce the batched modularity evaluation job
+
+		cfiles  - clusters files to be evaluated
+		task  - task to wich the job belongs
+		taskoutp  - accumulative output file for all jobs of the current task
+		clslevs  - clusters level names of the cfiles
+		shuffle  - shuffle index with the optional run ([<shuffle>][@<run>]) as string or ''
+		rcpoutp  - file name for the aggregated output of the jobs resources consumption
+		logsbase  - logs dir of the evaluating clusters
+
+		return
+			job  - resulting evaluating job
+		"""
+		jobname = '.'.join((task.name, shuffle))  # Name of the creating job
+		# Note: the network is loaded once per worker and evaluations are outputted to the file,
+		# which is consumed on the job completion
+		outpfile = '/'.join((logsbase, _MODOUT))
+		if os.path.exists(outpfile):
+			os.remove(outpfile)
+		pycall = ('modularity', 'evalModularity', tuple(['../' + basefile] + ['../' + cfile for cfile in cfiles]))
+
+		# Job postprocessing
+		def aggLevs(job):
+			"""Aggregate results over all levels, appending final value for each level to the dedicated file"""
+			taskoutp = job.params['taskoutp']
+			shuffle = job.params['shuffle']
+			evals = job.params['output'].splitlines()
+			if len(evals) != len(job.params['clslevs']):
+				print('ERROR, modularity evaluation failed for the job "{}", {} levels are evaluated instead of {}'
+					.format(job.name, len(evals), len(job.params['clslevs'])), file=sys.stderr)
+				return
+			with open(taskoutp, 'a') as tmod:  # Append to the end
+				if not os.path.getsize(taskoutp):
+					tmod.write('# Q_n\tlevel[/shuffle]\n')
+					tmod.flush()
+				for clslev, levev in zip(job.params['clslevs'], evals):
+					try:
+						mod = float(levev.split(None, 1)[0])
+					except (IndexError, ValueError):
+						print('ERROR, modularity evaluation failed for the level "{}" of the job "{}": {}'
+							.format(clslev, job.name, levev), file=sys.stderr)
+						continue
+					# Transfer resutls to the embracing task if exists
+					task.params.addraw(taskoutp, clslev, mod)  # Note: task.params is shuffles aggregator
+					# Define result caption
+					if shuffle:
+						clslev = _SEPNAMEPART.join((clslev, shuffle))
+					tmod.write('{}\t{}\n'.format(mod, clslev))
+
+		return Job(name=jobname, task=task, workdir=_ALGSDIR, pycall=pycall, timeout=timeout
+			, ondone=aggLevs, params={'taskoutp': taskoutp, 'clslevs': clslevs, 'shuffle': shuffle}
+			, stdout=outpfile, stderr='/'.join((logsbase, 'mod' + _EXTERR)), rcpoutp=rcpoutp, rcpname=jobname)
+
+
 	def evaljobNmi(cfile, task, taskoutp, clslev, shuffle, rcpoutp, logsbase):
 		"""Produce nmi evaluation job
 
@@ -570,7 +710,7 @@ def evalAlgorithm(execpool, algname, basefile, measure, timeout, resagg, pathid=
 		task  - task to wich the job belongs
 		taskoutp  - accumulative output file for all jobs of the current task
 		clslev  - clusters level name
-		shuffle  - shuffle index as string or ''
+		shuffle  - shuffle index with the optional run ([<shuffle>][@<run>]) as string or ''
 		rcpoutp  - file name for the aggregated output of the jobs resources consumption
 		logsbase  - base part of the file name for the logs including errors
 
@@ -602,14 +742,14 @@ def evalAlgorithm(execpool, algname, basefile, measure, timeout, resagg, pathid=
 
 		# Processing is performed from the algorithms dir
 		jobname = '.'.join((task.name, shuffle))  # Name of the creating job
-		args = ('../exectime', '-o=../' + rcpoutp, '-n=' + jobname, './gecmi', '../' + basefile, '../' + cfile)
+		args = ('./gecmi', '../' + basefile, '../' + cfile)
 
 		# Job postprocessing
 		def aggLevs(job):
 			"""Aggregate results over all levels, appending final value for each level to the dedicated file"""
 			try:
-				result = job.proc.communicate()[0]
-				nmi = float(result)  # Read buffered stdout
+				result = job.params['output']
+				nmi = float(result)  # Buffered stdout
 			except ValueError:
 				print('ERROR, nmi evaluation failed for the job "{}": {}'
 					.format(job.name, result), file=sys.stderr)
@@ -631,7 +771,7 @@ def evalAlgorithm(execpool, algname, basefile, measure, timeout, resagg, pathid=
 
 		return Job(name=jobname, task=task, workdir=_ALGSDIR, args=args, timeout=timeout
 			, ondone=aggLevs, params={'taskoutp': taskoutp, 'clslev': clslev, 'shuffle': shuffle}
-			, stdout=PIPE, stderr=logsbase + _EXTERR)
+			, stdout=PIPE, stderr=logsbase + _EXTERR, rcpoutp=rcpoutp, rcpname=jobname)
 
 
 	def evaljobNmiS(cfile, task, taskoutp, clslev, shuffle, rcpoutp, logsbase):
@@ -641,7 +781,7 @@ def evalAlgorithm(execpool, algname, basefile, measure, timeout, resagg, pathid=
 		task  - task to wich the job belongs
 		taskoutp  - accumulative output file for all jobs of the current task
 		clslev  - clusters level name
-		shuffle  - shuffle index as string or ''
+		shuffle  - shuffle index with the optional run ([<shuffle>][@<run>]) as string or ''
 		rcpoutp  - file name for the aggregated output of the jobs resources consumption
 		logsbase  - base part of the file name for the logs including errors
 
@@ -650,14 +790,14 @@ def evalAlgorithm(execpool, algname, basefile, measure, timeout, resagg, pathid=
 		"""
 		# Processing is performed from the algorithms dir
 		jobname = '.'.join((task.name, shuffle))  # Name of the creating job
-		args = ('../exectime', '-o=../' + rcpoutp, '-n=' + jobname, './onmi_sum', '../' + basefile, '../' + cfile)
+		args = ('./onmi_sum', '../' + basefile, '../' + cfile)
 
 		# Job postprocessing
 		def aggLevs(job):
 			"""Aggregate results over all levels, appending final value for each level to the dedicated file"""
 			try:
-				result = job.proc.communicate()[0]
-				nmi = float(result)  # Read buffered stdout
+				result = job.params['output']
+				nmi = float(result)  # Buffered stdout
 			except ValueError:
 				print('ERROR, nmi_s evaluation failed for the job "{}": {}'
 					.format(job.name, result), file=sys.stderr)
@@ -679,14 +819,80 @@ def evalAlgorithm(execpool, algname, basefile, measure, timeout, resagg, pathid=
 
 		return Job(name=jobname, task=task, workdir=_ALGSDIR, args=args, timeout=timeout
 			, ondone=aggLevs, params={'taskoutp': taskoutp, 'clslev': clslev, 'shuffle': shuffle}
-			, stdout=PIPE, stderr=logsbase + _EXTERR)
+			, stdout=PIPE, stderr=logsbase + _EXTERR, rcpoutp=rcpoutp, rcpname=jobname)
+
+
+	def evaljobOnmi(cfiles, task, taskoutp, clslevs, shuffle, rcpoutp, logsbase):
+		"""Produce the batched overlapping nmi (nmi_s or nmi_max) evaluation job
+
+		cfiles  - clusters files to be evaluated
+		task  - task to wich the job belongs
+		taskoutp  - accumulative output file for all jobs of the current task
+		clslevs  - clusters level names of the cfiles
+		shuffle  - shuffle index with the optional run ([<shuffle>][@<run>]) as string or ''
+		rcpoutp  - file name for the aggregated output of the jobs resources consumption
+		logsbase  - logs dir of the evaluating clusters
+
+		return
+			job  - resulting evaluating job
+		"""
+		jobname = '.'.join((task.name, shuffle))  # Name of the creating job
+		# Note: the evaluations are outputted to the file, because the persistent Python worker
+		# does not provide the PIPE output, the file is consumed on the job completion
+		outpfile = '/'.join((logsbase, _ONMIOUT))
+		if os.path.exists(outpfile):
+			os.remove(outpfile)
+		pycall = ('onmi', 'onmi', tuple(['../' + basefile] + ['../' + cfile for cfile in cfiles]))
+		# Index of the evaluating NMI in the output: <NMI_max> <NMI_sum> <clusters>
+		inmi = 0 if measure == 'nmi_max' else 1
+
+		# Job postprocessing
+		def aggLevs(job):
+			"""Aggregate results over all levels, appending final value for each level to the dedicated file"""
+			taskoutp = job.params['taskoutp']
+			shuffle = job.params['shuffle']
+			evals = job.params['output'].splitlines()
+			if len(evals) != len(job.params['clslevs']):
+				print('ERROR, {} evaluation failed for the job "{}", {} levels are evaluated instead of {}'
+					.format(measure, job.name, len(evals), len(job.params['clslevs'])), file=sys.stderr)
+				return
+			with open(taskoutp, 'a') as tnmi:  # Append to the end
+				if not os.path.getsize(taskoutp):
+					tnmi.write('# {}\tlevel[/shuffle]\n'.format('NMI_max' if inmi == 0 else 'NMI_s'))
+					tnmi.flush()
+				for clslev, levev in zip(job.params['clslevs'], evals):
+					try:
+						nmi = float(levev.split(None, 2)[inmi])
+					except (IndexError, ValueError):
+						print('ERROR, {} evaluation failed for the level "{}" of the job "{}": {}'
+							.format(measure, clslev, job.name, levev), file=sys.stderr)
+						continue
+					# Transfer resutls to the embracing task if exists
+					task.params.addraw(taskoutp, clslev, nmi)  # Note: task.params is shuffles aggregator
+					# Define result caption
+					if shuffle:
+						clslev = _SEPNAMEPART.join((clslev, shuffle))
+					tnmi.write('{}\t{}\n'.format(nmi, clslev))
+
+		return Job(name=jobname, task=task, workdir=_ALGSDIR, pycall=pycall, timeout=timeout
+			, ondone=aggLevs, params={'taskoutp': taskoutp, 'clslevs': clslevs, 'shuffle': shuffle}
+			, stdout=outpfile, stderr='/'.join((logsbase, 'onmi' + _EXTERR)), rcpoutp=rcpoutp, rcpname=jobname)
 
 
 	if measure == 'mod':
-		evalGeneric(execpool, measure, algname, basefile, measure + '/', timeout, evaljobMod, resagg, pathid)
+		evalGeneric(execpool, measure, algname, basefile, measure + '/', timeout, evaljobMod, resagg, pathid
+			, rcache=rcache)
+	elif measure == 'mod_n':
+		evalGeneric(execpool, measure, algname, basefile, measure + '/', timeout, evaljobModBatch, resagg, pathid
+			, rcache=rcache, batched=True)
 	elif measure == 'nmi':
-		evalGeneric(execpool, measure, algname, basefile, measure + '/', timeout, evaljobNmi, resagg, pathid)
+		evalGeneric(execpool, measure, algname, basefile, measure + '/', timeout, evaljobNmi, resagg, pathid
+			, rcache=rcache)
 	elif measure == 'nmi_s':
-		evalGeneric(execpool, measure, algname, basefile, measure + '/', timeout, evaljobNmiS, resagg, pathid, tidy=False)
+		evalGeneric(execpool, measure, algname, basefile, measure + '/', timeout
+			, evaljobNmiS if not native else evaljobOnmi, resagg, pathid, tidy=False, rcache=rcache, batched=native)
+	elif measure == 'nmi_max':
+		evalGeneric(execpool, measure, algname, basefile, measure + '/', timeout, evaljobOnmi, resagg, pathid
+			, rcache=rcache, batched=True)
 	else:
 		raise ValueError('Unexpected measure: ' + measure)
@@ -26,7 +26,7 @@
 			by Alcides Viamontes Esquivel, Martin Rosvall),
 		* onmi (https://github.com/aaronmcdaid/Overlapping-NMI, "Normalized Mutual Information to evaluate overlapping
 			community finding algorithms" by  Aaron F. McDaid, Derek Greene, Neil Hurley);
-	- resources consumption is evaluated using exectime profiler (https://bitbucket.org/lumais/exectime/).
+	- resources consumption (execution time, CPU time and peak RSS memory) is evaluated by the execution pool itself.
 
 \author: (c) Artem Lutov <artem@exascale.info>
 \organizations: eXascale Infolab <http://exascale.info/>, Lumais <http://www.lumais.com/>, ScienceWise <http://sciencewise.info/>
@@ -43,6 +43,7 @@ import shutil
 import signal  # Intercept kill signals
 from math import sqrt
 import glob
+import inspect  # To identify the apps supporting multiple runs
 from datetime import datetime
 import traceback  # Stacktrace
 
@@ -54,6 +55,7 @@ from benchutils import *
 from benchutils import _SEPPARS
 from benchutils import _SEPINST
 from benchutils import _SEPPATHID
+from benchutils import _PATHID_FILE
 
 from benchapps import PYEXEC
 from benchapps import aggexec
@@ -63,7 +65,9 @@ from benchevals import evalAlgorithm
 from benchevals import aggEvaluations
 from benchevals import EvalsAgg
 from benchevals import _RESDIR
+from benchevals import _SEPNAMEPART
 from benchevals import _EXTEXECTIME
+from benchevals import _CACHEDIR
 
 
 # Note: '/' is required in the end of the dir to evaluate whether it is already exist and distinguish it from the file
@@ -73,6 +77,7 @@ _SYNTINUM = 5  # Default number of instances of each synthetic network
 _EXTNETFILE = '.nsa'  # Extension of the network files to be executed by the algorithms; Network specified by tab/space separated arcs
 #_algseeds = 9  # TODO: Implement
 _PREFEXEC = 'exec'  # Execution prefix for the apps functions in benchapps
+_JOURNAL = 'execjobs.jnl'  # Journal of the executed apps jobs in the results dir
 
 _execpool = None  # Pool of executors to process jobs
 
@@ -94,17 +99,31 @@ def parseParams(args):
 				0b01 - convert only if this network is not exist
 				0b11 - force conversion (overwrite all)
 			0b100 - resolve duplicated links on conversion
-		runalgs  - execute algorithm or not
+		runalgs  - execute algorithms:
+			0 - do not execute
+			0b001 - execute
+			0b010 - pipeline the evaluation of the results (evalres) as soon as
+				each algorithm is completed on each network with all its shuffles
+			0b100 - continue the interrupted execution skipping the jobs completed
+				in the former executions according to the jobs journal
+			0b1000 - force the execution ignoring the cached results of the former executions
+			0b10000 - pin the workers to the dedicated CPU cores within a NUMA node
 		evalres  - resulting measures to be evaluated:
 			Note: all the employed measures are applicable for overlapping clusters
 			0  - nothing
 			0b001  - NMI
 			0b010  - NMI_s
 			0b100  - Q (modularity)
+			0b1000  - NMI_max
+			0b10000  - evaluate the overlapping NMIs (NMI_s, NMI_max) and modularity by the in-process vectorized
+				implementation batching all levels of the clusters instead of the external apps
 		datas  - list of datasets to be run with asym flag (asymmetric / symmetric links weights):
 			[(<asym>, <path>, <gendir>), ...] , where path is either dir or file
 		timeout  - execution timeout in sec per each algorithm
 		algorithms  - algorithms to be executed (just names as in the code)
+		aggrespaths  - paths of the evaluated results to be aggregated
+		memlimit  - max RSS RAM in Mb of the concurrently executing algorithms, 0 means unlimited
+		runs  - number of the randomized runs of the apps supporting them on the single loading of each network
 	"""
 	assert isinstance(args, (tuple, list)) and args, 'Input arguments must be specified'
 	gensynt = 0
@@ -112,13 +131,15 @@ def parseParams(args):
 	shufnum = 0  # Number of shuffles for each network instance to be produced, >=0
 	syntdir = _SYNTDIR  # Base directory for synthetic datasets
 	convnets = 0
-	runalgs = False
-	evalres = 0  # 1 - NMI, 2 - NMI_s, 4 - Q, 7 - all measures
+	runalgs = 0
+	evalres = 0  # 1 - NMI, 2 - NMI_s, 4 - Q, 8 - NMI_max, 15 - all measures; 16 - in-process NMIs and modularity (mod_n)
 	datas = []  # list of pairs: (<asym>, <path>), where path is either dir or file
 	timeout = 36 * 60*60  # 36 hours
 	timemul = 1  # Time multiplier, sec by default
 	algorithms = []
 	aggrespaths = []  # Paths for the evaluated resutls aggregation (to be done for already existent evaluations)
+	memlimit = 0  # Max RSS RAM of the executing algorithms in Mb, 0 means unlimited
+	runs = 1  # Number of the randomized runs of the apps supporting them
 
 	for arg in args:
 		# Validate input format
@@ -175,26 +196,51 @@ def parseParams(args):
 			if 'r' in arg:
 				convnets |= 0b100
 		elif arg[1] == 'r':
-			if arg != '-r':
-				raise ValueError('Unexpected argument: ' + arg)
-			runalgs = True
+			runalgs = 0b001
+			# Parse the number of runs: -r[X]=<runs>
+			pos = arg.find('=', 2)
+			if pos != -1:
+				if len(arg) == pos + 1:
+					raise ValueError('Unexpected argument: ' + arg)
+				runs = int(arg[pos+1:])
+				if runs <= 0:
+					raise ValueError('Positive number of the runs is expected: ' + arg)
+				arg = arg[:pos]
+			for i in range(2, len(arg)):
+				if arg[i] == 'p':
+					runalgs |= 0b010
+				elif arg[i] == 'c':
+					runalgs |= 0b100
+				elif arg[i] == 'f':
+					runalgs |= 0b1000
+				elif arg[i] == 'a':
+					runalgs |= 0b10000
+				else:
+					raise ValueError('Unexpected argument: ' + arg)
 		elif arg[1] == 'e':
 			if len(arg) == 2:
-				evalres = 0b111  # All measures
+				evalres = 0b111  # All default measures, NMI_max is evaluated only on demand
 			else:
-				for i in range(2, min(len(arg), 6)):
-					if arg[i] not in 'nsem':
+				for i in range(2, len(arg)):
+					if arg[i] not in 'nsxemi':
 						raise ValueError('Unexpected argument: ' + arg)
 					# Here len(arg) >= 3
 					if arg[i] == 'n':
 						evalres |= 0b1  # NMI
 					elif arg[i] == 's':
 						evalres |= 0b10  # NMI_s
+					elif arg[i] == 'x':
+						evalres |= 0b1000  # NMI_max
 					elif arg[i] == 'e':
-						evalres |= 0b11  # All extrinsic measures - both NMIs
+						evalres |= 0b11  # Default extrinsic measures - NMI and NMI_s
+					elif arg[i] == 'i':
+						evalres |= 0b10000  # In-process evaluation of the overlapping NMIs and modularity
 					else:
 						assert arg[i] == 'm', 'Modularity is expected'
 						evalres |= 0b100  # Q (modularity)
+				# Only the evaluation backend is specified
+				if evalres == 0b10000:
+					evalres |= 0b111
 		elif arg[1] == 'd' or arg[1] == 'f':
 			pos = arg.find('=', 2)
 			if pos == -1 or arg[2] not in 'gas=' or len(arg) == pos + 1:
@@ -225,10 +271,16 @@ def parseParams(args):
 			elif arg[2] == 'h':
 				timemul = 3600  # Hours
 			timeout = float(arg[pos:]) * timemul
+		elif arg[1] == 'm':
+			if len(arg) <= 3 or arg[2] != '=':
+				raise ValueError('Unexpected argument: ' + arg)
+			memlimit = float(arg[3:]) * 1024  # Gb -> Mb
+			if memlimit < 0:
+				raise ValueError('Unexpected argument: ' + arg)
 		else:
 			raise ValueError('Unexpected argument: ' + arg)
 
-	return gensynt, netins, shufnum, syntdir, convnets, runalgs, evalres, datas, timeout, algorithms, aggrespaths
+	return gensynt, netins, shufnum, syntdir, convnets, runalgs, evalres, datas, timeout, algorithms, aggrespaths, memlimit, runs
 
 
 def prepareInput(datas):
@@ -388,24 +440,22 @@ def generateNets(genbin, basedir, overwrite=False, count=_SYNTINUM, gentimeout=2
 					startdelay = 0.1  # Required to start execution of the LFR benchmark before copying the time_seed for the following process
 					netfile = netpath + name
 					if count and overwrite or not os.path.exists(netfile.join((basedir, _EXTNETFILE))):
-						args = ('../exectime', '-n=' + name, ''.join(('-o=', bmname, _EXTEXECTIME))  # Output .rcp in the current dir, basedir
-							, bmbin, '-f', netparams, '-name', netfile)
+						args = (bmbin, '-f', netparams, '-name', netfile)
 						#Job(name, workdir, args, timeout=0, ontimeout=False, onstart=None, ondone=None, tstart=None)
 						_execpool.execute(Job(name=name, workdir=basedir, args=args, timeout=netgenTimeout, ontimeout=True
 							, onstart=lambda job: shutil.copy2(timeseed, job.name.join((seedsdirfull, '.ngs')))  # Network generation seed
 							#, ondone=shuffle if shufnum > 0 else None
-							, startdelay=startdelay))
+							, startdelay=startdelay, rcpoutp=''.join((basedir, bmname, _EXTEXECTIME)), rcpname=name))
 					for i in range(1, count):
 						namext = ''.join((name, _SEPINST, str(i)))
 						netfile = netpath + namext
 						if overwrite or not os.path.exists(netfile.join((basedir, _EXTNETFILE))):
-							args = ('../exectime', '-n=' + namext, ''.join(('-o=', bmname, _EXTEXECTIME))
-								, bmbin, '-f', netparams, '-name', netfile)
+							args = (bmbin, '-f', netparams, '-name', netfile)
 							#Job(name, workdir, args, timeout=0, ontimeout=False, onstart=None, ondone=None, tstart=None)
 							_execpool.execute(Job(name=namext, workdir=basedir, args=args, timeout=netgenTimeout, ontimeout=True
 								, onstart=lambda job: shutil.copy2(timeseed, job.name.join((seedsdirfull, '.ngs')))  # Network generation seed
 								#, ondone=shuffle if shufnum > 0 else None
-								, startdelay=startdelay))
+								, startdelay=startdelay, rcpoutp=''.join((basedir, bmname, _EXTEXECTIME)), rcpname=namext))
 			else:
 				print('ERROR: network parameters file "{}" is not exist'.format(fnamex), file=sys.stderr)
 	print('Parameter files generation is completed')
@@ -505,7 +555,10 @@ def convertNet(inpnet, asym, overwrite=False, resdub=False, timeout=3*60):  # 3
 	timeout  - network conversion timeout
 	"""
 	try:
-		args = [PYEXEC, 'contrib/tohig.py', inpnet, '-f=ns' + ('a' if asym else 'e'), '-o' + ('f' if overwrite else 's')]
+		# Note: the compact binary form (.hgb) is produced in the same pass for the fast loading of the network,
+		# links of both forms are grouped by the external sort to convert large networks with the bounded memory
+		args = [PYEXEC, 'contrib/tohig.py', inpnet, '-f=ns' + ('a' if asym else 'e'), '-o' + ('f' if overwrite else 's')
+			, '-b', '-m']
 		if resdub:
 			args.append('-r')
 		_execpool.execute(Job(name=os.path.splitext(os.path.split(inpnet)[1])[0], args=args, timeout=timeout))
@@ -556,7 +609,8 @@ def convertNets(datadir, asym, overwrite=False, resdub=False, convtimeout=30*60)
 	print('Networks conversion is completed, converted {} networks'.format(netsnum))
 
 
-def runApps(appsmodule, algorithms, datadirs, datafiles, exectime, timeout):
+def runApps(appsmodule, algorithms, datadirs, datafiles, exectime, timeout, memlimit=0, evalres=0, resume=False
+, refresh=False, affinity=False, runs=1):
 	"""Run specified applications (clustering algorithms) on the specified datasets
 
 	appsmodule  - module with algorithms definitions to be run; sys.modules[__name__]
@@ -565,15 +619,31 @@ def runApps(appsmodule, algorithms, datadirs, datafiles, exectime, timeout):
 	datafiles  - target networks to be processed
 	exectime  - elapsed time since the benchmarking started
 	timeout  - timeout per each algorithm execution
+	memlimit  - max RSS RAM in Mb of the concurrently executing algorithms, 0 means unlimited
+	evalres  - evaluation flags to evaluate the results of each algorithm on each network (with
+		all its shuffles) as soon as they are produced: 0 - Skip evaluations, 1 - NMI, 2 - NMI_s,
+		4 - Q (modularity), 8 - NMI_max, 15 - all measures; 16 - in-process evaluation of the overlapping NMIs
+		and modularity
+	resume  - continue the interrupted execution skipping the jobs successfully completed on the
+		same inputs according to the jobs journal instead of the backup of all existent results
+	refresh  - execute the apps ignoring their cached results, which are updated
+	affinity  - pin each worker to the dedicated CPU cores within a NUMA node for the more
+		reproducible resources consumption of the apps
+	runs  - number of the randomized runs of the apps supporting them (having the runs parameter)
+		on the single loading of each network, other apps are executed once
 	"""
-	assert appsmodule and (datadirs or datafiles) and exectime >= 0 and timeout >= 0, 'Invalid input arguments'
+	assert appsmodule and (datadirs or datafiles) and exectime >= 0 and timeout >= 0 and memlimit >= 0 and runs >= 1, 'Invalid input arguments'
 
 	global _execpool
 
 	assert not _execpool, '_execpool should be clear on algs execution'
 	starttime = time.time()  # Procedure start time
 	if not _execpool:
-		_execpool = ExecPool(max(min(4, cpu_count() - 1), 1))
+		# Note: the igraph-based algorithms are called by the persistent CPython workers
+		_execpool = ExecPool(max(min(4, cpu_count() - 1), 1), memlimit=memlimit, pyexec='python'
+			, journal=_RESDIR + _JOURNAL, restore=resume, affinity=affinity)
+	# Clustering and evaluation results are reused for the unchanged networks, apps and their parameters
+	rcache = ResultsCache(_RESDIR + _CACHEDIR, refresh)
 
 	def unknownApp(name):
 		"""A stub for the unknown / not implemented apps (algorithms) to be benchmaked
@@ -595,6 +665,18 @@ def runApps(appsmodule, algorithms, datadirs, datafiles, exectime, timeout):
 		execalgs = [getattr(appsmodule, _PREFEXEC + alg.capitalize(), unknownApp(_PREFEXEC + alg.capitalize())) for alg in algorithms]
 		#algorithms = [alg.lower() for alg in algorithms]
 	execalgs = tuple(execalgs)
+	# Apps supporting multiple randomized runs
+	runsalgs = frozenset(ealg for ealg in execalgs if runs > 1 and 'runs' in inspect.getargspec(ealg).args)
+
+	# Evaluations to be pipelined: (<measure>, <grounttruthnet_extension>, <results_aggregator>)
+	# Note: the in-process modularity is stored as the distinct measure, because it differs from the
+	# modularity of HiReCS on the overlapping clusters
+	evaluations = [(measure, gtext, EvalsAgg(measure)) for im, measure, gtext
+		in ((1, 'nmi', _EXTCLNODES), (2, 'nmi_s', _EXTCLNODES), (4, 'mod' if not evalres & 0b10000 else 'mod_n', '.hig')
+		, (8, 'nmi_max', _EXTCLNODES)) if evalres & im]
+	# Tasks of the algorithms execution on the base networks and their shuffles to be evaluated:
+	# (<algname>, <basenet>, <pathid>): [<task>, <jobsnum>]
+	exectasks = {}
 
 	def execute(net, asym, pathid=''):
 		"""Execute algorithms on the specified network counting number of ran jobs
@@ -607,8 +689,23 @@ def runApps(appsmodule, algorithms, datadirs, datafiles, exectime, timeout):
 			jobsnum  - number of scheduled jobs
 		"""
 		for ealg in execalgs:
+			exectask = None
+			if evaluations:
+				algname = ealg.__name__[len(_PREFEXEC):].lower()
+				# Note: shuffles are evaluated together with their base network
+				basenet = os.path.splitext(os.path.splitext(net)[0])[0]
+				extask = exectasks.get((algname, basenet, pathid))
+				if extask is None:
+					extask = [Task(_SEPNAMEPART.join((algname, os.path.split(basenet)[1] + pathid))), 0]
+					exectasks[(algname, basenet, pathid)] = extask
+				exectask = extask[0]
 			try:
-				jobsnum = ealg(_execpool, net, asym, timeout, pathid)
+				if ealg in runsalgs:
+					jobsnum = ealg(_execpool, net, asym, timeout, pathid, exectask=exectask, rcache=rcache, runs=runs)
+				else:
+					jobsnum = ealg(_execpool, net, asym, timeout, pathid, exectask=exectask, rcache=rcache)
+				if exectask:
+					extask[1] += jobsnum
 			except StandardError as err:
 				jobsnum = 0
 				errexectime = time.time() - exectime
@@ -672,24 +769,64 @@ def runApps(appsmodule, algorithms, datadirs, datafiles, exectime, timeout):
 			fpid.flush()
 	filenames = None  # Free memory from filenames
 
+	def evaluator(algname, basenet, pathid):
+		"""Evaluation of the algorithm results on the network
+
+		algname  - name of the evaluating algorithm
+		basenet  - base network (without the shuffle index and extension) of the results
+		pathid  - path id of the net to distinguish nets with the same name located in different dirs
+
+		return  - evaluate(job) callback scheduling the evaluation jobs
+		"""
+		def evaluate(job):
+			for measure, gtext, evagg in evaluations:
+				basefile = basenet + gtext
+				if not os.path.exists(basefile):
+					print('WARNING, "{}" evaluation of "{}" is skipped, the base file does not exist: {}'
+						.format(measure, algname, basefile), file=sys.stderr)
+					continue
+				evalAlgorithm(_execpool, algname, basefile, measure, timeout, evagg, pathid, rcache
+					, evalres & 0b10000)
+		return evaluate
+
+	# Evaluate the results of each algorithm as soon as it is completed on the network with all its shuffles
+	for (algname, basenet, pathid), (exectask, tasknum) in exectasks.iteritems():
+		if tasknum:
+			_execpool.execute(Job(name=_SEPNAMEPART.join(('eval', exectask.name)), deps=(exectask,)
+				, ondone=evaluator(algname, basenet, pathid)))
+	exectasks = None
+
 	if _execpool:
-		timelim = min(timeout * jobsnum, 5 * 24*60*60)  # Global timeout, up to N days
-		print('Waiting for the apps execution on {} jobs from {} networks'
-			' with {} sec ({} h {} m {:.4f} s) timeout ...'.format(jobsnum, netcount, timelim, *secondsToHms(timelim)))
+		# Note: the job of the app supporting the runs has the timeout scaled by the number of the runs
+		timelim = min(timeout * jobsnum * (2 if evaluations else 1) * (runs if runsalgs else 1), 5 * 24*60*60)  # Global timeout, up to N days
+		print('Waiting for the apps execution{} on {} jobs from {} networks'
+			' with {} sec ({} h {} m {:.4f} s) timeout ...'.format(' and evaluation' if evaluations else ''
+			, jobsnum, netcount, timelim, *secondsToHms(timelim)))
 		_execpool.join(timelim)
 		_execpool = None
 	starttime = time.time() - starttime
-	print('The apps execution is successfully completed in {:.4f} sec ({} h {} m {:.4f} s)'
-		.format(starttime, *secondsToHms(starttime)))
+	print('The apps execution{} is successfully completed in {:.4f} sec ({} h {} m {:.4f} s)'
+		.format(' and evaluation' if evaluations else '', starttime, *secondsToHms(starttime)))
+	if rcache.hits:
+		print('{} jobs results are fetched from the cache'.format(rcache.hits))
 	print('Aggregating execution statistics...')
 	aggexec(algorithms)
 	print('Execution statistics aggregated')
+	if evaluations:
+		starttime = time.time()
+		print('Starting processing of aggregated results ...')
+		for measure, gtext, evagg in evaluations:
+			evagg.aggregate()
+		starttime = time.time() - starttime
+		print('Processing of aggregated results completed in {:.4f} sec ({} h {} m {:.4f} s)'
+			.format(starttime, *secondsToHms(starttime)))
 
 
 def evalResults(evalres, appsmodule, algorithms, datadirs, datafiles, exectime, timeout):
 	"""Run specified applications (clustering algorithms) on the specified datasets
 
-	evalres  - evaluation flags: 0 - Skip evaluations, 1 - NMI, 2 - NMI_s, 4 - Q (modularity), 7 - all measures
+	evalres  - evaluation flags: 0 - Skip evaluations, 1 - NMI, 2 - NMI_s, 4 - Q (modularity), 8 - NMI_max,
+		15 - all measures; 16 - in-process evaluation of the overlapping NMIs and modularity
 	appsmodule  - module with algorithms definitions to be run; sys.modules[__name__]
 	algorithms  - list of the algorithms to be executed
 	datadirs  - directories with target networks to be processed
@@ -706,9 +843,11 @@ def evalResults(evalres, appsmodule, algorithms, datadirs, datafiles, exectime,
 	starttime = time.time()  # Procedure start time
 	if not _execpool:
 		_execpool = ExecPool(max(cpu_count() - 1, 1))
+	rcache = ResultsCache(_RESDIR + _CACHEDIR)  # Evaluations of the unchanged clusters are reused
 
 	# Measures is a dict with the Array values: <evalcallback_prefix>, <grounttruthnet_extension>, <measure_name>
-	measures = {3: ['nmi', _EXTCLNODES, 'NMIs'], 4: ['mod', '.hig', 'Q']}
+	measures = {3: ['nmi', _EXTCLNODES, 'NMIs'], 4: ['mod', '.hig', 'Q'] if not evalres & 0b10000 else ['mod_n', '.hig', 'Q_n']
+		, 8: ['nmi_max', _EXTCLNODES, 'NMI_max']}
 	evaggs = []  # Evaluation results aggregators
 	for im, msr in measures.items():
 		# Evaluate only required measures
@@ -752,11 +891,13 @@ def evalResults(evalres, appsmodule, algorithms, datadirs, datafiles, exectime,
 
 			for algname in evalalgs:
 				try:
-					evalAlgorithm(_execpool, algname, basefile, measure, timeout, evagg, pathid)
+					evalAlgorithm(_execpool, algname, basefile, measure, timeout, evagg, pathid, rcache
+						, evalres & 0b10000)
 					## Evaluate also nmi_s besides nmi if required
 					if evalres & im == 3:
 					#if measure == 'nmi':
-						evalAlgorithm(_execpool, algname, basefile, 'nmi_s', timeout, evagg_s, pathid)
+						evalAlgorithm(_execpool, algname, basefile, 'nmi_s', timeout, evagg_s, pathid, rcache
+							, evalres & 0b10000)
 				except StandardError as err:
 					print('WARNING, "{}" evaluation of "{}" is interrupted by the exception: {}. {}'
 						.format(measure, algname, err, traceback.format_exc()), file=sys.stderr)
@@ -807,6 +948,8 @@ def evalResults(evalres, appsmodule, algorithms, datadirs, datafiles, exectime,
 	starttime = time.time() - starttime
 	print('Results evaluation is successfully completed in {:.4f} sec ({} h {} m {:.4f} s)'
 		.format(starttime, *secondsToHms(starttime)))
+	if rcache.hits:
+		print('{} evaluations are fetched from the cache'.format(rcache.hits))
 	# Aggregate results and output
 	starttime = time.time()
 	print('Starting processing of aggregated results ...')
@@ -824,14 +967,15 @@ def benchmark(*args):
 	"""
 	exectime = time.time()  # Benchmarking start time
 
-	gensynt, netins, shufnum, syntdir, convnets, runalgs, evalres, datas, timeout, algorithms, aggrespaths = parseParams(args)
+	gensynt, netins, shufnum, syntdir, convnets, runalgs, evalres, datas, timeout, algorithms, aggrespaths, memlimit, runs = parseParams(args)
 	print('The benchmark is started, parsed params:\n\tgensynt: {}\n\tsyntdir: {}\n\tconvnets: 0b{:b}'
-		'\n\trunalgs: {}\n\tevalres: 0b{:b}\n\tdatas: {}\n\ttimeout (h, min, sec): {}\n\talgorithms: {},\n\taggrespaths: {}'
+		'\n\trunalgs: 0b{:b}\n\tevalres: 0b{:b}\n\tdatas: {}\n\ttimeout (h, min, sec): {}\n\talgorithms: {},\n\taggrespaths: {}'
+		'\n\tmemlimit (Mb): {}, runs: {}'
 		.format(gensynt, syntdir, convnets, runalgs, evalres
 			, ', '.join(['{}{}{}'.format('' if not asym else 'asym: ', path, ' (gendir)' if gen else '')
 				for asym, path, gen in datas])
 			, secondsToHms(timeout), ', '.join(algorithms) if algorithms else ''
-			, ', '.join(aggrespaths) if aggrespaths else ''))
+			, ', '.join(aggrespaths) if aggrespaths else '', memlimit, runs))
 	# Make syntdir and link there lfr benchmark bin if required
 	bmname = 'lfrbench_udwov'  # Benchmark name
 	benchpath = syntdir + bmname  # Benchmark path
@@ -867,10 +1011,12 @@ def benchmark(*args):
 
 	# Run the algorithms and measure their resource consumption
 	if runalgs:
-		runApps(benchapps, algorithms, datadirs, datafiles, exectime, timeout)
+		runApps(benchapps, algorithms, datadirs, datafiles, exectime, timeout, memlimit
+			, evalres if runalgs & 0b010 else 0, runalgs & 0b100, runalgs & 0b1000
+			, runalgs & 0b10000, runs)
 
-	# Evaluate results
-	if evalres:
+	# Evaluate results if they were not evaluated in the pipeline with the apps execution
+	if evalres and not runalgs & 0b010:
 		evalResults(evalres, benchapps, algorithms, datadirs, datafiles, exectime, timeout)
 
 	if aggrespaths:
@@ -905,7 +1051,7 @@ if __name__ == '__main__':
 		benchmark(*sys.argv[1:])
 	else:
 		print('\n'.join(('Usage: {0} [-g[f][=[<number>][.<shuffles_number>][=<outpdir>]] [-c[f][r]] [-a="app1 app2 ..."]'
-			' [-r] [-e[n][s][e][m]] [-d[g]{{a,s}}=<datasets_dir>] [-f[g]{{a,s}}=<dataset>] [-s=<eval_path>] [-t[{{s,m,h}}]=<timeout>]',
+			' [-r[p][c][f][a]] [-e[n][s][x][e][m][i]] [-d[g]{{a,s}}=<datasets_dir>] [-f[g]{{a,s}}=<dataset>] [-s=<eval_path>] [-t[{{s,m,h}}]=<timeout>] [-m=<memlimit>]',
 			'Parameters:',
 			'  -g[f][=[<number>][.<shuffles_number>][=<outpdir>]]  - generate <number> ({synetsnum} by default) >= 0'
 			' synthetic datasets in the <outpdir> ("{syntdir}" by default), shuffling each <shuffles_number>'
@@ -916,7 +1062,7 @@ if __name__ == '__main__':
 			'    - shuffled datasets have the following naming format:\n'
 			'\t<base_name>[{sepinst}<instance_index>][(seppars)<param1>...][.<shuffle_index>].<net_extension>',
 			'    - use "-g0" to execute existing synthetic networks not changing them',
-			'  -c[X]  - convert existing networks into the .hig, .lig, etc. formats',
+			'  -c[X]  - convert existing networks into the .hig, .hgb (binary), .lig, etc. formats',
 			'    Xf  - force the conversion even when the data is already exist',
 			'    Xr  - resolve (remove) duplicated links on conversion. Note: this option is recommended to be used',
 			'  NOTE: files with {extnetfile} are looked for in the specified dirs to be converted',
@@ -924,14 +1070,31 @@ if __name__ == '__main__':
 			' Available: scp louvain_igraph randcommuns hirecs oslom2 ganxis.'
 			' Impacts {{r, e}} options. Optional, all apps are executed by default.',
 			'  NOTE: output results are stored in the "algorithms/<algname>outp/" directory',
-			'  -r  - run the benchmarking apps on the prepared data',
+			'  -r[X][=<runs>]  - run the benchmarking apps on the prepared data',
+			'    Xp  - pipeline the evaluation (-e) with the apps execution: results of each app on each network'
+			' (with all its shuffles) are evaluated as soon as they are produced',
+			'    Xc  - continue the interrupted execution skipping the jobs successfully completed on the same inputs'
+			' according to the jobs journal ({resdir}{journal}) instead of the backup of the existent results',
+			'    Xf  - force the execution ignoring the results cached in {resdir}{cachedir} by the former executions'
+			' of the same apps with the same parameters on the same networks. Results of the randomized apps'
+			' (louvain_igraph, randcommuns, oslom2, ganxis) are never cached',
+			'    Xa  - pin each worker to the dedicated CPU cores within a NUMA node for the more reproducible'
+			' resources consumption of the apps (timings in the .rcp files)',
+			'    <runs>  - number of the randomized runs of the apps supporting them (louvain_igraph) on the single loading'
+			' of each network. Results of the run <r> are named <network>@<r>[.<shuffle>] and evaluated as the'
+			' repetitions averaging the runs like the shuffles. Default: 1',
 			#'    Xf  - force execution even when the results already exists (existent datasets are moved to backup)',
-			'  -e[X]  - evaluate quality of the results. Default: apply all measurements',
+			'  -e[X]  - evaluate quality of the results. Default: apply all measurements except NMI_max (same as Xnsm)',
 			#'    Xf  - force execution even when the results already exists (existent datasets are moved to backup)',
 			'    Xn  - evaluate results accuracy using NMI measure for overlapping communities',
 			'    Xs  - evaluate results accuracy using NMI_s measure for overlapping communities',
-			'    Xe  - evaluate results accuracy using extrinsic measures (both NMIs) for overlapping communities (same as Xns)',
+			'    Xx  - evaluate results accuracy using NMI_max measure for overlapping communities, evaluated only if specified',
+			'    Xe  - evaluate results accuracy using extrinsic measures (NMI and NMI_s) for overlapping communities (same as Xns)',
 			'    Xm  - evaluate results quality by modularity',
+			'    Xi  - evaluate the overlapping NMIs (NMI_s, NMI_max) and modularity in-process by the vectorized implementation batching all levels of each clustering instead of the external apps, the default measures are evaluated if only Xi is specified.'
+			' Note: the in-process modularity splits the membership of each node shared by K clusters evenly (1/K per cluster), so for the overlapping clusters it can differ from the modularity of HiReCS (for the non-overlapping clusters both yield the standard modularity) and it is stored as the distinct mod_n measure (Q_n).'
+			' The parsed networks and clusterings are cached in the binary form in {resdir}{cachedir}parsed/ (keyed by'
+			' the source path) and reused by the evaluations and the loaders of the algorithms (louvain_igraph, randcommuns)',
 			'  -d[X]=<datasets_dir>  - directory of the datasets.',
 			'  -f[X]=<dataset>  - dataset (network, graph) file name.',
 			'    Xg  - generate directory with the network file name without extension for each input network (*{extnetfile})'
@@ -957,5 +1120,8 @@ if __name__ == '__main__':
 			'    Xs  - time in seconds. Default option',
 			'    Xm  - time in minutes',
 			'    Xh  - time in hours',
+			'  -m=<float_number>  - memory limit in Gb for the concurrently executing benchmarking applications.'
+			' Applications are postponed while their expected peak RSS RAM (taken from the former executions)'
+			' does not fit the limit. Default: 0  - no limit',
 			)).format(sys.argv[0], syntdir=_SYNTDIR, synetsnum=_SYNTINUM, netsdir=_NETSDIR, sepinst=_SEPINST
-				, seppars=_SEPPARS, extnetfile=_EXTNETFILE))
+				, seppars=_SEPPARS, extnetfile=_EXTNETFILE, resdir=_RESDIR, journal=_JOURNAL, cachedir=_CACHEDIR))
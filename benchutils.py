@@ -17,6 +17,7 @@ import shutil
 import time
 import tarfile
 import re
+import hashlib
 
 from multiprocessing import Lock
 from math import sqrt
@@ -26,15 +27,17 @@ from math import copysign
 _BCKDIR = 'backup/'  # Backup directory
 _REFLOAT = re.compile('[-+]?\d+\.?\d*([eE][-+]?\d+)?(?=\W)')  # Regular expression to parse float
 _REINT = re.compile('[-+]?\d+(?=\W)')  # Regular expression to parse int
+_REIMPORT = re.compile(r'^\s*(?:from\s+([\w.]+)\s+import\b|import\s+([\w.,\s]+))')  # Regular expression to parse the imported modules
 _SEPINST = '^'  # Network instances separator, must be a char
 _SEPPARS = '!'  # Network parameters separator, must be a char
 _SEPPATHID = '#'  # Network path id separator (to distinguish files with the same name from different dirs), must be a char
 _PATHID_FILE = 'f'  # File marker of the pathid (input file specified directly without the embracing dir), must be a char
+_SEPRUN = '@'  # Separator of the randomized run of the algorithm in the results name (before the shuffle), must be a char
 # Note: '.' is used as network shuffles separator
 
 
 def delPathSuffix(path, nameonly=False):
-	"""Extracts base of the path skipping instance, shuffling and pathid suffixes
+	"""Extracts base of the path skipping instance, run, shuffling and pathid suffixes
 
 	path  - path to be processed WITHOUT the file extension
 	nameonly  - process path as name only comonent (do not split the basedir)
@@ -53,6 +56,8 @@ def delPathSuffix(path, nameonly=False):
 	True
 	>>> delPathSuffix('1K10!k3') == '1K10'
 	True
+	>>> delPathSuffix('1K10@2.1#1') == '1K10'
+	True
 	>>> delPathSuffix('2K5') == "2K5"
 	True
 	>>> delPathSuffix('2K5.dhrh^1') == "2K5.dhrh"
@@ -72,7 +77,7 @@ def delPathSuffix(path, nameonly=False):
 	# Find position of the separator symbol, considering that it can't be begin of the name
 	if len(pname) >= 2:
 		# Note: +1 compensates start from the symbol at index 1. Also a separator can't be the first symbol
-		poses = [pname[1:].rfind(c) + 1 for c in (_SEPINST, _SEPPATHID, '.')]  # Note: reverse direction to skip possible separator symbols in the name itself
+		poses = [pname[1:].rfind(c) + 1 for c in (_SEPINST, _SEPRUN, _SEPPATHID, '.')]  # Note: reverse direction to skip possible separator symbols in the name itself
 		## Consider possible extension of the filename
 		## Note: this handling is fine, but not reliable (part of the name of file extensoin can be handled as a shuffle index
 		#pos = pname[1:].rfind('.') + 1
@@ -91,7 +96,7 @@ def delPathSuffix(path, nameonly=False):
 			# Note: parameters can be any, but another suffixes are strictly specified
 			# Valudate the suffix in case it is an instance or shuffle suffix
 			j = 0
-			if pname[pos] in (_SEPINST, _SEPPATHID, '.'):
+			if pname[pos] in (_SEPINST, _SEPRUN, _SEPPATHID, '.'):
 				# Consider file pname id
 				if pname[pos] == _SEPPATHID and len(pname) > pos + 1 and pname[pos + 1] == _PATHID_FILE:
 					j = 1
@@ -584,6 +589,213 @@ def backupPath(basepath, expand=False, synctime=None, compress=True, suffix=''):
 			shutil.move(path, '/'.join((basename, os.path.split(path)[1])))
 
 
+
+class ResultsCache(object):
+	"""Content-addressed cache of the results of the jobs
+
+	The results are keyed on the hash of the content of the job inputs (networks,
+	ground-truth, executables of the job including the local modules imported by the
+	Python executables), and the execution arguments of the job.
+	Each entry is stored in <cachedir>/<key[:2]>/ as either the <key>/ dir with the
+	output paths of the job named by their indices or the <key>.val file with the
+	value (output) of the job.
+	"""
+	def __init__(self, cachedir, refresh=False):
+		"""Cache constructor
+
+		cachedir  - directory of the cache
+		refresh  - do not fetch the cached results, only update them
+
+		hits  - number of the results fetched from the cache
+		"""
+		self.cachedir = cachedir
+		self.refresh = refresh
+		self.hits = 0
+		# Private attributes
+		self._fhashes = {}  # Hashes of the files content: fname: (size, mtime, hash)
+		self._fimports = {}  # Local modules imported by the Python files: fname: (size, mtime, modules)
+
+
+	def fileHash(self, fname):
+		"""Hash of the file content, which is evaluated once per the file modification
+
+		fname  - file name
+
+		return  - hex digest of the file content
+		"""
+		fstat = os.stat(fname)
+		fhash = self._fhashes.get(fname)
+		if fhash and fhash[0] == fstat.st_size and fhash[1] == fstat.st_mtime:
+			return fhash[2]
+		digest = hashlib.sha1()
+		with open(fname, 'rb') as finp:
+			while True:
+				buf = finp.read(1024 * 1024)
+				if not buf:
+					break
+				digest.update(buf)
+		fhash = digest.hexdigest()
+		self._fhashes[fname] = (fstat.st_size, fstat.st_mtime, fhash)
+		return fhash
+
+
+	def localImports(self, fname):
+		"""Local modules imported by the Python file, which are located in the same dir
+
+		fname  - file name of the Python module
+
+		return  - file names of the imported local modules
+		"""
+		fstat = os.stat(fname)
+		fimps = self._fimports.get(fname)
+		if fimps and fimps[0] == fstat.st_size and fimps[1] == fstat.st_mtime:
+			return fimps[2]
+		basedir = os.path.split(fname)[0]
+		modules = []
+		with open(fname, 'r') as finp:
+			for ln in finp:
+				match = _REIMPORT.match(ln)
+				if not match:
+					continue
+				if match.group(1):
+					names = (match.group(1),)
+				else:
+					names = [name.split()[0] for name in match.group(2).split(',') if name.strip()]
+				for name in names:
+					module = os.path.join(basedir, name.split('.', 1)[0] + '.py')
+					if module != fname and module not in modules and os.path.isfile(module):
+						modules.append(module)
+		self._fimports[fname] = (fstat.st_size, fstat.st_mtime, modules)
+		return modules
+
+
+	def jobKey(self, job, inputs=()):
+		"""Key of the job results
+
+		job  - the job, which executables are the args (or pycall module) located in its workdir: ./<app>
+		inputs  - input files of the job besides its executables, non-existent files are skipped
+
+		return  - hex digest of the inputs, executables and execution arguments of the job
+		"""
+		execs = []
+		if job.pycall:
+			execs.append(job.pycall[0] + '.py')
+		elif job.args:
+			execs.extend(arg for arg in job.args if isinstance(arg, str) and arg.startswith('./'))
+		if job.workdir:
+			execs = [os.path.join(job.workdir, app) for app in execs]
+		# Consider the local modules imported by the Python executables (transitively)
+		for app in execs:
+			if app.endswith('.py') and os.path.isfile(app):
+				execs.extend(module for module in self.localImports(app) if module not in execs)
+		digest = hashlib.sha1()
+		for fname in list(inputs) + execs:
+			if os.path.isfile(fname):
+				digest.update(self.fileHash(fname))
+		digest.update(repr((job.workdir, job.pycall or tuple(job.args))))
+		return digest.hexdigest()
+
+
+	def _entry(self, key):
+		"""Base path of the cache entry"""
+		return ''.join((self.cachedir, key[:2], '/', key))
+
+
+	def fetch(self, key, outputs):
+		"""Restore the cached output paths
+
+		key  - key of the results
+		outputs  - output paths (files or dirs), existing ones are replaced with the cached
+
+		return  - whether the results are fetched from the cache
+		"""
+		entry = self._entry(key)
+		if self.refresh or not os.path.isdir(entry):
+			return False
+		for i, outp in enumerate(outputs):
+			cached = '/'.join((entry, str(i)))
+			if not os.path.exists(cached):
+				# The output was not produced (empty logs and dirs are removed)
+				if os.path.isdir(outp) and dirempty(outp):
+					os.rmdir(outp)
+				continue
+			if os.path.isdir(outp):
+				shutil.rmtree(outp)
+			basedir = os.path.split(outp)[0]
+			if basedir and not os.path.exists(basedir):
+				os.makedirs(basedir)
+			if os.path.isdir(cached):
+				shutil.copytree(cached, outp)
+			else:
+				shutil.copy2(cached, outp)
+		self.hits += 1
+		return True
+
+
+	def store(self, key, outputs):
+		"""Cache the output paths
+
+		key  - key of the results
+		outputs  - output paths (files or dirs), non-existent and empty files are skipped
+		"""
+		entry = self._entry(key)
+		# Note: the entry is created atomically to not leave incomplete results on the interruption
+		tmpentry = '{}.{}.tmp'.format(entry, os.getpid())
+		try:
+			if os.path.exists(tmpentry):
+				shutil.rmtree(tmpentry)
+			os.makedirs(tmpentry)
+			for i, outp in enumerate(outputs):
+				cached = '/'.join((tmpentry, str(i)))
+				if os.path.isdir(outp):
+					shutil.copytree(outp, cached)
+				elif os.path.isfile(outp) and os.path.getsize(outp):
+					shutil.copy2(outp, cached)
+			if os.path.exists(entry):
+				shutil.rmtree(entry)
+			os.rename(tmpentry, entry)
+		except (IOError, OSError, shutil.Error) as err:
+			print('WARNING, results caching to "{}" is failed: {}'.format(entry, err), file=sys.stderr)
+			shutil.rmtree(tmpentry, True)
+
+
+	def value(self, key):
+		"""Cached value of the results
+
+		key  - key of the results
+
+		return  - the value (str) or None if it is not cached
+		"""
+		if self.refresh:
+			return None
+		try:
+			with open(self._entry(key) + '.val', 'r') as fval:
+				val = fval.read()
+		except IOError:
+			return None
+		self.hits += 1
+		return val
+
+
+	def setValue(self, key, val):
+		"""Cache the value of the results
+
+		key  - key of the results
+		val  - the value (str)
+		"""
+		fname = self._entry(key) + '.val'
+		try:
+			basedir = os.path.split(fname)[0]
+			if not os.path.exists(basedir):
+				os.makedirs(basedir)
+			tmpname = '{}.{}.tmp'.format(fname, os.getpid())
+			with open(tmpname, 'w') as fval:
+				fval.write(val)
+			os.rename(tmpname, fname)
+		except (IOError, OSError) as err:
+			print('WARNING, value caching to "{}" is failed: {}'.format(fname, err), file=sys.stderr)
+
+
 if __name__ == "__main__":
 	"""Doc tests execution"""
 	import doctest
@@ -5,9 +5,23 @@
 \descr:  Multi-Process Execution Pool to schedule Jobs execution with per-Job timeout,
 	optionally grouping them into Tasks and specifying execution paremeters:
 	- timeout per each Job (it was the main motivation to implemtent this module)
-	- onstart/ondone callbacks, ondone is called only on successful completion (not termination)
+	- onstart/ondone callbacks, ondone is called only on successful completion (zero exit code, not termination)
 	- stdout/err output, which can be redireted to any custom file or PIPE
 	- custom parameters for each job and task besides the name/id
+	- resources consumption (execution and CPU time, peak RSS) of each job process,
+		optionally appended to the profile file in the exectime format
+	- optional memory limit for the workers, the jobs are started only if their
+		expected memory fits the limit considering RSS of the running workers
+	- dependencies of the jobs on other jobs and tasks, the job is started only after
+		the successful completion of all its prerequisites and cancelled if any of them fails
+	- calls of Python functions by the persistent worker processes, which are started
+		once and reused for the subsequent calls (recycled on timeout)
+	- optional journal of the executed jobs to resume the interrupted execution
+		skipping the jobs that were successfully completed on the same inputs
+	- priorities of the jobs, the postponed jobs with the higher priority are started
+		first (for example, the longest expected jobs to reduce the makespan)
+	- optional CPU affinity of the workers, each worker slot is pinned to the dedicated
+		set of CPU cores located within a single NUMA node
 
 	Flexible API provides optional automatic restart of jobs on timeout, access to job's process,
 	parent task, start and stop execution time and much more...
@@ -21,11 +35,24 @@ from __future__ import print_function  # Required for stderr output, must be the
 import sys
 import time
 import subprocess
-import collections
+import heapq  # Priority queue of the postponed jobs
 import os
 import ctypes  # Required for the multiprocessing Value definition
 import types  # Required for instance methods definition
 import traceback  # Stacktrace
+import signal  # Notification on the child processes completion
+import select  # Waiting for the notifications
+import errno
+import fcntl  # Non-blocking notification pipe
+import json  # Jobs journal
+import hashlib  # Jobs identification in the journal
+import glob  # NUMA nodes enumeration
+import ctypes.util  # CPU affinity by the libc for the old Python versions
+
+try:
+	import cPickle as pickle
+except ImportError:
+	import pickle
 
 from multiprocessing import cpu_count
 from multiprocessing import Value
@@ -35,6 +62,12 @@ from subprocess import STDOUT
 
 DEBUG_TRACE = False  # Trace start / stop and other events to stderr
 
+try:
+	_PAGESIZE = os.sysconf('SC_PAGE_SIZE')  # Size of the memory page in bytes
+except (ValueError, OSError, AttributeError):
+	_PAGESIZE = 4096
+_libc = None  # C library to set the CPU affinity if os.sched_setaffinity is not available
+
 
 def secondsToHms(seconds):
 	"""Convert seconds to hours, mins, secs
@@ -50,6 +83,503 @@ def secondsToHms(seconds):
 	return hours, mins, secs
 
 
+def setCloexec(fd):
+	"""Prevent inheritance of the file descriptor by the child processes
+
+	fd  - file descriptor
+	"""
+	fcntl.fcntl(fd, fcntl.F_SETFD, fcntl.fcntl(fd, fcntl.F_GETFD) | fcntl.FD_CLOEXEC)
+
+
+def parseCpuList(cpulist):
+	"""Parse the list of CPUs in the Linux sysfs format
+
+	cpulist  - CPUs list: <cpu>[-<cpu_last>][,...]
+
+	return  - list of the CPU indices
+
+	>>> parseCpuList('0-3,8,10-11')
+	[0, 1, 2, 3, 8, 10, 11]
+	>>> parseCpuList('')
+	[]
+	"""
+	cpus = []
+	for span in cpulist.strip().split(','):
+		if not span:
+			continue
+		bounds = span.split('-', 1)
+		cpus.extend(range(int(bounds[0]), int(bounds[-1]) + 1))
+	return cpus
+
+
+def cpuNodes():
+	"""CPUs of the NUMA nodes
+
+	return  - list of the CPU lists of each NUMA node, a single node with all CPUs
+		if the NUMA topology is not available
+	"""
+	nodes = []
+	for nodecpus in sorted(glob.glob('/sys/devices/system/node/node[0-9]*/cpulist')
+	, key=lambda path: int(path.split('/')[-2][4:])):
+		try:
+			with open(nodecpus, 'r') as fcpus:
+				cpus = parseCpuList(fcpus.read())
+		except (IOError, ValueError):
+			continue
+		if cpus:
+			nodes.append(cpus)
+	if not nodes:
+		nodes.append(range(cpu_count()))
+	return nodes
+
+
+def affinitySlots(workers, nodes):
+	"""Dedicated sets of CPUs for the worker slots, each set is located within a single NUMA node
+
+	workers  - number of the worker slots
+	nodes  - CPU lists of the NUMA nodes
+
+	return  - list of the CPU lists for each worker slot. The slots are interleaved
+		over the NUMA nodes, the CPUs are shared only if there are more slots than CPUs
+
+	>>> affinitySlots(4, [[0, 1, 2, 3], [4, 5, 6, 7]])
+	[[0, 1], [4, 5], [2, 3], [6, 7]]
+	>>> affinitySlots(3, [[0, 1, 2, 3], [4, 5, 6, 7]])
+	[[0, 1], [4, 5], [2, 3]]
+	>>> affinitySlots(3, [[0, 1]])
+	[[0], [1], [0]]
+	"""
+	assert workers >= 1 and nodes, 'Parameters validaiton failed'
+	ncpus = sum(len(cpus) for cpus in nodes)
+	span = max(ncpus // workers, 1)  # Number of CPUs per slot
+	# CPU sets of each node not crossing the node boundaries
+	nodesets = [[cpus[i:i + span] for i in range(0, len(cpus) - span + 1, span)] or [cpus] for cpus in nodes]
+	# Interleave the nodes to balance the memory bandwidth
+	cpusets = []
+	for i in range(max(len(sets) for sets in nodesets)):
+		cpusets.extend(sets[i] for sets in nodesets if i < len(sets))
+	return [cpusets[i % len(cpusets)] for i in range(workers)]
+
+
+def setAffinity(pid, cpus):
+	"""Set the CPU affinity of the process
+
+	pid  - process id, 0 means the current process
+	cpus  - CPUs to be used by the process
+	"""
+	if hasattr(os, 'sched_setaffinity'):
+		os.sched_setaffinity(pid, cpus)
+		return
+	global _libc
+	if _libc is None:
+		_libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+	wordbits = ctypes.sizeof(ctypes.c_ulong) * 8
+	mask = (ctypes.c_ulong * (max(cpus) // wordbits + 1))()
+	for cpu in cpus:
+		mask[cpu // wordbits] |= 1 << (cpu % wordbits)
+	if _libc.sched_setaffinity(pid, ctypes.sizeof(mask), mask) != 0:
+		err = ctypes.get_errno()
+		raise OSError(err, os.strerror(err))
+
+
+def pinProcess(cpus):
+	"""Pin the current process to the CPUs ignoring the failures, executed in the child process before exec
+
+	cpus  - CPUs to be used by the process
+	"""
+	try:
+		setAffinity(0, cpus)
+	except OSError:
+		pass  # The process is executed without the affinity
+
+
+def rssMemory(pid):
+	"""Current RSS RAM of the process
+
+	pid  - process id
+
+	return  - RSS RAM in Mb, 0 if the process is not available (completed or non-Linux OS)
+	"""
+	try:
+		with open('/proc/{}/statm'.format(pid), 'r') as fstat:
+			return int(fstat.read().split(None, 2)[1]) * _PAGESIZE / (1024. * 1024)  # pages -> Mb
+	except (IOError, ValueError, IndexError):
+		return 0
+
+
+class ChildNotifier(object):
+	"""Notifier of the child processes completion (SIGCHLD) using the self-pipe
+
+	Allows to wait for the completion of any child process up to the specified
+	timeout instead of sleeping the fixed latency. The SIGCHLD handler is installed
+	only inside the "with" statement and only in the main thread, otherwise the
+	waiting falls back to the plain sleeping.
+	"""
+	def __init__(self, enabled=True):
+		"""Notifier constructor
+
+		enabled  - whether to install the SIGCHLD handler or just sleep on waiting
+
+		active  - whether the SIGCHLD handler is installed and notifications are delivered
+		"""
+		self.enabled = enabled
+		self.active = False
+		# Private attributes
+		self._rfd, self._wfd = os.pipe()
+		for fd in (self._rfd, self._wfd):
+			fcntl.fcntl(fd, fcntl.F_SETFL, fcntl.fcntl(fd, fcntl.F_GETFL) | os.O_NONBLOCK)
+			setCloexec(fd)
+		self._sighdl = None  # Former SIGCHLD handler to be restored
+
+
+	def __del__(self):
+		for fd in (self._rfd, self._wfd):
+			try:
+				os.close(fd)
+			except OSError:
+				pass
+
+
+	def __enter__(self):
+		if not self.enabled:
+			return self
+		try:
+			self._sighdl = signal.signal(signal.SIGCHLD, self._onchild)
+		except ValueError:
+			# Signal handlers can be set only in the main thread, polling is used
+			return self
+		# Restart the system calls interrupted by the notification
+		signal.siginterrupt(signal.SIGCHLD, False)
+		self.active = True
+		return self
+
+
+	def __exit__(self, exception_type, exception_val, trace):
+		if self.active:
+			signal.signal(signal.SIGCHLD, self._sighdl if self._sighdl is not None else signal.SIG_DFL)
+			self._sighdl = None
+			self.active = False
+
+
+	def _onchild(self, signum, frame):
+		"""SIGCHLD handler"""
+		try:
+			os.write(self._wfd, b'\0')
+		except OSError:
+			pass  # The pipe is full, so the notification is already pending
+
+
+	def wait(self, timeout, fds=()):
+		"""Wait for the child process completion
+
+		timeout  - max waiting time in sec, >= 0
+		fds  - additional file descriptors to wait for the input
+
+		return  - whether the notification or input occurred before the timeout
+		"""
+		assert timeout >= 0, 'timeout validation failed'
+		rfds = list(fds)
+		if self.active:
+			rfds.append(self._rfd)
+		if not rfds:
+			time.sleep(timeout)
+			return False
+		try:
+			ready = select.select(rfds, (), (), timeout)[0]
+		except select.error as err:
+			if err.args[0] != errno.EINTR:
+				raise
+			return True  # Interrupted by the signal
+		# Consume all pending notifications
+		if self.active and self._rfd in ready:
+			try:
+				while os.read(self._rfd, 512):
+					pass
+			except OSError:
+				pass  # The pipe is empty
+		return bool(ready)
+
+
+class PyWorker(object):
+	"""Persistent worker process executing calls of Python functions (contrib/pyworker.py)
+
+	The worker executes the calls one by one, so the interpreter is started and the
+	modules are imported only once for all calls executed by the worker.
+	"""
+	def __init__(self, pyexec=sys.executable):
+		"""Start the worker process
+
+		pyexec  - Python interpreter of the worker
+
+		proc  - process of the worker
+		rfd  - file descriptor to read the completion of the calls
+		busy  - whether the worker executes a call
+		"""
+		rfd, wfd = os.pipe()
+		try:
+			self.proc = subprocess.Popen((pyexec, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pyworker.py')
+				, str(wfd)), stdin=PIPE, close_fds=False)
+		finally:
+			os.close(wfd)
+		# Only the descriptors of the worker itself should be inherited by the child processes
+		setCloexec(self.proc.stdin.fileno())
+		setCloexec(rfd)
+		fcntl.fcntl(rfd, fcntl.F_SETFL, fcntl.fcntl(rfd, fcntl.F_GETFL) | os.O_NONBLOCK)
+		self.rfd = rfd
+		self.busy = False
+		# Private attributes
+		self._buf = b''  # Partially read completion status
+
+
+	def __del__(self):
+		self.close()
+
+
+	def call(self, job):
+		"""Start execution of the job call
+
+		job  - the job specifying pycall
+		"""
+		module, function, args = job.pycall
+		stdout = job.stdout if isinstance(job.stdout, str) else None
+		stderr = job.stderr if isinstance(job.stderr, str) or job.stderr == STDOUT else None
+		pickle.dump((job.workdir, module, function, tuple(args), stdout, stderr), self.proc.stdin, 2)
+		self.proc.stdin.flush()
+		self.busy = True
+
+
+	def result(self):
+		"""Fetch the completion status of the call if it is completed
+
+		return  - None if the call is not completed, otherwise
+			(status, usrtime, kerntime, rssmem), where status is 0 on success
+			and rssmem is the peak RSS of the call or None if it is not available
+		"""
+		if b'\n' not in self._buf:
+			try:
+				self._buf += os.read(self.rfd, 512)
+			except OSError as err:
+				if err.errno not in (errno.EAGAIN, errno.EWOULDBLOCK):
+					raise
+		if b'\n' not in self._buf:
+			return None
+		ln, self._buf = self._buf.split(b'\n', 1)
+		self.busy = False
+		status, usrtime, kerntime, rssmem = ln.split()
+		rssmem = float(rssmem)
+		return int(status), float(usrtime), float(kerntime), rssmem if rssmem >= 0 else None
+
+
+	def close(self):
+		"""Complete the worker after the current call"""
+		if self.rfd is None:
+			return
+		try:
+			self.proc.stdin.close()
+		except IOError:
+			pass  # The worker is already terminated
+		os.close(self.rfd)
+		self.rfd = None
+
+
+class JobsJournal(object):
+	"""Append-only journal of the executed jobs, which is used to resume the interrupted execution
+
+	Each line of the journal is a JSON record of the job with the following fields:
+		name  - job name
+		ahash  - hash of the job execution arguments (args or pycall and workdir)
+		status  - started, done or failed
+		inputs  - {<file>: [<size>, <mtime>]} for the files existed on the job starting,
+			which are specified by the execution arguments (including the executable itself)
+		outputs  - {<path>: <stamp>} for the existing stdout, stderr and output paths of the
+			completed job, where the stamp is [<size>, <mtime>] for the file and
+			[<files>, <size>, <mtime>] (the number of files, their total size and the latest
+			mtime) for the dir
+		time  - timestamp of the record
+
+	The job is restored (skipped) if its last record has "done" status, all its
+	inputs are unchanged and all its recorded outputs still exist unchanged. The jobs with PIPE output, stub jobs and the jobs excluded
+	by their journal attribute (which ondone produces the results) are not journaled.
+	"""
+	def __init__(self, fname, restore=False):
+		"""Open the journal
+
+		fname  - file name of the journal
+		restore  - load the journal to restore the completed jobs, otherwise the journal is reset
+
+		restored  - number of the restored jobs
+		"""
+		self.restored = 0
+		# Private attributes
+		self._done = {}  # Completed jobs: (name, ahash): (inputs, outputs)
+		if restore and os.path.exists(fname):
+			with open(fname, 'r') as fjnl:
+				for ln in fjnl:
+					try:
+						rec = json.loads(ln)
+						jid = (rec['name'], rec['ahash'])
+						# The outputs without the stamps can not be validated, so such jobs are rerun
+						if rec['status'] == 'done' and isinstance(rec['outputs'], dict):
+							self._done[jid] = (rec['inputs'], rec['outputs'])
+						else:
+							self._done.pop(jid, None)
+					except (ValueError, KeyError, TypeError):
+						# The last record can be incomplete if the execution was interrupted
+						print('WARNING, invalid record of the jobs journal "{}" is skipped: {}'
+							.format(fname, ln.rstrip()), file=sys.stderr)
+		basedir = os.path.split(fname)[0]
+		if basedir and not os.path.exists(basedir):
+			os.makedirs(basedir)
+		self._fjnl = open(fname, 'a' if restore else 'w')
+
+
+	def __del__(self):
+		self._fjnl.close()
+
+
+	@staticmethod
+	def journaled(job):
+		"""Whether the job can be journaled
+
+		job  - the job
+
+		return  - the job has the execution arguments, is not PIPE-dependent and is not excluded
+		"""
+		return job.journal and bool(job.args or job.pycall) and PIPE not in (job.stdout, job.stderr)
+
+
+	@staticmethod
+	def identity(job):
+		"""Identity of the job
+
+		job  - the job
+
+		return  - (name, ahash)
+		"""
+		return job.name, hashlib.md5(repr((job.workdir, job.pycall or tuple(job.args)))).hexdigest()
+
+
+	@staticmethod
+	def inputs(job):
+		"""Existing files specified by the execution arguments of the job
+
+		job  - the job
+
+		return  - {<file>: [<size>, <mtime>]}
+		"""
+		args = list(job.args) if not job.pycall else [job.pycall[0] + '.py'] + list(job.pycall[2])
+		inputs = {}
+		for arg in args:
+			if not isinstance(arg, str):
+				continue
+			# Consider options having the values: -x=<value>
+			if arg.startswith('-') and '=' in arg:
+				arg = arg.split('=', 1)[1]
+			fname = os.path.join(job.workdir, arg) if job.workdir else arg
+			try:
+				if os.path.isfile(fname):
+					fstat = os.stat(fname)
+					inputs[arg] = [fstat.st_size, fstat.st_mtime]
+			except OSError:
+				pass  # The file is removed
+		return inputs
+
+
+	@staticmethod
+	def pathStamp(path):
+		"""Stamp of the output path
+
+		path  - file or dir
+
+		return  - [<size>, <mtime>] for the file, [<files>, <size>, <mtime>] for the dir
+			or None if the path does not exist
+		"""
+		try:
+			if not os.path.isdir(path):
+				fstat = os.stat(path)
+				return [fstat.st_size, fstat.st_mtime]
+			files = 0
+			size = 0
+			mtime = 0
+			for root, dirs, fnames in os.walk(path):
+				for fname in fnames:
+					fstat = os.stat(os.path.join(root, fname))
+					files += 1
+					size += fstat.st_size
+					mtime = max(mtime, fstat.st_mtime)
+			return [files, size, mtime]
+		except OSError:
+			return None  # The path is removed
+
+
+	def outputs(self, job):
+		"""Stamps of the existing outputs of the job
+
+		job  - the job
+
+		return  - {<path>: <stamp>}
+		"""
+		outputs = {}
+		for outp in (job.stdout, job.stderr) + tuple(job.outputs):
+			if isinstance(outp, str) and outp != os.devnull:
+				stamp = self.pathStamp(outp)
+				if stamp is not None:
+					outputs[outp] = stamp
+		return outputs
+
+
+	def restorable(self, job):
+		"""Whether the job was completed on the same inputs and its outputs are intact
+
+		job  - the job
+
+		return  - the job can be skipped
+		"""
+		if not self._done or not self.journaled(job):
+			return False
+		done = self._done.get(self.identity(job))
+		if done is None:
+			return False
+		inputs, outputs = done
+		# The outputs might be removed, backed up or modified after the completion
+		for outp, stamp in outputs.iteritems():
+			if self.pathStamp(outp) != stamp:
+				return False
+		# Note: inputs of the completed job can include its outputs, which existed on its starting
+		for arg, (size, mtime) in inputs.iteritems():
+			fname = os.path.join(job.workdir, arg) if job.workdir else arg
+			try:
+				fstat = os.stat(fname)
+			except OSError:
+				return False
+			if fstat.st_size != size or fstat.st_mtime != mtime:
+				return False
+		self.restored += 1
+		return True
+
+
+	def record(self, job, status):
+		"""Append the job record to the journal
+
+		job  - the job
+		status  - job status: started, done or failed
+		"""
+		if not self.journaled(job):
+			return
+		# Note: inputs are fetched only on the first starting, the restarted job can produce some outputs
+		if job._jinputs is None:
+			job._jinputs = self.inputs(job)
+		name, ahash = self.identity(job)
+		rec = {'name': name, 'ahash': ahash, 'status': status, 'inputs': job._jinputs, 'time': time.time()}
+		if status != 'started':
+			rec['outputs'] = self.outputs(job)
+		self._fjnl.write(json.dumps(rec))
+		self._fjnl.write('\n')
+		# The journal should survive the crash of the benchmark
+		self._fjnl.flush()
+		os.fsync(self._fjnl.fileno())
+
+
 class Task(object):
 	""" Container of Jobs"""
 	#TODO: Implement timeout support in add/delJob
@@ -103,6 +633,7 @@ class Task(object):
 		# Run onstart if required
 		if initial:
 			self.tstart = time.time()
+			self.tstop = None  # The task can be reopened after the completion of its former jobs
 			if self.onstart:
 				self.onstart()
 		return self
@@ -137,7 +668,8 @@ class Job(object):
 	"""
 	# NOTE: keyword-only arguments are specified after the *, supported only since Python 3
 	def __init__(self, name, workdir=None, args=(), timeout=0, ontimeout=False, task=None #,*
-	, startdelay=0, onstart=None, ondone=None, params=None, stdout=sys.stdout, stderr=sys.stderr):
+	, startdelay=0, onstart=None, ondone=None, params=None, stdout=sys.stdout, stderr=sys.stderr
+	, rcpoutp=None, rcpname=None, memory=0, deps=None, pycall=None, priority=0, journal=True, outputs=()):
 		"""Initialize job to be executed
 
 		name  - job name
@@ -157,19 +689,59 @@ class Job(object):
 			the job. Default: None
 			ATTENTION: must be lightweight
 			NOTE: can be executed a few times if the job is restarted on timeout
-		ondone  - callback which is executed on successful completion of the job in the
-			CONTEXT OF THE CALLER (main process) with the single argument, the job. Default: None
+		ondone  - callback which is executed on successful completion of the job (zero exit code
+			of the process or the pycall status) in the CONTEXT OF THE CALLER (main process) with
+			the single argument, the job. Default: None
 			ATTENTION: must be lightweight
 		params  - additional parameters to be used in callbacks
 		stdout  - None or file name or PIPE for the buffered output to be APPENDED
 		stderr  - None or file name or PIPE or STDOUT for the unbuffered error output to be APPENDED
 			ATTENTION: PIPE is a buffer in RAM, so do not use it if the output data is huge or unlimited
+		rcpoutp  - None or file name to APPEND the resources consumption profile of the job
+			process on its completion or termination. The path is relative to the CALLER,
+			the format is compatible with the exectime profiler
+		rcpname  - task name in the resources consumption profile. Default: the job name
+		memory  - expected peak RSS RAM of the job process in Mb, which is considered by the pool
+			with the memory limit to start the job. Default: 0, means unknown (the job is
+			postponed only if the running workers already exhaust the limit)
+		deps  - prerequisite jobs and tasks, which should be successfully completed before the
+			starting of this job. The job is cancelled (completed non-gracefully) if any of
+			the prerequisites fails (terminated or exited with a non-zero code). Considered only
+			for the async execution. Default: None
+			ATTENTION: the prerequisite task is completed only when all its jobs are completed,
+			so it should have at least one job
+		pycall  - (module, function, args) to be called by the persistent Python worker of the
+			pool instead of the process execution of the args. The module is imported from the
+			workdir, stdout and stderr can be only file names (stderr also STDOUT), otherwise
+			the output channels of the worker are used.
+			Considered only for the async execution. Default: None
+		priority  - scheduling priority of the job, a number. The postponed jobs with the higher
+			priority are started first, the jobs with the same priority are started in the order
+			of their scheduling. Default: 0
+		journal  - whether the job is journaled to be restored on the resumed execution by the
+			pool with the journal. Should be False for the jobs which ondone callback produces
+			the results, because the ondone of the restored jobs is not called. Default: True
+		outputs  - output paths (files or dirs) of the job besides its stdout and stderr files,
+			relative to the CALLER. The job is restored from the journal only if its recorded
+			outputs are intact
 
 		tstart  - start time is filled automatically on the execution start (before onstart). Default: None
 		tstop  - termination / completion time after ondone
 		proc  - process of the job, can be used in the ondone() to read it's PIPE
+
+		Resources consumption of the job process is filled on its completion or termination,
+		before the ondone() callback, None otherwise:
+		exectime  - wall-clock execution time, sec
+		usrtime  - CPU time in the user mode, sec
+		kerntime  - CPU time in the kernel mode, sec
+		rssmem  - peak RSS RAM, Mb
+		retcode  - exit code of the job process or the status of the pycall, 0 on success
+
+		graceful  - whether the job is successfully completed, None until the completion
 		"""
 		assert isinstance(name, str) and timeout >= 0 and (task is None or isinstance(task, Task)), 'Parameters validaiton failed'
+		assert not pycall or (len(pycall) == 3 and stdout is not PIPE and stderr is not PIPE), (
+			'Python calls validation failed')
 		#if not args:
 		#	args = ("false")  # Create an empty process to schedule it's execution
 
@@ -189,14 +761,35 @@ class Job(object):
 		# I/O redirection ------------------------------------------------------
 		self.stdout = stdout
 		self.stderr = stderr
+		self.rcpoutp = rcpoutp
+		self.rcpname = rcpname if rcpname else name
+		self.memory = memory
+		self.deps = deps
+		self.pycall = pycall
+		self.priority = priority
+		self.journal = journal
+		self.outputs = outputs
 		# Internal properties --------------------------------------------------
 		self.tstart = None  # start time is filled automatically on the execution start, before onstart. Default: None
 		self.tstop = None  # SyncValue()  # Termination / completion time after ondone
+		self.graceful = None  # The job is successfully completed
+		# Resources consumption of the completed process
+		self.exectime = None
+		self.usrtime = None
+		self.kerntime = None
+		self.rssmem = None
+		self.retcode = None
 		# Private attributes
 		self.proc = None  # Process of the job, can be used in the ondone() to read it's PIPE
 		# Process-related file descriptors to be closed
 		self._fstdout = None
 		self._fstderr = None
+		self._tproc = None  # Start time of the process
+		self._depsnum = 0  # Number of the prerequisites to be completed
+		self._pyworker = None  # Persistent Python worker executing the pycall
+		self._slot = None  # Worker slot of the pool pinned to the dedicated CPUs
+		self._jinputs = None  # Inputs of the job in the journal
+		self._tmemwait = None  # Time when the job is postponed by the memory limit the first time
 
 
 	def complete(self, graceful=True):
@@ -212,6 +805,9 @@ class Job(object):
 				fd.close()
 		self._fstdout = None
 		self._fstderr = None
+		# Output the resources consumption profile if required
+		if self.rcpoutp and self.rssmem is not None:
+			self.__saveRcp()
 
 		# Job-related post execution
 		if graceful:
@@ -246,9 +842,23 @@ class Job(object):
 		if self.task:
 			self.task = self.task.delJob(graceful)
 		# Updated execution status
+		self.graceful = graceful
 		self.tstop = time.time()
 
 
+	def __saveRcp(self):
+		"""Append the resources consumption profile of the job process to the rcpoutp"""
+		try:
+			with open(self.rcpoutp, 'a') as frcp:
+				if not os.path.getsize(self.rcpoutp):
+					frcp.write('# ExecTime(sec)\tCPU_time(sec)\tCPU_usr(sec)\tCPU_kern(sec)\tRSS_RAM_peak(Mb)\tTaskName\n')
+				frcp.write('{:.6f}\t{:.6f}\t{:.6f}\t{:.6f}\t{:.3f}\t{}\n'.format(self.exectime
+					, self.usrtime + self.kerntime, self.usrtime, self.kerntime, self.rssmem, self.rcpname))
+		except IOError as err:
+			print('ERROR on the resources consumption output of "{}" to "{}": {}'
+				.format(self.name, self.rcpoutp, err), file=sys.stderr)
+
+
 class ExecPool(object):
 	'''Execution Pool of workers for jobs
 
@@ -256,24 +866,60 @@ class ExecPool(object):
 	each subsequent job.
 	'''
 
-	def __init__(self, workers=cpu_count()):
+	def __init__(self, workers=cpu_count(), notify=True, memlimit=0, pyexec=sys.executable, journal=None, restore=False
+	, affinity=False):
 		"""Execution Pool constructor
 
 		workers  - number of resident worker processes
+		notify  - revise the workers as soon as any of them is completed (SIGCHLD notification)
+			instead of the polling with the fixed latency. Polling is used anyway if the
+			notifications are not available (the pool is joined outside the main thread)
+		memlimit  - max RSS RAM in Mb of all workers, >= 0. Memory of each worker is evaluated as
+			the max of its current RSS and the expected memory of the job. The scheduled job is
+			postponed if it does not fit the limit, the subsequent smaller jobs are started
+			instead unless the postponed job waits longer than the memory waiting threshold,
+			then the memory released by the completed jobs is reserved for it. The job is started
+			anyway when there are no other workers. Default: 0, means unlimited
+		pyexec  - Python interpreter of the persistent workers executing the pycall of jobs
+		journal  - file name of the journal of the executed jobs. Default: None, not journaled
+		restore  - skip the jobs that were successfully completed on the same inputs according to
+			the journal (their ondone callbacks are not called), otherwise the journal is reset
+		affinity  - pin each worker slot to the dedicated set of CPU cores located within a single
+			NUMA node to reduce the migration of the workers and the remote memory access,
+			which yields more reproducible resources consumption of the jobs.
+			Considered only for the async execution
+
+		restore  - whether the jobs are restored from the journal
 		"""
-		assert workers >= 1, 'At least one worker should be managed by the pool'
+		assert workers >= 1 and memlimit >= 0, 'Parameters validaiton failed'
 
 		self._workersLim = workers  # Max number of workers
+		self._memlimit = memlimit  # Max RSS RAM of the workers in Mb, 0 means unlimited
 		self._workers = {}  # Current workers: 'jname': <proc>; <proc>: timeout
-		self._jobs = collections.deque()  # Scheduled jobs: 'jname': **args
+		self._jobs = []  # Postponed jobs, heap of (-priority, scheduling order, job)
+		self._scheduled = 0  # Number of the scheduled jobs, defines the order of the jobs with the same priority
 		self._tstart = None  # Start time of the execution of the first task
+		self._notifier = ChildNotifier(notify)  # Notifier of the workers completion
 		# Predefined privte attributes
-		self._latency = 1  # 1 sec of sleep on pooling
+		self._latency = 1  # 1 sec of sleep on pooling, max waiting time for the notifications
 		self._killCount = 3  # 3 cycles of self._latency, termination wait time
+		self._memwait = 10 * 60  # 10 min, max waiting time of the job postponed by the memory limit before the memory reservation
+		self._memscan = 64  # Max number of the postponed jobs scanned per revision by the memory limit
+		self._terminating = {}  # Workers terminated by the timeout: <proc>: termination start time, 0 if killed
+		self._dependents = {}  # Jobs waiting for the prerequisites: <prerequisite job or task>: [<dependent job>, ...]
+		self._pyexec = pyexec  # Python interpreter of the persistent workers
+		self._pyworkers = []  # Idle persistent Python workers
+		self._journal = JobsJournal(journal, restore) if journal else None  # Journal of the executed jobs
+		self.restore = restore and self._journal is not None
+		self._cpusets = affinitySlots(workers, cpuNodes()) if affinity else None  # CPUs of the worker slots
+		self._slots = range(workers - 1, -1, -1) if affinity else None  # Free worker slots
 
 
 	def __del__(self):
 		self.__terminate()
+		for worker in self._pyworkers:
+			self.__dropWorker(worker)
+		self._pyworkers = []
 
 
 	def __finalize__(self):
@@ -282,14 +928,16 @@ class ExecPool(object):
 
 	def __terminate(self):
 		"""Force termination of the pool"""
-		if not self._jobs and not self._workers:
+		if not self._jobs and not self._workers and not self._dependents:
 			return
 
 		print('WARNING: terminating the workers pool ...')
-		for job in self._jobs:
+		for job in sorted(self._jobs):
+			job = job[2]
 			job.complete(False)
 			print('  Scheduled "{}" is removed'.format(job.name))
-		self._jobs.clear()
+		self._jobs = []
+		self.__cancelDependents()
 		while self._workers:
 			procs = self._workers.keys()
 			for proc in procs:
@@ -301,20 +949,86 @@ class ExecPool(object):
 			while active and i < self._killCount:
 				active = False
 				for proc in procs:
-					if proc.poll() is None:
+					if not self.__reap(self._workers[proc]):
 						active = True
 						break
 				time.sleep(self._latency)
 			# Kill nonterminated processes
 			if active:
 				for proc in procs:
-					if proc.poll() is None:
+					if not self.__reap(self._workers[proc]):
 						print('  Killing the worker #{} ...'.format(proc.pid), file=sys.stderr)
 						proc.kill()
+						self.__reap(self._workers[proc], True)
 			# Tidy jobs
 			for job in self._workers.values():
+				self.__recycleWorker(job, True)
+				self.__releaseSlot(job)
 				job.complete(False)
 			self._workers.clear()
+			self._terminating.clear()
+
+
+	def __cancelDependents(self):
+		"""Cancel all jobs waiting for their prerequisites"""
+		for jobs in self._dependents.itervalues():
+			for job in jobs:
+				if job.tstop is None:
+					print('  Dependent "{}" is cancelled'.format(job.name), file=sys.stderr)
+					job.complete(False)
+		self._dependents.clear()
+
+
+	@staticmethod
+	def _depState(dep):
+		"""State of the prerequisite
+
+		dep  - prerequisite job or task
+
+		return  - None if dep is not completed yet, True on the successful completion, False otherwise
+		"""
+		if isinstance(dep, Job):
+			return dep.graceful
+		if not dep._graceful.value:
+			return False
+		return True if dep.tstop is not None else None
+
+
+	def __complete(self, job, graceful=True):
+		"""Complete the job and release the jobs dependent on it and its task
+
+		job  - the job to be completed
+		graceful  - the job is successfully completed or it was terminated
+		"""
+		task = job.task
+		job.complete(graceful)
+		if self._journal and job._jinputs is not None:
+			self._journal.record(job, 'done' if graceful else 'failed')
+		self.__release(job)
+		if task:
+			self.__release(task)
+
+
+	def __release(self, dep):
+		"""Schedule the jobs waiting for the completed prerequisite or cancel them if it failed
+
+		dep  - prerequisite job or task
+		"""
+		state = self._depState(dep)
+		if state is None:
+			return
+		for job in self._dependents.pop(dep, ()):
+			if job.tstop is not None:
+				continue  # The job is already cancelled by another prerequisite
+			if not state:
+				if DEBUG_TRACE:
+					print('"{}" is cancelled by the failed prerequisite "{}"'.format(job.name, dep.name)
+						, file=sys.stderr)
+				self.__complete(job, False)
+				continue
+			job._depsnum -= 1
+			if not job._depsnum:
+				self.__postpone(job)
 
 
 	def __startJob(self, job, async=True):
@@ -351,6 +1065,9 @@ class ExecPool(object):
 					basedir = os.path.split(joutp)[0]
 					if not os.path.exists(basedir):
 						os.makedirs(basedir)
+					# Output of the Python call is opened by the worker
+					if job.pycall:
+						continue
 					try:
 						if joutp == job.stdout:
 							self._fstdout = open(joutp, 'a')
@@ -376,27 +1093,156 @@ class ExecPool(object):
 			if DEBUG_TRACE and (fstdout or fstderr):
 				print('"{}" output channels:\n\tstdout: {}\n\tstderr: {}'.format(job.name
 					, str(job.stdout), str(job.stderr)))
-			if(job.args):
+			if self._journal:
+				self._journal.record(job, 'started')
+			cpus = None  # CPUs of the worker slot
+			if async and self._slots is not None and (job.pycall or job.args):
+				job._slot = self._slots.pop()
+				cpus = self._cpusets[job._slot]
+			if job.pycall:
+				job._tproc = time.time()
+				self.__callPy(job)
+				if cpus:
+					try:
+						setAffinity(job.proc.pid, cpus)
+					except OSError as err:
+						print('WARNING, CPU affinity of "{}" is not set: {}'.format(job.name, err), file=sys.stderr)
+			elif(job.args):
 				#print('Opening proc with:\n\tjob.args: {},\n\tcwd: {}'.format(' '.join(job.args), job.workdir), file=sys.stderr)
-				job.proc = subprocess.Popen(job.args, bufsize=-1, cwd=job.workdir, stdout=fstdout, stderr=fstderr)  # bufsize=-1 - use system default IO buffer size
+				job._tproc = time.time()
+				job.proc = subprocess.Popen(job.args, bufsize=-1, cwd=job.workdir, stdout=fstdout, stderr=fstderr
+					, preexec_fn=(lambda: pinProcess(cpus)) if cpus else None)  # bufsize=-1 - use system default IO buffer size
 				# Wait a little bit to start the process besides it's scheduling
 				if job.startdelay > 0:
 					time.sleep(job.startdelay)
 		except StandardError as err:  # Should not occur: subprocess.CalledProcessError
 			print('ERROR on "{}" execution occurred: {}, skipping the job. {}'.format(
 				job.name, err, traceback.format_exc()), file=sys.stderr)
+			self.__releaseSlot(job)
 			# Note: process-associated file descriptors are closed in complete()
-			job.complete(False)
+			self.__complete(job, False)
 		else:
-			if async:
+			if not job.proc:
+				# Stub job without the process, only the callbacks are executed
+				self.__complete(job)
+			elif async:
 				self._workers[job.proc] = job
 			else:
-				job.proc.wait()
-				job.complete()
+				self.__reap(job, True)
+				self.__complete(job, job.retcode == 0)
 				return job.proc.returncode
 		return 0
 
 
+	def __callPy(self, job):
+		"""Start the pycall of the job by the idle or a new persistent Python worker
+
+		job  - the job specifying pycall
+		"""
+		while self._pyworkers:
+			worker = self._pyworkers.pop()
+			try:
+				worker.call(job)
+			except IOError:
+				# The idle worker was terminated externally
+				self.__dropWorker(worker)
+				continue
+			break
+		else:
+			worker = PyWorker(self._pyexec)
+			worker.call(job)
+		job._pyworker = worker
+		job.proc = worker.proc
+
+
+	def __recycleWorker(self, job, drop=False):
+		"""Release the persistent Python worker of the completed job
+
+		job  - the completed job
+		drop  - complete the worker instead of its reusing
+		"""
+		worker = job._pyworker
+		if not worker:
+			return
+		job._pyworker = None
+		if drop or len(self._pyworkers) >= self._workersLim:
+			self.__dropWorker(worker)
+		else:
+			self._pyworkers.append(worker)
+
+
+	def __releaseSlot(self, job):
+		"""Release the worker slot of the completed job
+
+		job  - the completed job
+		"""
+		if job._slot is not None:
+			self._slots.append(job._slot)
+			job._slot = None
+
+
+	def __dropWorker(self, worker):
+		"""Complete the persistent Python worker
+
+		worker  - idle or terminated worker to be completed
+		"""
+		worker.close()
+		try:
+			worker.proc.wait()
+		except OSError:
+			pass  # The worker is already reaped
+
+
+	def __reap(self, job, wait=False):
+		"""Reap the job process if it is completed fetching its resources consumption
+
+		job  - the job, which process should be reaped
+		wait  - wait for the process completion
+
+		return  - whether the process is completed
+		"""
+		proc = job.proc
+		worker = job._pyworker
+		if worker:
+			if worker.busy:
+				result = worker.result()
+				if result is not None:
+					job.exectime = time.time() - job._tproc
+					job.retcode, job.usrtime, job.kerntime, job.rssmem = result
+			if not worker.busy:
+				return True
+		if proc.returncode is not None:
+			return True
+		while True:
+			try:
+				pid, status, rusage = os.wait4(proc.pid, 0 if wait else os.WNOHANG)
+			except OSError as err:
+				if err.errno == errno.EINTR:
+					continue
+				# The process is already reaped by someone else, the resources consumption is not available
+				if proc.poll() is None:
+					return False
+				job.retcode = proc.returncode if not worker or proc.returncode else 1
+				return True
+			break
+		if not pid:
+			return False
+		proc.returncode = -os.WTERMSIG(status) if os.WIFSIGNALED(status) else os.WEXITSTATUS(status)
+		# The Python worker completed before reporting the call result means the failed call
+		job.retcode = proc.returncode if not worker or proc.returncode else 1
+		job.exectime = time.time() - job._tproc
+		# Resources consumption of the terminated Python worker covers all its calls,
+		# so it is not attributed to the job
+		if worker:
+			worker.close()
+			job._pyworker = None
+			return True
+		job.usrtime = rusage.ru_utime
+		job.kerntime = rusage.ru_stime
+		job.rssmem = rusage.ru_maxrss / 1024.  # KB -> Mb
+		return True
+
+
 	def __reviseWorkers(self):
 		"""Rewise the workers
 
@@ -405,38 +1251,114 @@ class ExecPool(object):
 		"""
 		completed = []  # Completed workers
 		for proc, job in self._workers.items():
-			if proc.poll() is not None:
+			if self.__reap(job):
 				completed.append((proc, job))
 				continue
 			exectime = time.time() - job.tstart
 			if not job.timeout or exectime < job.timeout:
 				continue
-			# Terminate the worker
-			proc.terminate()
-			# Wait a few sec for the successful process termitaion before killing it
-			i = 0
-			while proc.poll() is None and i < self._killCount:
-				i += 1
-				time.sleep(self._latency)
-			if proc.poll() is None:
+			# Terminate the worker and kill it on the subsequent revisions if the termination
+			# grace period is over. The pool is not blocked waiting for the termination.
+			tterm = self._terminating.get(proc)
+			if tterm is None:
+				print('WARNING, "{}" #{} is terminated by the timeout ({:.4f} sec): {:.4f} sec ({} h {} m {:.4f} s)'
+					.format(job.name, proc.pid, job.timeout, exectime, *secondsToHms(exectime)), file=sys.stderr)
+				proc.terminate()
+				self._terminating[proc] = time.time()
+			elif tterm and time.time() - tterm >= self._killCount * self._latency:
+				print('  Killing "{}" #{} ...'.format(job.name, proc.pid), file=sys.stderr)
 				proc.kill()
-			del self._workers[proc]
-			print('WARNING, "{}" #{} is terminated by the timeout ({:.4f} sec): {:.4f} sec ({} h {} m {:.4f} s)'
-				.format(job.name, proc.pid, job.timeout, exectime, *secondsToHms(exectime)), file=sys.stderr)
-			# Restart the job if required
-			if job.ontimeout:
-				self.__startJob(job)
-			else:
-				job.complete(False)
+				self._terminating[proc] = 0  # The worker is killed
 
 		# Process completed jobs: execute callbacks and remove the workers
 		for proc, job in completed:
 			del self._workers[proc]
-			job.complete()
+			self.__releaseSlot(job)
+			terminated = self._terminating.pop(proc, None) is not None
+			self.__recycleWorker(job, terminated)
+			if not terminated:
+				# Dependents of the failed job are cancelled
+				if job.retcode:
+					print('WARNING, "{}" #{} is failed with the exit code {}'.format(job.name, proc.pid, job.retcode)
+						, file=sys.stderr)
+				self.__complete(job, job.retcode == 0)
+			# Restart the job terminated by the timeout if required
+			elif job.ontimeout:
+				# Consider the memory consumed before the termination
+				if job.rssmem is not None:
+					job.memory = max(job.memory, job.rssmem)
+				self.__startJob(job)
+			else:
+				self.__complete(job, False)
+
+		# Start subsequent jobs if it is required
+		if not self._memlimit:
+			while self._jobs and len(self._workers) < self._workersLim:
+				self.__startJob(heapq.heappop(self._jobs)[2])
+			return
+		# Start the jobs that fit the memory limit preserving the order of the postponed ones.
+		# Only the bounded number of the jobs are scanned, and the scan is stopped by the job that
+		# waits for the memory too long to not starve it by the subsequent smaller jobs
+		memused = self.__memUsed()
+		postponed = []
+		while self._jobs and len(self._workers) < self._workersLim and len(postponed) < self._memscan:
+			pjob = heapq.heappop(self._jobs)
+			job = pjob[2]
+			if self._workers and memused + job.memory > self._memlimit:
+				postponed.append(pjob)
+				now = time.time()
+				if job._tmemwait is None:
+					job._tmemwait = now
+				elif now - job._tmemwait >= self._memwait:
+					break
+				continue
+			memused += job.memory
+			self.__startJob(job)
+		if postponed:
+			if DEBUG_TRACE:
+				print('{} jobs are postponed by the memory limit ({:.3f} of {:.3f} Mb are used)'
+					.format(len(postponed), memused, self._memlimit), file=sys.stderr)
+			for pjob in postponed:
+				heapq.heappush(self._jobs, pjob)
+
+
+	def __postpone(self, job):
+		"""Postpone the job until a free worker is available considering its priority
+
+		job  - the job to be postponed
+		"""
+		heapq.heappush(self._jobs, (-job.priority, self._scheduled, job))
+		self._scheduled += 1
+
+
+	def __memUsed(self):
+		"""RSS RAM of the workers considering the expected memory of their jobs
+
+		return  - memory in Mb
+		"""
+		return sum(max(job.memory, rssMemory(proc.pid)) for proc, job in self._workers.iteritems())
 
-		# Start subsequent job if it is required
-		while self._jobs and len(self._workers) <  self._workersLim:
-			self.__startJob(self._jobs.popleft())
+
+	def __waitTime(self, timeout):
+		"""Time to wait for the workers completion: the latency reduced to the nearest timeout
+
+		timeout  - execution timeout of the pool, 0 means absence of the timeout
+
+		return  - waiting time in sec, >= 0
+		"""
+		now = time.time()
+		wtime = self._latency
+		if timeout:
+			wtime = min(wtime, self._tstart + timeout - now)
+		for proc, job in self._workers.iteritems():
+			tterm = self._terminating.get(proc)
+			if tterm is None:
+				if job.timeout:
+					wtime = min(wtime, job.tstart + job.timeout - now)
+			elif tterm:
+				# Escalation of the termination to the kill
+				wtime = min(wtime, tterm + self._killCount * self._latency - now)
+		return max(wtime, 0)
 
 
 	def execute(self, job, async=True):
@@ -450,6 +1372,7 @@ class ExecPool(object):
 		assert isinstance(job, Job), 'job type is invalid'
 		assert len(self._workers) <= self._workersLim, 'Number of workers exceeds the limit'
 		assert job.name, "Job parameters must be defined"  #  and job.workdir and job.args
+		assert async or not job.pycall, 'Python calls are executed only asynchronously'
 
 		if DEBUG_TRACE:
 			print('Scheduling the job "{}" with timeout {}'.format(job.name, job.timeout))
@@ -457,9 +1380,33 @@ class ExecPool(object):
 			# Start the execution timer
 			if self._tstart is None:
 				self._tstart = time.time()
+			# Skip the job completed in the former execution
+			if self.restore and self._journal.restorable(job):
+				if DEBUG_TRACE:
+					print('"{}" is restored from the journal'.format(job.name), file=sys.stderr)
+				job.ondone = None  # Already executed on the former completion
+				self.__complete(job)
+				return 0
+			# Postpone the job until the completion of its prerequisites
+			if job.deps:
+				for dep in job.deps:
+					state = self._depState(dep)
+					if state is None:
+						self._dependents.setdefault(dep, []).append(job)
+						job._depsnum += 1
+					elif not state:
+						print('WARNING, "{}" is cancelled by the failed prerequisite "{}"'.format(job.name, dep.name)
+							, file=sys.stderr)
+						job._depsnum = 0
+						self.__complete(job, False)
+						return 0
+				if job._depsnum:
+					return 0
 			# Schedule the job, postpone it if already postponed jobs exist or no any free workers
-			if self._jobs or len(self._workers) >= self._workersLim:
-				self._jobs.append(job)
+			# or the memory limit is reached
+			if (self._jobs or len(self._workers) >= self._workersLim or (self._memlimit
+			and self._workers and self.__memUsed() + job.memory > self._memlimit)):
+				self.__postpone(job)
 				#self.__reviseWorkers()  # Anyway the workers are revised if exist in the working cycle
 			else:
 				self.__startJob(job)
@@ -483,12 +1430,22 @@ class ExecPool(object):
 				'Start time should be defined for the present jobs'
 			return
 
+		if self.restore and self._journal.restored:
+			print('{} jobs are restored from the journal'.format(self._journal.restored))
+			self._journal.restored = 0
 		self.__reviseWorkers()
-		while self._jobs or self._workers:
-			if timeout and time.time() - self._tstart > timeout:
-				self.__terminate()
-				return False
-			time.sleep(self._latency)
-			self.__reviseWorkers()
+		with self._notifier:
+			while self._jobs or self._workers:
+				if timeout and time.time() - self._tstart > timeout:
+					self.__terminate()
+					return False
+				self._notifier.wait(self.__waitTime(timeout), [job._pyworker.rfd
+					for job in self._workers.itervalues() if job._pyworker])
+				self.__reviseWorkers()
+		# Prerequisites of the remained dependent jobs are never executed in this pool
+		if self._dependents:
+			print('WARNING, dependent jobs are not started because their prerequisites are not scheduled:'
+				, file=sys.stderr)
+			self.__cancelDependents()
 		self._tstart = None
 		return True
@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+\descr: Persistent Python worker of the Multi-Process Execution Pool.
+
+	Executes the calls of Python functions one by one in the same process, so the
+	interpreter starts and the modules are imported only once per worker instead
+	of once per job. Each call is read from stdin as a pickled tuple:
+		(workdir, module, function, args, stdout, stderr)
+	where the module is imported from the workdir, stdout and stderr are None or file
+	names to APPEND the output of the call (stderr can be also subprocess.STDOUT).
+	Completion of each call is reported to the file descriptor specified by the
+	argument as a text line:
+		<status> <cpu_usr_sec> <cpu_kern_sec> <rss_peak_mb>
+	where status is 0 on success and 1 on the exception, which traceback is outputted
+	to the stderr of the call. The peak RSS is evaluated per call resetting the
+	peak of the worker process before the call (Linux 4.0+), otherwise it is
+	reported as -1 (not available), because the lifetime peak of the worker covers
+	all its calls. The worker is completed on the end of stdin.
+
+	Usage: pyworker.py <result_fd>
+
+\author: (c) Artem Lutov <artem@exascale.info>
+\organizations: eXascale Infolab <http://exascale.info/>, Lumais <http://www.lumais.com/>, ScienceWise <http://sciencewise.info/>
+\date: 2015-07
+"""
+
+from __future__ import print_function  # Required for stderr output, must be the first import
+import sys
+import os
+import traceback  # Stacktrace
+import resource  # CPU time of the calls
+import importlib
+
+try:
+	import cPickle as pickle
+except ImportError:
+	import pickle
+
+
+_STDOUT = -2  # subprocess.STDOUT, redirection of stderr to stdout
+_RSSUNDEF = -1  # The peak RSS of the call is not available
+
+
+def redirect(fd, outp):
+	"""Redirect the output channel to the file
+
+	fd  - file descriptor of the output channel
+	outp  - None or file name to APPEND the output, or _STDOUT for the stderr
+	"""
+	if outp == _STDOUT:
+		os.dup2(1, fd)
+	elif outp:
+		fout = os.open(outp, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+		os.dup2(fout, fd)
+		os.close(fout)
+
+
+def resetRssPeak():
+	"""Reset the peak RSS of the worker process to its current RSS
+
+	return  - whether the peak RSS is reset
+	"""
+	try:
+		with open('/proc/self/clear_refs', 'w') as fref:
+			fref.write('5')  # Reset the peak RSS (VmHWM)
+	except (IOError, OSError):
+		return False
+	return True
+
+
+def rssPeak():
+	"""Peak RSS of the worker process
+
+	return  - peak RSS in Mb or _RSSUNDEF if it is not available
+	"""
+	try:
+		with open('/proc/self/status') as fstat:
+			for ln in fstat:
+				if ln.startswith('VmHWM:'):
+					return int(ln.split()[1]) / 1024.  # KB -> Mb
+	except (IOError, OSError, ValueError):
+		pass
+	return _RSSUNDEF
+
+
+def call(workdir, module, function, args, stdout, stderr):
+	"""Call the function in the workdir with the redirected output
+
+	workdir  - working directory of the call relative to the worker start dir, None means the start dir
+	module  - name of the module of the function
+	function  - name of the function
+	args  - arguments of the function
+	stdout  - None or file name to APPEND the output
+	stderr  - None or file name or _STDOUT to APPEND the error output
+
+	return  - 0 on success, 1 on the exception or the failed exit
+	"""
+	# Keep the output channels of the worker to restore them after the call
+	fdout = os.dup(1)
+	fderr = os.dup(2)
+	status = 0
+	try:
+		redirect(1, stdout)
+		redirect(2, stderr)
+		if workdir:
+			os.chdir(workdir)
+		# Modules are looked up in the workdir
+		cwd = os.getcwd()
+		if cwd not in sys.path:
+			sys.path.insert(0, cwd)
+		getattr(importlib.import_module(module), function)(*args)
+	except SystemExit as err:
+		status = 0 if not err.code else 1
+	except Exception:
+		traceback.print_exc()
+		status = 1
+	finally:
+		sys.stdout.flush()
+		sys.stderr.flush()
+		os.dup2(fdout, 1)
+		os.dup2(fderr, 2)
+		os.close(fdout)
+		os.close(fderr)
+	return status
+
+
+def pyworker(resfd):
+	"""Execute the calls from stdin reporting their completion
+
+	resfd  - file descriptor to report the completion of the calls
+	"""
+	basedir = os.getcwd()
+	inp = getattr(sys.stdin, 'buffer', sys.stdin)
+	while True:
+		try:
+			workdir, module, function, args, stdout, stderr = pickle.load(inp)
+		except EOFError:
+			break
+		# The peak RSS of the previous calls should not be attributed to this call
+		rssreset = resetRssPeak()
+		rsbeg = resource.getrusage(resource.RUSAGE_SELF)
+		status = call(workdir, module, function, args, stdout, stderr)
+		os.chdir(basedir)
+		rsend = resource.getrusage(resource.RUSAGE_SELF)
+		# Note: the line is less than PIPE_BUF, so it is written atomically
+		os.write(resfd, '{} {:.6f} {:.6f} {:.3f}\n'.format(status, rsend.ru_utime - rsbeg.ru_utime
+			, rsend.ru_stime - rsbeg.ru_stime, rssPeak() if rssreset else _RSSUNDEF).encode())
+
+
+if __name__ == '__main__':
+	if len(sys.argv) == 2:
+		pyworker(int(sys.argv[1]))
+	else:
+		print('Usage: {} <result_fd>'.format(sys.argv[0]), file=sys.stderr)
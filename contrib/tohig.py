@@ -10,6 +10,7 @@ Input formats:
 	- nsa  - newline / space/tab separated possibly weighted arcs, used in LFR generated networks (graphs), line of:  <src_id> <dst_id> <weight>
 		with backward directoin specification: https://sites.google.com/site/santofortunato/inthepress2
 .hig format: http://www.lumais.com/docs/hig_format.hig
+.hgb format: compact binary CSR form of the network (see algorithms/hgb.py), optionally produced alongside .hig
 
 (c) HiReCS (High Resolution Hierarchical Clustering with Stable State library)
 \author: Artem Lutov <luart@ya.ru>
@@ -21,20 +22,349 @@ from __future__ import print_function  # Required for stderr output, must be the
 import sys
 import os
 import time  # Required when the file should be renamed
+import struct
+import shutil
+import tempfile  # Sorted runs of the links in the streaming mode
+import heapq  # Merge of the sorted runs
+from itertools import groupby
+from operator import itemgetter
+from array import array
+from multiprocessing import Pool, cpu_count
 
 
 _inpfmts = ('nse', 'nsa')  # Possible formats of the input files:
 # - nse  - newline / space/tab separated possibly edges with nodes header (#; network links are symmetric)
 # - nsa  -  newline / space/tab separated possibly weighted arcs (network links can be asymmetric)
 
+# Binary network format (.hgb), should be consistent with algorithms/hgb.py
+_BINMAGIC = b'HGB1'
+_BINHEADER = struct.Struct('=4sIqqq')  # magic, flags, nodes, links, idwidth
+_BINWEIGHTED = 0b1  # Flag of the weighted network
+_BINALIGN = 8  # Alignment of the arrays
+try:
+	_INT64 = array('q').typecode
+except ValueError:
+	# Python 2 does not have 'q'
+	_INT64 = 'l'
+assert array(_INT64).itemsize == 8, 'int64 array is required for the binary format'
+
+_RUNLINKS = 1000000  # Default max number of the links held in memory in the streaming mode
+
 
 def outName(finpName):
 	"""Returns output filename by input filename"""
 	return os.path.splitext(finpName)[0] + '.hig'
 
 
+def binName(finpName):
+	"""Returns output filename of the binary network by input filename"""
+	return os.path.splitext(finpName)[0] + '.hgb'
+
+
+class BinGraph(object):
+	"""Network links collected to be saved in the binary CSR format (.hgb)
+
+	The links are grouped by the source nodes indices using LinksSorter, so in the streaming mode
+	only the node ids mapping and the bounded number of the links are held in memory, and the CSR
+	is written from the merged sorted runs
+	"""
+	def __init__(self, maxlinks=0, tmpdir=None):
+		"""Constructor
+
+		maxlinks  - max number of the links held in memory, 0 means all links
+		tmpdir  - directory for the temporary files of the sorted runs
+		"""
+		self.nodes = {}  # Node ids mapping to the node indices
+		# Links of the nodes indices: (src, dst, weight), weight is '' if not specified
+		self._sorter = LinksSorter(maxlinks or sys.maxsize, tmpdir, False)
+
+	def node(self, nid):
+		"""Index of the node by its id"""
+		idx = self.nodes.get(nid)
+		if idx is None:
+			idx = len(self.nodes)
+			self.nodes[nid] = idx
+		return idx
+
+	def addLinks(self, src, links, edges):
+		"""Add links of the node
+
+		src  - source node id
+		links  - iterable of the links: (dst_id, weight) or dst_id, weight can be None
+		edges  - the links are edges (symmetric), otherwise arcs
+		"""
+		src = self.node(str(src))
+		for link in links:
+			if isinstance(link, tuple):
+				dst, weight = link
+			else:
+				dst, weight = link, None
+			dst = self.node(dst)
+			self._sorter.add(src, (dst, weight), False)
+			if edges and dst != src:
+				self._sorter.add(dst, (src, weight), False)
+
+	def save(self, foutName, weighted):
+		"""Save the network in the binary CSR format releasing the links
+
+		foutName  - output file name
+		weighted  - save weights of the links
+		"""
+		nnodes = len(self.nodes)
+		nlinks = self._sorter.size
+		ids = [None] * nnodes
+		for nid, idx in self.nodes.items():
+			ids[idx] = nid
+		idwidth = max(len(nid) for nid in ids) if ids else 0
+
+		def align(fout):
+			"""Pad the output to the alignment of the arrays"""
+			fout.write(b'\0' * (-fout.tell() % _BINALIGN))
+
+		with open(foutName, 'wb') as fout:
+			fout.write(_BINHEADER.pack(_BINMAGIC, _BINWEIGHTED if weighted else 0, nnodes, nlinks, idwidth))
+			align(fout)
+			fout.write(b''.join(nid.encode().ljust(idwidth, b'\0') if not isinstance(nid, bytes)
+				else nid.ljust(idwidth, b'\0') for nid in ids))
+			del ids
+			align(fout)
+			# Offsets are written after the links, which are streamed to their known positions
+			offpos = fout.tell()
+			offsets = array(_INT64, [0]) * (nnodes + 1)
+			fout.seek(offpos + offsets.itemsize * len(offsets))
+			fwgs = None
+			if weighted:
+				fout.flush()
+				fwgs = open(foutName, 'r+b')
+			try:
+				if weighted:
+					fwgs.seek(fout.tell() + array('i').itemsize * nlinks)
+					align(fwgs)
+				pos = 0  # Offset of the links of the current node
+				inode = 0  # Index of the node to be filled in the offsets
+				for src, ndlinks in self._sorter.groups():
+					# Nodes without the outbound links have empty ranges
+					while inode <= src:
+						offsets[inode] = pos
+						inode += 1
+					array('i', [dst for dst, _ in ndlinks]).tofile(fout)
+					if weighted:
+						array('f', [float(weight) if weight else 1. for _, weight in ndlinks]).tofile(fwgs)
+					pos += len(ndlinks)
+				assert pos == nlinks, 'All links should be saved'
+				while inode <= nnodes:
+					offsets[inode] = pos
+					inode += 1
+			finally:
+				if fwgs is not None:
+					fwgs.close()
+			fout.seek(offpos)
+			offsets.tofile(fout)
+
+	def clear(self):
+		"""Release the links removing the spilled runs"""
+		self._sorter.clear()
+
+
+class LinksSorter(object):
+	"""Grouping of the links by the source nodes with the bounded memory (external sort):
+	the links are sorted in runs of the limited size, which are spilled to the temporary files
+	and merged on saving
+	"""
+	def __init__(self, maxlinks, tmpdir, resdub):
+		"""Constructor
+
+		maxlinks  - max number of the links held in memory
+		tmpdir  - directory for the temporary files of the sorted runs
+		resdub  - resolve duplicated links
+		"""
+		assert maxlinks >= 1, 'Invalid size of the runs'
+		self.maxlinks = maxlinks
+		self.tmpdir = tmpdir
+		self.resdub = resdub
+		self.size = 0  # Number of the added links
+		self._buf = []  # Links of the current run: (src, dst, weight)
+		self._runs = []  # File names of the spilled runs
+
+	def add(self, src, link, edges):
+		"""Add the link
+
+		src  - source node id, int
+		link  - (dest_id, weight), weight can be None
+		edges  - the link is an edge (symmetric), otherwise an arc
+		"""
+		dst = int(link[0])
+		# Back links of the edges are duplicates
+		if edges and self.resdub and dst < src:
+			src, dst = dst, src
+		self._buf.append((src, dst, link[1] if link[1] is not None else ''))
+		self.size += 1
+		if len(self._buf) >= self.maxlinks:
+			self._spill()
+
+	def _spill(self):
+		"""Spill the sorted current run to the temporary file"""
+		self._buf.sort()
+		fd, fname = tempfile.mkstemp(suffix='.run', prefix='tohig_', dir=self.tmpdir)
+		self._runs.append(fname)
+		with os.fdopen(fd, 'w') as frun:
+			frun.writelines('{} {} {}\n'.format(*link) for link in self._buf)
+		self._buf = []
+
+	@staticmethod
+	def _readRun(fname):
+		"""Links of the spilled run"""
+		with open(fname, 'r') as frun:
+			for ln in frun:
+				src, dst, weight = ln.rstrip('\n').split(' ', 2)
+				yield int(src), int(dst), weight
+
+	def groups(self):
+		"""Links grouped by the source nodes in the ascending order, the links are released
+		on completion
+
+		return  - iterator of (src, links)
+			src  - source node id, int
+			links  - [(dst, weight)] ordered by dst, dst is int, weight is '' if not specified
+		"""
+		try:
+			if self._runs:
+				self._spill()
+				links = heapq.merge(*[self._readRun(fname) for fname in self._runs])
+			else:
+				self._buf.sort()
+				links = self._buf
+			for src, group in groupby(links, key=itemgetter(0)):
+				ndlinks = []
+				prev = None
+				for _, dst, weight in group:
+					if self.resdub and dst == prev:
+						continue
+					prev = dst
+					ndlinks.append((dst, weight))
+				yield src, ndlinks
+		finally:
+			self.clear()
+
+	def save(self, fout, weighted, bgraph=None, edges=False):
+		"""Save the links grouped by the source nodes and release them
+
+		fout  - output .hig file
+		weighted  - save weights of the links
+		bgraph  - BinGraph collecting the links for the binary output if required
+		edges  - the links are edges (symmetric), otherwise arcs
+		"""
+		for src, ndlinks in self.groups():
+			saveLinks(fout, {src: [(str(dst), weight or None) for dst, weight in ndlinks]}
+				, weighted, bgraph, edges)
+
+	def detach(self):
+		"""Spill the buffered links and hand over all runs, which are not removed by the sorter anymore
+
+		return  - runs, size
+			runs  - file names of the sorted runs
+			size  - number of the links in the runs
+		"""
+		if self._buf:
+			self._spill()
+		res = self._runs, self.size
+		self._runs = []
+		self.size = 0
+		return res
+
+	def attach(self, runs, size):
+		"""Add the sorted runs to be merged on saving, the runs are removed by the sorter
+
+		runs  - file names of the sorted runs
+		size  - number of the links in the runs
+		"""
+		self._runs.extend(runs)
+		self.size += size
+
+	def clear(self):
+		"""Release the links removing the spilled runs"""
+		for fname in self._runs:
+			if os.path.exists(fname):
+				os.remove(fname)
+		self._runs = []
+		self._buf = []
+		self.size = 0
+
+
+def parseChunk(task):
+	"""Parse the byte range of the file of links into the sorted runs (executed by the worker process)
+
+	task  - (finpName, beg, end, cmtmark, weighted, resdub, edges, maxlinks, tmpdir)
+		finpName  - input file of the links: <src_id> <dst_id> [<weight>]
+		beg  - begin of the byte range, the line started before it belongs to the former chunk
+		end  - end of the byte range, the line started before it belongs to this chunk
+		cmtmark  - comment mark
+		weighted  - consider weights of the links
+		resdub  - resolve duplicated links
+		edges  - the links are edges (symmetric), otherwise arcs
+		maxlinks  - max number of the links held in memory
+		tmpdir  - directory for the sorted runs
+
+	return  - runs, size, selflinks
+		runs  - file names of the sorted runs
+		size  - number of the links in the runs
+		selflinks  - self links of the edges: {node: (node_id, weight)}
+	"""
+	finpName, beg, end, cmtmark, weighted, resdub, edges, maxlinks, tmpdir = task
+	sorter = LinksSorter(maxlinks, tmpdir, resdub)
+	selflinks = {}
+	with open(finpName, 'r') as finp:
+		# Align the chunk to the beginning of the line
+		if beg:
+			finp.seek(beg - 1)
+			pos = beg - 1 + len(finp.readline())
+		else:
+			pos = 0
+		while pos < end:
+			ln = finp.readline()
+			if not ln:
+				break
+			pos += len(ln)
+			ln = ln.lstrip()
+			if not ln or ln.startswith(cmtmark):
+				continue
+			ln = ln.split(None, 1)
+			if len(ln) < 2:
+				raise SyntaxError('At least 2 ids are expected in the links: ' + ln[0])
+			node = int(ln[0])
+			link = parseLink(ln[1], weighted)
+			# Process self links separately
+			if not edges or link[0] != ln[0]:
+				sorter.add(node, link, edges)
+			else:
+				selflinks[node] = tuple(link)
+	runs, size = sorter.detach()
+	return runs, size, selflinks
+
+
+def nodesNumber(ln):
+	"""Number of the nodes specified in the header comment: # Nodes: <nodes_number>
+
+	ln  - header line
+
+	return  - nodes number or None if the line does not specify it
+	"""
+	nodesmark = 'Nodes:'
+	pos = ln.find(nodesmark, 1)
+	if pos == -1:
+		return None
+	ln = ln[pos + len(nodesmark):].lstrip().split(None, 1)
+	try:
+		return int(ln[0])
+	except (ValueError, IndexError):
+		raise SyntaxError('Number of vertices must be specified')
+
+
 def parseArgs(args):
 	weighted = True  # Force the graph to be unweighted or treat it as weighted
+	binary = False  # Produce also the binary CSR form (.hgb) of the network
+	maxlinks = 0  # Max number of the links held in memory in the streaming mode, 0 - the streaming mode is disabled
+	workers = 0  # Number of the worker processes parsing the input in parallel, 0 - sequential parsing
 	resdub = False  # Resolve duplications
 	custfmt = False  # Custom graph format
 	overwrite = 'f'  # Force overwrite, Rename, Skip
@@ -57,6 +387,26 @@ def parseArgs(args):
 				weighted = False
 			elif arg[1] == 'r':
 				resdub = True
+			elif arg[1] == 'b':
+				binary = True
+			elif arg[1] == 'm':
+				maxlinks = _RUNLINKS
+				if len(arg) > 2:
+					preflen = 3
+					if arg[preflen - 1] != '=':
+						raise ValueError('Unexpected argument: ' + arg)
+					maxlinks = int(arg[preflen:])
+					if maxlinks <= 0:
+						raise ValueError('Positive number of the links is expected: ' + arg)
+			elif arg[1] == 'p':
+				workers = cpu_count()
+				if len(arg) > 2:
+					preflen = 3
+					if arg[preflen - 1] != '=':
+						raise ValueError('Unexpected argument: ' + arg)
+					workers = int(arg[preflen:])
+					if workers <= 0:
+						raise ValueError('Positive number of the workers is expected: ' + arg)
 			elif arg[1] == 'o':
 				preflen = 2
 				if len(arg) <= preflen or arg[preflen] not in 'frs':
@@ -65,7 +415,13 @@ def parseArgs(args):
 			else:
 				raise ValueError('Unexpected argument: ' + arg)
 
-	return weighted, resdub, custfmt, overwrite
+	if workers and not custfmt:
+		raise ValueError('The parallel parsing is supported only for the custom formats: ' + ', '.join(_inpfmts))
+	# The parallel parsing produces the sorted runs of the links
+	if workers and not maxlinks:
+		maxlinks = _RUNLINKS
+
+	return weighted, resdub, custfmt, overwrite, binary, maxlinks, workers
 
 
 def saveNodes(fout, vertNum, startId=1):
@@ -114,14 +470,23 @@ def parseLinksList(links, weighted, resdub):
 	return links
 
 
-def saveLinks(fout, links, weighted):
-	"""Save links to the current section"""
+def saveLinks(fout, links, weighted, bgraph=None, edges=False):
+	"""Save links to the current section
+
+	fout  - output .hig file
+	links  - links of the nodes: {src: [(dest_id, weight), ...] or {dest_id: weight}}
+	weighted  - save weights of the links
+	bgraph  - BinGraph collecting the links for the binary output if required
+	edges  - the links are edges (symmetric), otherwise arcs
+	"""
 	for ndlinks in links.items():
 		val = ndlinks[1]
 		assert val, "Nodes can't be specified without links"
 		# Consider that links are dict if duplicates were resolved
 		if isinstance(val, dict):
 			val = val.items()
+		if bgraph is not None:
+			bgraph.addLinks(ndlinks[0], val, edges)
 
 		if weighted and val[0][1] is not None:
 			text = ' '.join([':'.join(v) for v in val])
@@ -136,10 +501,15 @@ def tohig(finpName, *args):
 	processing edges and arcs Pajek section as a single line in the .hgc
 	"""
 	with open(finpName, 'r') as finp:
-		weighted, resdub, custfmt, overwrite = parseArgs(args)
+		weighted, resdub, custfmt, overwrite, binary, maxlinks, workers = parseArgs(args)
 		print('File {} is opened, converting...\n\tweighted: {}\n\tresdub: {}\n\tcustfmt: {}\n\toverwrite: {}'
-			  .format(finpName, weighted, resdub, custfmt, overwrite))
+			'\n\tbinary: {}\n\tmaxlinks: {}\n\tworkers: {}'.format(finpName, weighted, resdub, custfmt, overwrite
+			, binary, maxlinks, workers))
 		foutName = outName(finpName)
+		# Links of the edges and arcs sections are grouped by the external sort in the streaming mode
+		sorter = LinksSorter(maxlinks, os.path.dirname(foutName) or '.', resdub) if maxlinks else None
+		bgraph = BinGraph(maxlinks, os.path.dirname(foutName) or '.') if binary else None
+		tmpdir = None  # Directory of the sorted runs produced by the parallel workers
 		# Check whether output file exists
 		exists = os.path.exists(foutName)
 		if exists:
@@ -195,20 +565,53 @@ def tohig(finpName, *args):
 				cmtmark = '%' if not custfmt else '#'
 				nodeshdr = False  # Nodes header is formed
 
+				# Parse the links of the custom format by the worker processes in parallel
+				if workers:
+					# Process the header comments sequentially
+					hdrsize = 0  # Size of the header in bytes
+					while True:
+						ln = finp.readline()
+						if not ln or (ln.lstrip() and not ln.lstrip().startswith(cmtmark)):
+							break
+						hdrsize += len(ln)
+						vertNum = nodesNumber(ln.lstrip())
+						if vertNum is not None:
+							saveNodes(fout, vertNum, None)
+					if ln:
+						if custfmt == _inpfmts[0]:
+							sect = SECT_EDGS
+							fout.write('\n/Edges\n')
+						else:
+							sect = SECT_ARCS
+							fout.write('\n/Arcs\n')
+						nodeshdr = True
+						# Split the links into the byte ranges aligned by the lines in the workers
+						tmpdir = tempfile.mkdtemp(prefix='tohig_', dir=os.path.dirname(foutName) or '.')
+						fsize = os.fstat(finp.fileno()).st_size
+						step = max((fsize - hdrsize + workers - 1) // workers, 1)
+						tasks = [(finpName, beg, min(beg + step, fsize), cmtmark, weighted, resdub
+							, sect == SECT_EDGS, maxlinks, tmpdir) for beg in range(hdrsize, fsize, step)]
+						pool = Pool(min(workers, len(tasks)))
+						try:
+							for runs, size, selflinks in pool.imap_unordered(parseChunk, tasks):
+								sorter.attach(runs, size)
+								arcs.update(selflinks)
+						finally:
+							pool.terminate()
+							pool.join()
+					# All links are parsed
+					finp.seek(0, os.SEEK_END)
+
 				for ln in finp:
 					# Skip comments
 					ln = ln.lstrip()
 					if not ln or ln.startswith(cmtmark):
 						# Check for number of nodes for the custom format
 						# and add it to the forming file if exists
-						nodesmark = 'Nodes:';
-						if not nodeshdr and custfmt and ln.find(nodesmark, 1) != -1:
-							ln = ln[ln.find(nodesmark, 1) + len(nodesmark):].lstrip().split(None, 1)[0]
-							try:
-								vertNum = int(ln)
-							except (ValueError, IndexError):
-								raise SyntaxError('Number of vertices must be specified')
-							saveNodes(fout, vertNum, None)
+						if not nodeshdr and custfmt:
+							vertNum = nodesNumber(ln)
+							if vertNum is not None:
+								saveNodes(fout, vertNum, None)
 						continue
 					# Process content
 					if ln[0] != '*':
@@ -246,7 +649,9 @@ def tohig(finpName, *args):
 							#print('links: ', links)
 							link = parseLink(ln[1], weighted)
 							# Process self links separately
-							if sect == SECT_ARCS or link[0] != ln[0]:
+							if sorter and (sect == SECT_ARCS or link[0] != ln[0]):
+								sorter.add(node, link, sect == SECT_EDGS)
+							elif sect == SECT_ARCS or link[0] != ln[0]:
 								# Fetch or construct node links
 								ndlinks = links.setdefault(node, [] if not resdub else {})
 								if not resdub:
@@ -260,7 +665,8 @@ def tohig(finpName, *args):
 								# Always specify self weight via Arcs
 								arcs[node] = tuple(link)  # Make a tuple
 						elif sect == SECT_EDGL or sect == SECT_ARCL:
-							saveLinks(fout, {node: parseLinksList(ln[1], weighted, resdub)}, weighted)
+							saveLinks(fout, {node: parseLinksList(ln[1], weighted, resdub)}, weighted
+								, bgraph, sect == SECT_EDGL)
 						else:
 							raise RuntimeError(''.join(('Logical error: unexpected "'
 								, sectName[sect], '" section')))
@@ -277,9 +683,12 @@ def tohig(finpName, *args):
 							raise ValueError('Invalid section, "vertices" is not expected')
 						else:
 							# Save parced data if required
-							if links:
+							if links or (sorter and sorter.size):
 								if sect == SECT_EDGS or sect == SECT_ARCS:
-									saveLinks(fout, links, weighted)
+									if sorter:
+										sorter.save(fout, weighted, bgraph, sect == SECT_EDGS)
+									else:
+										saveLinks(fout, links, weighted, bgraph, sect == SECT_EDGS)
 								else:
 									raise RuntimeError(''.join(('Logical error: unsaved data in "'
 										, sectName[sect], '" section')))
@@ -305,32 +714,54 @@ def tohig(finpName, *args):
 								raise ValueError('Unexpected section: ' + sectName)
 							nodeshdr = False
 				# Save remained parced data if required
-				if links:
+				if links or (sorter and sorter.size):
 					if sect == SECT_EDGS or sect == SECT_ARCS:
-						saveLinks(fout, links, weighted)
+						if sorter:
+							sorter.save(fout, weighted, bgraph, sect == SECT_EDGS)
+						else:
+							saveLinks(fout, links, weighted, bgraph, sect == SECT_EDGS)
 					else:
 						raise RuntimeError(''.join(('Logical error: unsaved data in "'
 							, sectName[sect], '" section')))
 					links.clear()
 				if arcs:
 					fout.write('\n/Arcs\n')
-					saveLinks(fout, arcs, weighted)
+					saveLinks(fout, {node: (link,) for node, link in arcs.items()}, weighted, bgraph)
 				print('{} -> {} conversion is completed'.format(finpName, foutName))
+			if bgraph is not None:
+				bgraph.save(binName(finpName), weighted)
+				print('{} -> {} binary conversion is completed'.format(finpName, binName(finpName)))
 		except StandardError:
-			# Remove incomplete output file
-			if os.path.exists(foutName):
-				os.remove(foutName)
+			# Remove incomplete output files
+			for fname in (foutName, binName(finpName)):
+				if os.path.exists(fname):
+					os.remove(fname)
 			raise
+		finally:
+			if sorter:
+				sorter.clear()
+			if bgraph is not None:
+				bgraph.clear()
+			if tmpdir:
+				shutil.rmtree(tmpdir, ignore_errors=True)
 
 
 if __name__ == '__main__':
 	if len(sys.argv) > 1:
 		tohig(*sys.argv[1:])
 	else:
-		print('\n'.join(('Usage: {0} <network> [-ru] [-f={{{1}, {2}}}] [-o{{f,r,s}}]',
+		print('\n'.join(('Usage: {0} <network> [-rub] [-m[=<links>]] [-p[=<workers>]] [-f={{{1}, {2}}}] [-o{{f,r,s}}]',
 			'  -r  - resolve (remove) duplicated links to be unique',
 			'  -u  - force links to be unweighted even for the weighted input graph.'
 			' Generates weighted links by default (only for the weighted graphs)',
+			'  -b  - produce also the compact binary CSR form of the network (.hgb) in the same pass. The links are'
+			' grouped by the external sort with the bounded memory in the streaming mode (-m)',
+			'  -m[=<links>]  - streaming conversion with the bounded memory: links of the edges / arcs sections are'
+			' grouped by the external sort holding at most <links> links in memory and spilling the sorted runs'
+			' to the temporary files in the output dir. Default: {3}. Node ids must be integers',
+			'  -p[=<workers>]  - parse the input in parallel by the worker processes (only for the custom formats),'
+			' each worker parses the line-aligned byte range of the input into the sorted runs (implies -m), which are'
+			' merged on saving. Default: the number of CPUs',
 			'  -f=<format>  - custom non-pajek input format (default: pajek):',
 			'    {1}  - newline / space/tab separated possible weighted edges with optional Nodes header and comments (#).'
 			' It includes SNAP format',
@@ -343,4 +774,4 @@ if __name__ == '__main__':
 			''
 			'  Note: node weigh (selflink) is always specified by Arcs in the produced .hig'
 			))
-			.format(sys.argv[0], *_inpfmts))
+			.format(sys.argv[0], _inpfmts[0], _inpfmts[1], _RUNLINKS))
@@ -0,0 +1,11 @@
+"""
+\descr: Behavioural tests of the benchmark, executed from the root of the benchmark:
+	python -m unittest discover -s tests -t .
+"""
+import os
+import sys
+
+# Modules of the algorithms import each other as the top-level modules
+_ALGSDIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'algorithms')
+if _ALGSDIR not in sys.path:
+	sys.path.append(_ALGSDIR)
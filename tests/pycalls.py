@@ -0,0 +1,37 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+\descr: Python functions called by the test jobs in the persistent Python worker.
+"""
+from __future__ import print_function  # Required for stderr output, must be the first import
+import sys
+
+
+def succeed():
+	"""Successful call"""
+	pass
+
+
+def fail():
+	"""Call failed with the exception"""
+	raise ValueError('Failed call')
+
+
+def exitWith(code):
+	"""Call exiting with the specified code"""
+	sys.exit(code)
+
+
+def allocate(mb):
+	"""Call allocating the specified amount of memory
+
+	mb  - the amount of memory to be allocated, Mb
+	"""
+	buf = bytearray(mb * 1024 * 1024)
+	buf[::4096] = b'\1' * len(buf[::4096])  # Touch all pages
+	return len(buf)
+
+
+def output(text):
+	"""Call outputting the text"""
+	print(text)
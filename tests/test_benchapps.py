@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+\descr: Tests of the algorithms execution (benchapps.py): results caching, the execution time estimation
+	and the execution of the algorithms.
+"""
+from __future__ import print_function  # Required for stderr output, must be the first import
+import os
+import glob
+import itertools
+import shutil
+import tempfile
+import unittest
+
+from contrib.mpepool import ExecPool, Job
+from benchutils import ResultsCache
+import benchapps
+from benchapps import execJob, execTime, execScp, execLouvain_igraph
+
+_ALGSDIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'algorithms')
+
+
+class TestExecJob(unittest.TestCase):
+	"""Caching of the results of the executed jobs"""
+	def setUp(self):
+		self.workdir = tempfile.mkdtemp()
+		self.rcache = ResultsCache(os.path.join(self.workdir, 'cache/'))
+		self.output = os.path.join(self.workdir, 'res.cnl')
+
+	def tearDown(self):
+		shutil.rmtree(self.workdir)
+
+	def execute(self, code, randomized=False):
+		"""Execute the job producing the output and exiting with the specified code
+
+		randomized  - the job is nondeterministic
+
+		return  - whether the results are fetched from the cache
+		"""
+		pool = ExecPool(1)
+		job = Job(name='app', workdir=self.workdir, args=('sh', '-c', 'echo 1 2 > res.cnl; exit {}'.format(code)))
+		cached = execJob(pool, job, self.rcache, outputs=(self.output,), randomized=randomized)
+		pool.join(10)
+		del pool
+		return cached
+
+	def test_cached(self):
+		self.assertFalse(self.execute(0))
+		os.remove(self.output)
+		self.assertTrue(self.execute(0))
+		with open(self.output) as fres:
+			self.assertEqual(fres.read(), '1 2\n')
+
+	def test_failed_not_cached(self):
+		self.assertFalse(self.execute(3))
+		self.assertFalse(self.execute(3))
+		self.assertEqual(self.rcache.hits, 0)
+
+	def test_randomized_not_cached(self):
+		self.assertFalse(self.execute(0, True))
+		self.assertFalse(self.execute(0, True))
+		# The former results of the deterministic execution are not reused either
+		self.assertFalse(self.execute(0))
+		self.assertFalse(self.execute(0, True))
+		self.assertEqual(self.rcache.hits, 0)
+
+
+class TestExecTime(unittest.TestCase):
+	"""Expected execution time of the algorithms"""
+	def setUp(self):
+		self.workdir = tempfile.mkdtemp()
+		# Former executions of the algorithm: net: (rssmem, exectime)
+		benchapps._rcpstats['Alg'] = {'net1': (0, 2.), 'net2': (0, 6.)}
+
+	def tearDown(self):
+		shutil.rmtree(self.workdir)
+		benchapps._rcpstats.pop('Alg', None)
+		benchapps._execrates.pop('Alg', None)
+
+	def netfile(self, name, size):
+		"""Network file of the specified size"""
+		fname = os.path.join(self.workdir, name + '.nsl')
+		with open(fname, 'w') as fnet:
+			fnet.write('x' * size)
+		return fname
+
+	def test_known(self):
+		self.assertEqual(execTime('Alg', 'net1^1.2#1', self.netfile('net1', 100)), 2.)
+
+	def test_rate(self):
+		net1 = self.netfile('net1', 100)
+		net2 = self.netfile('net2', 100)
+		net3 = self.netfile('net3', 50)
+		# Instances and shuffles of the same network are considered once in the rate
+		for task in ('net1', 'net1^1', 'net1.1', 'net1^1.2'):
+			execTime('Alg', task, net1)
+		self.assertAlmostEqual(execTime('Alg', 'net3', net3), 1.)
+		execTime('Alg', 'net2', net2)
+		for i in range(3):
+			self.assertAlmostEqual(execTime('Alg', 'net3', net3), 2.)
+			execTime('Alg', 'net1', net1)
+			execTime('Alg', 'net2', net2)
+
+
+class TestExecScp(unittest.TestCase):
+	"""Execution of all clique sizes by a single scp job"""
+	def setUp(self):
+		self.cwd = os.getcwd()
+		self.workdir = tempfile.mkdtemp()
+		os.chdir(self.workdir)
+		# The algorithm is executed from the algorithms dir outputting the results to ../results/
+		os.mkdir('algorithms')
+		os.symlink(os.path.join(_ALGSDIR, 'scp.py'), 'algorithms/scp.py')
+		# 5-clique, 4-clique sharing a node with it and a triangle sharing a node with the 4-clique
+		with open('net.nse', 'w') as fnet:
+			for clique in ((1, 2, 3, 4, 5), (5, 6, 7, 8), (8, 9, 10)):
+				for link in itertools.combinations(clique, 2):
+					fnet.write('{} {}\n'.format(*link))
+
+	def tearDown(self):
+		os.chdir(self.cwd)
+		shutil.rmtree(self.workdir)
+
+	def test_rcp(self):
+		pool = ExecPool(1)
+		self.assertEqual(execScp(pool, 'net.nse', None, 60), 6)
+		self.assertTrue(pool.join(60))
+		del pool
+		with open('results/scp.rcp') as frcp:
+			rows = [ln.rstrip().split('\t') for ln in frcp if not ln.startswith('#')]
+		# A single row covers all clique sizes
+		self.assertEqual([row[-1] for row in rows], ['net!k3-8'])
+		# Resulting dirs exist only for the clique sizes having the communities
+		self.assertEqual(sorted(os.path.split(path)[1] for path in glob.glob('results/scp/clusters/*')
+			if os.path.isdir(path)), ['net!k3', 'net!k4', 'net!k5'])
+		with open('results/scp/clusters/net!k4/net!k4_6.cnl') as fcls:
+			self.assertEqual(sorted(sorted(ln.split()) for ln in fcls), [['1', '2', '3', '4', '5'], ['5', '6', '7', '8']])
+
+
+class TestExecLouvain(unittest.TestCase):
+	"""Naming of the results of the multiple Louvain runs"""
+	class Pool(object):
+		"""Execution pool recording the scheduled jobs"""
+		restore = False
+
+		def __init__(self):
+			self.jobs = []
+
+		def execute(self, job):
+			self.jobs.append(job)
+
+	def setUp(self):
+		self.cwd = os.getcwd()
+		self.workdir = tempfile.mkdtemp()
+		os.chdir(self.workdir)
+
+	def tearDown(self):
+		os.chdir(self.cwd)
+		shutil.rmtree(self.workdir)
+
+	def execute(self, netfile, runs):
+		"""Schedule the Louvain job on the network
+
+		return  - the job and the names of the results dirs
+		"""
+		pool = self.Pool()
+		self.assertEqual(execLouvain_igraph(pool, netfile, None, 10, runs=runs), 1)
+		self.assertEqual(len(pool.jobs), 1)
+		return pool.jobs[0], sorted(os.listdir('results/louvain_igraph/clusters/'))
+
+	def test_single(self):
+		job, dirs = self.execute('nets/net.nsa', 1)
+		self.assertEqual(dirs, ['net'])
+		self.assertEqual(job.timeout, 10)
+		self.assertEqual(job.rcpname, 'net')
+		self.assertEqual(job.stderr, 'results/louvain_igraph/clusters/net.log')
+		self.assertEqual(job.pycall[2], ('-i=../nets/net.nsa', '-ol=../results/louvain_igraph/clusters/net.cnl'))
+
+	def test_runs(self):
+		job, dirs = self.execute('nets/net.nsa', 3)
+		self.assertEqual(dirs, ['net@0', 'net@1', 'net@2'])
+		self.assertEqual(job.timeout, 30)
+		self.assertEqual(job.pycall[2], ('-i=../nets/net.nsa', '-ol=../results/louvain_igraph/clusters/net@{r}.cnl', '-r=3'))
+		# The log and the resources consumption profile row are common for all runs
+		self.assertEqual(job.stderr, 'results/louvain_igraph/clusters/net.log')
+		self.assertEqual(job.rcpname, 'net!r3')
+
+	def test_runs_shuffle(self):
+		# The runs do not collide with the shuffles of the network
+		job, dirs = self.execute('nets/net.1.nsa', 2)
+		self.assertEqual(dirs, ['net@0.1', 'net@1.1'])
+		self.assertEqual(job.rcpname, 'net!r2.1')
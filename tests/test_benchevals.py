@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+\descr: Tests of the evaluation jobs execution (benchevals.py).
+"""
+from __future__ import print_function  # Required for stderr output, must be the first import
+import os
+import shutil
+import tempfile
+import unittest
+
+from contrib.mpepool import ExecPool, Job
+from benchevals import execEval, evalGeneric, evalAlgorithm, EvalsAgg
+
+
+class TestExecEval(unittest.TestCase):
+	"""Output of the evaluation jobs fetched by their ondone"""
+	def setUp(self):
+		self.workdir = tempfile.mkdtemp()
+		self.journal = os.path.join(self.workdir, 'jobs.jnl')
+		self.outputs = []
+
+	def tearDown(self):
+		shutil.rmtree(self.workdir)
+
+	def ondone(self, job):
+		self.outputs.append(job.params['output'])
+
+	def evaluate(self, restore):
+		"""Execute the evaluation job by the pool with the journal"""
+		pool = ExecPool(1, journal=self.journal, restore=restore)
+		job = Job(name='eval', workdir=os.path.dirname(os.path.abspath(__file__))
+			, pycall=('pycalls', 'output', ('0.5',)), stdout=os.path.join(self.workdir, 'eval.out')
+			, params={}, ondone=self.ondone)
+		execEval(pool, job)
+		pool.join(10)
+		del pool
+
+	def test_resumed_output(self):
+		self.evaluate(False)
+		# The evaluation is not restored from the journal, its output is fetched again
+		self.evaluate(True)
+		self.assertEqual(self.outputs, ['0.5\n', '0.5\n'])
+
+
+class TestEvalGeneric(unittest.TestCase):
+	"""Scheduling of the evaluation jobs on the clusters of the algorithm"""
+	class Pool(object):
+		"""Execution pool recording the scheduled jobs"""
+		def __init__(self):
+			self.jobs = []
+
+		def execute(self, job):
+			self.jobs.append(job)
+
+	def setUp(self):
+		self.cwd = os.getcwd()
+		self.workdir = tempfile.mkdtemp()
+		os.chdir(self.workdir)
+
+	def tearDown(self):
+		os.chdir(self.cwd)
+		shutil.rmtree(self.workdir)
+
+	def clusters(self, clsnames):
+		"""Create the clusters dirs"""
+		for clsname in clsnames:
+			os.makedirs('results/alg/clusters/' + clsname)
+			with open('results/alg/clusters/{0}/{0}_1.cnl'.format(clsname), 'w') as fcls:
+				fcls.write('1 2\n')
+
+	def evaluate(self, clsnames):
+		"""Schedule the evaluation of the clusters dirs
+
+		return  - sorted [(aggname, taskoutp, clslev, shuffle)] of the evaluation jobs
+		"""
+		self.clusters(clsnames)
+
+		def evaljob(cfile, task, taskoutp, clslev, shuffle, rcpoutp, logsbase):
+			return Job(name='.'.join((task.name, shuffle)), params={'eval': (task.params.name, taskoutp
+				, clslev, shuffle)})
+
+		pool = self.Pool()
+		evalGeneric(pool, 'mod', 'alg', 'nets/net.hig', 'mod/', 10, evaljob, EvalsAgg('mod'))
+		return sorted(job.params['eval'] for job in pool.jobs)
+
+	def test_runs(self):
+		# Each run is evaluated separately, but aggregated under the network name like the shuffles
+		self.assertEqual(self.evaluate(('net@0', 'net@1', 'net@0.1')), [
+			('mod/alg/net', 'results/alg/mod/net.mod', '1', '1@0'),
+			('mod/alg/net', 'results/alg/mod/net.mod', '1', '@0'),
+			('mod/alg/net', 'results/alg/mod/net.mod', '1', '@1')])
+
+	def test_params(self):
+		# The algorithm parameters are aggregated separately unlike the runs
+		self.assertEqual(self.evaluate(('net!k3', 'net!k4')), [
+			('mod/alg/net!k3', 'results/alg/mod/net!k3.mod', '1', ''),
+			('mod/alg/net!k4', 'results/alg/mod/net!k4.mod', '1', '')])
+
+	def test_native_modularity(self):
+		# The in-process modularity is stored separately from the modularity of HiReCS
+		self.clusters(('net',))
+		pool = self.Pool()
+		evalAlgorithm(pool, 'alg', 'nets/net.hig', 'mod_n', 10, EvalsAgg('mod_n'))
+		job, = pool.jobs
+		self.assertEqual(job.pycall[0], 'modularity')
+		self.assertEqual(job.params['taskoutp'], 'results/alg/mod_n/net.mod_n')
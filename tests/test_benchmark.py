@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+\descr: Tests of the benchmark parameters and the apps execution (benchmark.py).
+"""
+from __future__ import print_function  # Required for stderr output, must be the first import
+import os
+import shutil
+import tempfile
+import types
+import unittest
+
+import benchmark
+from benchmark import parseParams, runApps
+
+
+class TestParseParams(unittest.TestCase):
+	"""Parsing of the apps execution options"""
+	def parse(self, *args):
+		"""runalgs, runs"""
+		params = parseParams(args)
+		return params[5], params[-1]
+
+	def test_default(self):
+		self.assertEqual(self.parse('-r'), (0b1, 1))
+
+	def test_runs(self):
+		self.assertEqual(self.parse('-r=3'), (0b1, 3))
+
+	def test_runs_flags(self):
+		self.assertEqual(self.parse('-rpc=2'), (0b111, 2))
+
+	def test_invalid_runs(self):
+		for arg in ('-r=', '-r=0', '-rp=x'):
+			self.assertRaises(ValueError, parseParams, (arg,))
+
+
+class TestEvalParams(unittest.TestCase):
+	"""Parsing of the evaluation measures"""
+	def evalres(self, arg):
+		return parseParams((arg,))[6]
+
+	def test_default(self):
+		# NMI, NMI_s and modularity, NMI_max is evaluated only on demand
+		self.assertEqual(self.evalres('-e'), 0b111)
+
+	def test_extrinsic(self):
+		self.assertEqual(self.evalres('-ee'), 0b11)
+
+	def test_nmi_max(self):
+		self.assertEqual(self.evalres('-ex'), 0b1000)
+		self.assertEqual(self.evalres('-eex'), 0b1011)
+
+	def test_inprocess(self):
+		self.assertEqual(self.evalres('-ei'), 0b10111)
+		self.assertEqual(self.evalres('-eim'), 0b10100)
+
+	def test_invalid(self):
+		self.assertRaises(ValueError, parseParams, ('-ea',))
+
+
+class TestRunApps(unittest.TestCase):
+	"""Passing the number of runs to the apps supporting them"""
+	def setUp(self):
+		self.cwd = os.getcwd()
+		self.workdir = tempfile.mkdtemp()
+		os.chdir(self.workdir)
+		with open('net.nsa', 'w') as fnet:
+			fnet.write('1 2\n')
+		self.calls = []
+		self.apps = types.ModuleType('apps')
+
+		def execMultirun(execpool, netfile, asym, timeout, pathid='', exectask=None, rcache=None, runs=1):
+			self.calls.append(('multirun', runs))
+			return 0
+
+		def execSingle(execpool, netfile, asym, timeout, pathid='', exectask=None, rcache=None):
+			self.calls.append(('single', None))
+			return 0
+
+		self.apps.execMultirun = execMultirun
+		self.apps.execSingle = execSingle
+
+	def tearDown(self):
+		os.chdir(self.cwd)
+		shutil.rmtree(self.workdir)
+		benchmark._execpool = None
+
+	def test_runs(self):
+		runApps(self.apps, ['multirun', 'single'], [], [(False, 'net.nsa')], 0, 10, runs=3)
+		self.assertEqual(sorted(self.calls), [('multirun', 3), ('single', None)])
+
+	def test_single_run(self):
+		runApps(self.apps, ['multirun', 'single'], [], [(False, 'net.nsa')], 0, 10)
+		self.assertEqual(sorted(self.calls), [('multirun', 1), ('single', None)])
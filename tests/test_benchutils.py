@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+\descr: Tests of the benchmark utilities (benchutils.py).
+"""
+from __future__ import print_function  # Required for stderr output, must be the first import
+import os
+import shutil
+import tempfile
+import unittest
+
+from contrib.mpepool import Job
+from benchutils import ResultsCache
+
+
+class TestResultsCache(unittest.TestCase):
+	"""Keys of the cached results"""
+	def setUp(self):
+		self.workdir = tempfile.mkdtemp()
+		self.rcache = ResultsCache(os.path.join(self.workdir, 'cache/'))
+		self.write('app.py', 'import sys, helper as hlp\n')
+		self.write('helper.py', 'from subhelper import value\n')
+		self.write('subhelper.py', 'value = 1\n')
+		self.write('net.nsl', '1 2\n')
+
+	def tearDown(self):
+		shutil.rmtree(self.workdir)
+
+	def write(self, fname, text):
+		with open(os.path.join(self.workdir, fname), 'w') as fout:
+			fout.write(text)
+
+	def key(self, **kwargs):
+		"""Key of the pycall job of the app on the network"""
+		job = Job(name='app', workdir=self.workdir, pycall=('app', 'main', ('net.nsl',)), **kwargs)
+		return self.rcache.jobKey(job, (os.path.join(self.workdir, 'net.nsl'),))
+
+	def test_local_imports(self):
+		self.assertEqual(self.rcache.localImports(os.path.join(self.workdir, 'app.py'))
+			, [os.path.join(self.workdir, 'helper.py')])
+
+	def test_stable(self):
+		self.assertEqual(self.key(), self.key())
+
+	def test_input(self):
+		key = self.key()
+		self.write('net.nsl', '1 2\n2 3\n')
+		self.assertNotEqual(self.key(), key)
+
+	def test_imported_module(self):
+		key = self.key()
+		self.write('helper.py', 'from subhelper import value  # Updated\n')
+		self.assertNotEqual(self.key(), key)
+
+	def test_transitively_imported_module(self):
+		key = self.key()
+		self.write('subhelper.py', 'value = 2  # Updated\n')
+		self.assertNotEqual(self.key(), key)
+
+	def test_args(self):
+		job = Job(name='app', workdir=self.workdir, pycall=('app', 'main', ('net.nsl', '-x')))
+		self.assertNotEqual(self.rcache.jobKey(job, (os.path.join(self.workdir, 'net.nsl'),)), self.key())
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+\descr: Tests of the Louvain igraph wrapper (algorithms/louvain_igraph.py), which are skipped
+	if igraph is not installed.
+"""
+from __future__ import print_function  # Required for stderr output, must be the first import
+import unittest
+
+import numpy as np
+
+import hgb
+try:
+	import igraph as ig
+	import louvain_igraph
+except ImportError:
+	louvain_igraph = None
+
+
+@unittest.skipIf(louvain_igraph is None, 'igraph is not installed')
+class TestBinGraph(unittest.TestCase):
+	"""The igraph Graph of the binary network"""
+	def test_links(self):
+		# Edges 1-2 (weight 2), 2-3 stored in both directions and the self-link 3-3
+		bgraph = hgb.Graph(np.array(['1', '2', '3']), np.array([0, 1, 3, 5], dtype=np.int64)
+			, np.array([1, 0, 2, 1, 2], dtype=np.int32), np.array([2, 2, 1, 1, 0.5], dtype=np.float32))
+		graph = louvain_igraph.binGraph(bgraph)
+		self.assertFalse(graph.is_directed())
+		self.assertEqual(graph.vs['name'], ['1', '2', '3'])
+		self.assertEqual({(e.source, e.target): e['weight'] for e in graph.es}
+			, {(0, 1): 2., (1, 2): 1., (2, 2): 0.5})
+
+	def test_parsed(self):
+		# Symmetric adjacency matrix of the parsed network with the edges 1-2 (weight 2), 2-3
+		arrays = {'ids': np.array(['1', '2', '3']), 'indptr': np.array([0, 1, 3, 4], dtype=np.int32)
+			, 'indices': np.array([1, 0, 2, 1], dtype=np.int32), 'data': np.array([2, 2, 1, 1], dtype=np.float64)}
+		graph = louvain_igraph.buildGraph(arrays)
+		self.assertEqual(graph.vs['name'], ['1', '2', '3'])
+		self.assertEqual({(e.source, e.target): e['weight'] for e in graph.es}, {(0, 1): 2., (1, 2): 1.})
+
+
+
+@unittest.skipIf(louvain_igraph is None, 'igraph is not installed')
+class TestLouvainRun(unittest.TestCase):
+	"""Clustering of the permuted graph mapped back to the original vertices"""
+	def test_permuted(self):
+		# Two 4-cliques (vertices 0-3 and 4-7) joined by the edge 3-4
+		edges = [(i, j) for base in (0, 4) for i in range(base, base + 4) for j in range(i + 1, base + 4)]
+		graph = ig.Graph(n=8, edges=edges + [(3, 4)])
+		for run in range(1, 4):
+			hier = louvain_igraph.louvainRun(graph, run, run)
+			membership = hier[-1].membership
+			self.assertIs(hier[-1].graph, graph)
+			self.assertEqual(len(set(membership[:4])), 1)
+			self.assertEqual(len(set(membership[4:])), 1)
+			self.assertNotEqual(membership[0], membership[4])
+			self.assertAlmostEqual(hier[-1].q, graph.modularity(membership))
+
+
+if __name__ == '__main__':
+	unittest.main()
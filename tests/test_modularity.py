@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+\descr: Tests of the native modularity (algorithms/modularity.py).
+"""
+from __future__ import print_function  # Required for stderr output, must be the first import
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from benchutils import parseFloat
+from onmi import loadCover
+import parsecache
+from modularity import loadNet, modularity
+
+_ALGSDIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'algorithms')
+# Two triangles joined by the edge 3-4
+_NETWORK = '/Nodes 6\n/Edges\n1> 2 3\n2> 3\n3> 4\n4> 5 6\n5> 6\n'
+
+
+class TestModularity(unittest.TestCase):
+	"""Modularity of the non-overlapping and overlapping clusterings"""
+	def setUp(self):
+		self.workdir = tempfile.mkdtemp()
+		self.netfile = self.write('net.hig', _NETWORK)
+		self.cachedir = parsecache._CACHEDIR
+		parsecache._CACHEDIR = os.path.join(self.workdir, 'cache')
+
+	def tearDown(self):
+		parsecache._CACHEDIR = self.cachedir
+		shutil.rmtree(self.workdir)
+
+	def write(self, fname, text):
+		fname = os.path.join(self.workdir, fname)
+		with open(fname, 'w') as fout:
+			fout.write(text)
+		return fname
+
+	def evaluate(self, clusters):
+		"""Modularity of the clusters"""
+		nodes, adj = loadNet(self.netfile)
+		return modularity(adj, loadCover(self.write('cls.cnl', clusters), nodes.copy()))
+
+	def test_standard(self):
+		self.assertAlmostEqual(self.evaluate('1 2 3\n4 5 6\n'), 5 / 14.)
+
+	def test_single(self):
+		self.assertAlmostEqual(self.evaluate('1 2 3 4 5 6\n'), 0.)
+
+	def test_weighted_nse(self):
+		# The same network in the .nse format with the doubled weights
+		self.netfile = self.write('net.nse', '1 2 2\n1 3 2\n2 3 2\n3 4 2\n4 5 2\n4 6 2\n5 6 2\n')
+		self.assertAlmostEqual(self.evaluate('1 2 3\n4 5 6\n'), 5 / 14.)
+
+	def test_binary(self):
+		# The fresh binary form of the network is used instead of the network file
+		self.netfile = self.write('net.nse', '1 2 2\n1 3 2\n2 3 2\n3 4 2\n4 5 2\n4 6 2\n5 6 2\n')
+		with open(os.devnull, 'w') as fnull:
+			subprocess.check_call((sys.executable, os.path.join(os.path.dirname(_ALGSDIR), 'contrib', 'tohig.py')
+				, self.netfile, '-f=nse', '-b'), stdout=fnull, stderr=fnull)
+		self.assertAlmostEqual(self.evaluate('1 2 3\n4 5 6\n'), 5 / 14.)
+		# The network is replaced by the single triangle, so the binary form is outdated
+		self.write('net.nse', '1 2 1\n1 3 1\n2 3 1\n')
+		mtime = os.path.getmtime(self.netfile) + 10
+		os.utime(self.netfile, (mtime, mtime))
+		self.assertAlmostEqual(self.evaluate('1 2 3\n'), 0.)
+
+	def test_cached(self):
+		self.evaluate('1 2 3\n4 5 6\n')
+		# The binary form is stored in the cache dir rather than next to the network
+		self.assertEqual(sorted(os.listdir(self.workdir)), ['cache', 'cls.cnl', 'net.hig'])
+		self.assertTrue(os.path.exists(parsecache.binName(self.netfile, 'parseNet')))
+		# Networks with the same name in distinct dirs have distinct binary forms
+		self.assertNotEqual(parsecache.binName(self.netfile, 'parseNet')
+			, parsecache.binName(os.path.join(self.workdir, 'sub', 'net.hig'), 'parseNet'))
+
+	def test_overlapping(self):
+		# Node 3 is shared by both clusters, each cluster has the 1/2 share of its membership
+		self.assertAlmostEqual(self.evaluate('1 2 3\n3 4 5 6\n'), 11 / 14. - (5.5 / 14) ** 2 - (8.5 / 14) ** 2)
+
+	def test_hirecs(self):
+		hirecs = os.path.join(_ALGSDIR, 'hirecs')
+		if not os.access(hirecs, os.X_OK):
+			self.skipTest('hirecs is not available')
+		clusters = '1 2 3\n4 5 6\n'
+		try:
+			res = subprocess.check_output((hirecs, '-e=' + self.write('cls.cnl', clusters), self.netfile)
+				, cwd=_ALGSDIR, stderr=open(os.devnull, 'w'))
+		except (OSError, subprocess.CalledProcessError) as err:
+			self.skipTest('hirecs is not executable: {}'.format(err))
+		targpref = 'mod: '
+		self.assertTrue(res.startswith(targpref))
+		self.assertAlmostEqual(self.evaluate(clusters), parseFloat(res[len(targpref):])[0], 6)
@@ -0,0 +1,338 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+\descr: Tests of the execution pool (contrib/mpepool.py): completion status of the jobs
+	and their dependencies, the execution by the persistent Python worker and the jobs journal.
+"""
+from __future__ import print_function  # Required for stderr output, must be the first import
+import os
+import json
+import shutil
+import tempfile
+import time
+import unittest
+
+from contrib.mpepool import ExecPool, Job, Task
+
+
+class TestJobStatus(unittest.TestCase):
+	"""Completion status of the jobs and the release of their dependents"""
+	def setUp(self):
+		self.pool = ExecPool(2)
+		self.done = []  # Names of the jobs which ondone callbacks are called
+
+	def tearDown(self):
+		del self.pool
+
+	def ondone(self, job):
+		self.done.append(job.name)
+
+	def job(self, name, code=0, **kwargs):
+		"""Job exiting with the specified code"""
+		return Job(name=name, args=('sh', '-c', 'exit {}'.format(code)), ondone=self.ondone, **kwargs)
+
+	def test_success(self):
+		job = self.job('ok')
+		self.pool.execute(job)
+		self.assertTrue(self.pool.join(10))
+		self.assertEqual(job.retcode, 0)
+		self.assertTrue(job.graceful)
+		self.assertEqual(self.done, ['ok'])
+
+	def test_failure(self):
+		job = self.job('fail', 3)
+		self.pool.execute(job)
+		self.pool.join(10)
+		self.assertEqual(job.retcode, 3)
+		self.assertFalse(job.graceful)
+		self.assertEqual(self.done, [])
+
+	def test_sync_failure(self):
+		job = self.job('fail', 3)
+		self.assertEqual(self.pool.execute(job, async=False), 3)
+		self.assertFalse(job.graceful)
+		self.assertEqual(self.done, [])
+
+	def test_failed_prerequisite(self):
+		prereq = self.job('prereq', 3)
+		dep = self.job('dep', deps=(prereq,))
+		self.pool.execute(prereq)
+		self.pool.execute(dep)
+		self.pool.join(10)
+		self.assertFalse(prereq.graceful)
+		self.assertFalse(dep.graceful)
+		self.assertIsNone(dep.tstart, 'The dependent job should not be started')
+		self.assertEqual(self.done, [])
+
+	def test_succeeded_prerequisite(self):
+		prereq = self.job('prereq')
+		dep = self.job('dep', deps=(prereq,))
+		self.pool.execute(prereq)
+		self.pool.execute(dep)
+		self.pool.join(10)
+		self.assertTrue(dep.graceful)
+		self.assertEqual(self.done, ['prereq', 'dep'])
+
+	def test_failed_prerequisite_task(self):
+		task = Task('task')
+		jobs = [self.job('ok', task=task), self.job('fail', 3, task=task)]
+		dep = self.job('dep', deps=(task,))
+		for job in jobs:
+			self.pool.execute(job)
+		self.pool.execute(dep)
+		self.pool.join(10)
+		self.assertFalse(dep.graceful)
+		self.assertIsNone(dep.tstart, 'The dependent job should not be started')
+		self.assertEqual(self.done, ['ok'])
+
+
+
+class TestPyCall(unittest.TestCase):
+	"""Status and resources consumption of the calls executed by the persistent Python worker"""
+	def setUp(self):
+		self.pool = ExecPool(1)  # The same worker executes all calls
+		self.done = []
+
+	def tearDown(self):
+		del self.pool
+
+	def ondone(self, job):
+		self.done.append(job.name)
+
+	def job(self, name, function, *args):
+		return Job(name=name, workdir=os.path.dirname(os.path.abspath(__file__))
+			, pycall=('pycalls', function, args), ondone=self.ondone)
+
+	def test_success(self):
+		job = self.job('ok', 'succeed')
+		self.pool.execute(job)
+		self.assertTrue(self.pool.join(10))
+		self.assertEqual(job.retcode, 0)
+		self.assertTrue(job.graceful)
+		self.assertEqual(self.done, ['ok'])
+
+	def test_exception(self):
+		job = self.job('fail', 'fail')
+		job.stderr = os.devnull
+		dep = Job(name='dep', args=('true',), deps=(job,), ondone=self.ondone)
+		self.pool.execute(job)
+		self.pool.execute(dep)
+		self.pool.join(10)
+		self.assertEqual(job.retcode, 1)
+		self.assertFalse(job.graceful)
+		self.assertIsNone(dep.tstart, 'The dependent job should not be started')
+		self.assertEqual(self.done, [])
+
+	def test_exit(self):
+		jobs = (self.job('exit0', 'exitWith', 0), self.job('exit2', 'exitWith', 2))
+		for job in jobs:
+			self.pool.execute(job)
+		self.pool.join(10)
+		self.assertEqual([job.graceful for job in jobs], [True, False])
+		self.assertEqual(self.done, ['exit0'])
+
+	def test_rss_per_call(self):
+		big = self.job('big', 'allocate', 96)
+		small = self.job('small', 'allocate', 1)
+		self.pool.execute(big)
+		self.pool.execute(small)
+		self.assertTrue(self.pool.join(20))
+		self.assertEqual(self.done, ['big', 'small'])
+		if big.rssmem is None:
+			self.skipTest('The peak RSS of the calls is not available')
+		self.assertGreater(big.rssmem, 96)
+		# The peak of the previous call is not attributed to the next one
+		self.assertLess(small.rssmem, big.rssmem - 64)
+
+
+class TestJournal(unittest.TestCase):
+	"""Restoration of the jobs completed in the former execution"""
+	def setUp(self):
+		self.workdir = tempfile.mkdtemp()
+		self.journal = os.path.join(self.workdir, 'jobs.jnl')
+
+	def tearDown(self):
+		shutil.rmtree(self.workdir)
+
+	def execute(self, restore, codes, **kwargs):
+		"""Execute the jobs exiting with the specified codes
+
+		restore  - whether to restore the jobs from the journal
+		codes  - exit codes of the jobs
+
+		return  - executed jobs
+		"""
+		pool = ExecPool(2, journal=self.journal, restore=restore)
+		jobs = [Job(name='job{}'.format(i), workdir=self.workdir
+			, args=('sh', '-c', 'echo {0} >> job{0}.out; exit {1}'.format(i, code)), **kwargs)
+			for i, code in enumerate(codes)]
+		for job in jobs:
+			pool.execute(job)
+		pool.join(10)
+		del pool
+		return jobs
+
+	def runs(self, i):
+		"""The number of executions of the job"""
+		with open(os.path.join(self.workdir, 'job{}.out'.format(i))) as fout:
+			return len(fout.readlines())
+
+	def test_restore(self):
+		self.execute(False, (0, 3))
+		jobs = self.execute(True, (0, 3))
+		# Only the successfully completed job is restored
+		self.assertEqual([self.runs(i) for i in range(2)], [1, 2])
+		self.assertIsNone(jobs[0].tstart)
+		self.assertTrue(jobs[0].graceful)
+		self.assertFalse(jobs[1].graceful)
+
+	def test_failed_record(self):
+		self.execute(False, (3,))
+		with open(self.journal) as fjnl:
+			statuses = [json.loads(ln)['status'] for ln in fjnl]
+		self.assertEqual(statuses, ['started', 'failed'])
+
+	def test_reset(self):
+		self.execute(False, (0,))
+		self.execute(False, (0,))
+		self.assertEqual(self.runs(0), 2)
+
+	def test_removed_output(self):
+		outp = os.path.join(self.workdir, 'job0.out')
+		self.execute(False, (0,), outputs=(outp,))
+		os.remove(outp)
+		jobs = self.execute(True, (0,), outputs=(outp,))
+		# The job is rerun to recreate its output
+		self.assertIsNotNone(jobs[0].tstart)
+		self.assertEqual(self.runs(0), 1)
+
+	def test_modified_output(self):
+		outp = os.path.join(self.workdir, 'job0.out')
+		self.execute(False, (0,), outputs=(outp,))
+		with open(outp, 'a') as fout:
+			fout.write('0\n')
+		self.execute(True, (0,), outputs=(outp,))
+		self.assertEqual(self.runs(0), 3)
+
+	def test_intact_output(self):
+		outdir = os.path.join(self.workdir, 'outdir')
+		os.mkdir(outdir)
+		with open(os.path.join(outdir, 'res.cnl'), 'w') as fout:
+			fout.write('1 2\n')
+		self.execute(False, (0,), outputs=(outdir,))
+		jobs = self.execute(True, (0,), outputs=(outdir,))
+		self.assertIsNone(jobs[0].tstart)
+		self.assertEqual(self.runs(0), 1)
+		# Removal of a file from the output dir invalidates the job
+		os.remove(os.path.join(outdir, 'res.cnl'))
+		self.execute(True, (0,), outputs=(outdir,))
+		self.assertEqual(self.runs(0), 2)
+
+	def test_not_journaled(self):
+		self.execute(False, (0,), journal=False)
+		self.execute(True, (0,), journal=False)
+		self.assertEqual(self.runs(0), 2)
+		self.assertFalse(os.path.getsize(self.journal))
+
+
+class TestMemLimit(unittest.TestCase):
+	"""Admission of the jobs by the memory limit"""
+	def job(self, name, memory):
+		return Job(name=name, args=('sleep', '0.3'), memory=memory)
+
+	def execute(self, memlimit, memories, memwait=None, memscan=None):
+		"""Execute the jobs with the expected memory consumption by the pool with the memory limit
+
+		memwait  - waiting time of the postponed job before the memory reservation
+		memscan  - max number of the postponed jobs scanned per revision
+
+		return  - executed jobs
+		"""
+		pool = ExecPool(2, memlimit=memlimit)
+		if memwait is not None:
+			pool._memwait = memwait
+		if memscan is not None:
+			pool._memscan = memscan
+		jobs = [self.job('job{}'.format(i), memory) for i, memory in enumerate(memories)]
+		for job in jobs:
+			pool.execute(job)
+		self.assertTrue(pool.join(10))
+		del pool
+		return jobs
+
+	def test_postponed(self):
+		first, second = self.execute(100, (80, 80))
+		# The second job does not fit the limit while the first one is executed
+		self.assertGreaterEqual(second.tstart, first.tstop)
+		self.assertTrue(second.graceful)
+
+	def test_fitting(self):
+		first, second = self.execute(200, (80, 80))
+		self.assertLess(second.tstart, first.tstop)
+
+	def test_bypassed(self):
+		first, large, small, last = self.execute(100, (60, 80, 30, 30))
+		# The smaller jobs are started while the large one does not fit the limit
+		self.assertLess(small.tstart, first.tstop)
+		self.assertLess(last.tstart, large.tstart)
+
+	def test_reserved(self):
+		first, large, small, last = self.execute(100, (60, 80, 30, 30), memwait=0)
+		# The large job waiting too long is not starved by the subsequent smaller jobs
+		self.assertLess(small.tstart, first.tstop)
+		self.assertGreaterEqual(last.tstart, large.tstop)
+
+	def test_bounded_scan(self):
+		first, large, small = self.execute(100, (60, 80, 30), memscan=1)
+		# The scan is stopped by the postponed large job
+		self.assertGreaterEqual(small.tstart, large.tstart)
+
+	def test_exceeding_alone(self):
+		# The job exceeding the limit is started when there are no other workers
+		job, = self.execute(100, (500,))
+		self.assertTrue(job.graceful)
+
+
+class TestTimeout(unittest.TestCase):
+	"""Termination of the jobs by the timeout"""
+	def setUp(self):
+		self.workdir = tempfile.mkdtemp()
+		self.pool = ExecPool(2)
+		self.done = []
+
+	def tearDown(self):
+		del self.pool
+		shutil.rmtree(self.workdir)
+
+	def ondone(self, job):
+		self.done.append(job.name)
+
+	def test_terminated(self):
+		job = Job(name='slow', args=('sleep', '30'), timeout=0.5, ondone=self.ondone)
+		dep = Job(name='dep', args=('true',), deps=(job,), ondone=self.ondone)
+		tstart = time.time()
+		self.pool.execute(job)
+		self.pool.execute(dep)
+		self.pool.join(20)
+		self.assertLess(time.time() - tstart, 15)
+		self.assertFalse(job.graceful)
+		self.assertIsNone(dep.tstart, 'The dependent job should not be started')
+		self.assertEqual(self.done, [])
+
+	def test_restarted(self):
+		# The job is completed quickly only on the restart
+		job = Job(name='restarted', workdir=self.workdir, timeout=0.5, ontimeout=True, ondone=self.ondone
+			, args=('sh', '-c', 'echo >> runs; [ $(wc -l < runs) -gt 1 ] || sleep 30'))
+		self.pool.execute(job)
+		self.assertTrue(self.pool.join(20))
+		self.assertTrue(job.graceful)
+		self.assertEqual(self.done, ['restarted'])
+		with open(os.path.join(self.workdir, 'runs')) as fruns:
+			self.assertEqual(len(fruns.readlines()), 2)
+
+	def test_pool_timeout(self):
+		job = Job(name='slow', args=('sleep', '30'), ondone=self.ondone)
+		self.pool.execute(job)
+		self.assertFalse(self.pool.join(0.5))
+		self.assertFalse(job.graceful)
+		self.assertEqual(self.done, [])
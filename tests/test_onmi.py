@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+\descr: Tests of the native overlapping NMI (algorithms/onmi.py) against the reference values.
+"""
+from __future__ import print_function  # Required for stderr output, must be the first import
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+from onmi import groundTruth, loadCover, nmis
+import parsecache
+
+_ONMISUM = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'algorithms', 'onmi_sum')
+# Overlapping clusterings of 9 nodes and their NMIs according to the definition by McDaid et al.,
+# NMI_sum is also yielded by the onmi_sum app
+_GROUNDTRUTH = '1 2 3 4\n5 6 7 8\n3 5\n'
+_CLUSTERS = '1 2 3\n4 5 6 7 8\n2 9\n'
+_NMIMAX = 0.418378
+_NMISUM = 0.423996
+
+
+class TestOnmi(unittest.TestCase):
+	"""NMI_max and NMI_sum of the overlapping clusterings"""
+	def setUp(self):
+		self.workdir = tempfile.mkdtemp()
+		self.gtfile = self.write('gt.cnl', _GROUNDTRUTH)
+		self.cachedir = parsecache._CACHEDIR
+		parsecache._CACHEDIR = os.path.join(self.workdir, 'cache')
+
+	def tearDown(self):
+		parsecache._CACHEDIR = self.cachedir
+		shutil.rmtree(self.workdir)
+
+	def write(self, fname, text):
+		fname = os.path.join(self.workdir, fname)
+		with open(fname, 'w') as fout:
+			fout.write(text)
+		return fname
+
+	def evaluate(self, clusters):
+		"""NMI_max, NMI_sum of the clusters to the ground truth"""
+		gtnodes, gtcover = groundTruth(self.gtfile)
+		nodes = gtnodes.copy()
+		cover = loadCover(self.write('cls.cnl', clusters), nodes)
+		return nmis(gtcover, cover, len(nodes))
+
+	def test_reference(self):
+		nmimax, nmisum = self.evaluate(_CLUSTERS)
+		self.assertAlmostEqual(nmimax, _NMIMAX, 6)
+		self.assertAlmostEqual(nmisum, _NMISUM, 6)
+
+	def test_symmetric(self):
+		self.gtfile = self.write('gt.cnl', _CLUSTERS)
+		nmimax, nmisum = self.evaluate(_GROUNDTRUTH)
+		self.assertAlmostEqual(nmimax, _NMIMAX, 6)
+		self.assertAlmostEqual(nmisum, _NMISUM, 6)
+
+	def test_identical(self):
+		self.assertEqual(self.evaluate(_GROUNDTRUTH), (1., 1.))
+
+	def test_onmi_sum(self):
+		if not os.access(_ONMISUM, os.X_OK):
+			self.skipTest('onmi_sum is not available')
+		try:
+			res = subprocess.check_output((_ONMISUM, self.write('cls.cnl', _CLUSTERS), self.gtfile)
+				, stderr=open(os.devnull, 'w'))
+		except (OSError, subprocess.CalledProcessError) as err:
+			self.skipTest('onmi_sum is not executable: {}'.format(err))
+		self.assertAlmostEqual(self.evaluate(_CLUSTERS)[1], float(res.split()[0]), 6)
@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+\descr: Tests of the random disjoint clustering (algorithms/randcommuns.py).
+"""
+from __future__ import print_function  # Required for stderr output, must be the first import
+import os
+import shutil
+import tempfile
+import unittest
+
+import parsecache
+from randcommuns import randcommuns
+
+
+class TestRandcommuns(unittest.TestCase):
+	"""Random disjoint clusters of the network loaded from the parsed files cache"""
+	def setUp(self):
+		self.workdir = tempfile.mkdtemp()
+		self.cachedir = parsecache._CACHEDIR
+		parsecache._CACHEDIR = os.path.join(self.workdir, 'cache')
+
+	def tearDown(self):
+		parsecache._CACHEDIR = self.cachedir
+		shutil.rmtree(self.workdir)
+
+	def write(self, fname, text):
+		fname = os.path.join(self.workdir, fname)
+		with open(fname, 'w') as fout:
+			fout.write(text)
+		return fname
+
+	def test_partition(self):
+		# Arcs of the two triangles joined by the arc 3-4, ground truth of the 3 clusters
+		netfile = self.write('net.nsa', '1 2\n2 3\n3 1\n3 4\n4 5\n5 6\n6 4\n')
+		gtfile = self.write('net.cnl', '1 2\n3 4\n5 6\n')
+		outdir = os.path.join(self.workdir, 'res', 'net')
+		randcommuns('-g=' + gtfile, '-i=' + netfile, '-o=' + outdir, '-n=2', '-r=7')
+		for num in range(2):
+			with open(os.path.join(outdir, 'net_{}.cnl'.format(num))) as fcls:
+				clusters = [ln.split() for ln in fcls]
+			self.assertEqual([len(cl) for cl in clusters], [2, 2, 2])
+			self.assertEqual(sorted(nd for cl in clusters for nd in cl), ['1', '2', '3', '4', '5', '6'])
+		self.assertTrue(os.path.exists(parsecache.binName(netfile, 'parseNet')))
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+\descr: Tests of the k-clique percolation (algorithms/scp.py): the single pass over the range
+	of clique sizes yields the same communities as the separate passes per each clique size.
+"""
+from __future__ import print_function  # Required for stderr output, must be the first import
+import os
+import sys
+import glob
+import random
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+_SCP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'algorithms', 'scp.py')
+
+
+class TestScp(unittest.TestCase):
+	"""Communities of the range of clique sizes"""
+	def setUp(self):
+		self.workdir = tempfile.mkdtemp()
+		self.netfile = os.path.join(self.workdir, 'net.nse')
+		# Random weighted network dense enough to have the cliques of all evaluating sizes
+		rand = random.Random(7)
+		with open(self.netfile, 'w') as fnet:
+			for src in range(1, 31):
+				for dst in range(src + 1, 31):
+					if rand.random() < 0.5:
+						fnet.write('{} {} {}\n'.format(src, dst, rand.randint(1, 9)))
+
+	def tearDown(self):
+		shutil.rmtree(self.workdir)
+
+	def execute(self, ks, outdir):
+		"""Execute scp outputting the levels of the communities
+
+		ks  - clique size or the range of clique sizes: kmin-kmax
+		outdir  - output dir
+
+		return  - {<file name>: <communities>}, where communities are the set of the nodes sets
+		"""
+		os.mkdir(os.path.join(self.workdir, outdir))
+		with open(os.devnull, 'w') as fnull:
+			subprocess.check_call((sys.executable, _SCP, self.netfile, ks, '10'
+				, os.path.join(self.workdir, outdir, 'net!k{k}.cnl')), stdout=fnull, stderr=fnull)
+		levels = {}
+		for fname in glob.glob(os.path.join(self.workdir, outdir, '*.cnl')):
+			with open(fname) as fcls:
+				levels[os.path.split(fname)[1]] = frozenset(frozenset(ln.split()) for ln in fcls if ln.strip())
+		return levels
+
+	def test_range(self):
+		levels = self.execute('3-6', 'range')
+		perk = {}
+		for k in range(3, 7):
+			perk.update(self.execute(str(k), 'k{}'.format(k)))
+		self.assertTrue(levels)
+		self.assertEqual(set(os.path.splitext(fname)[0].split('_')[0] for fname in levels)
+			, set('net!k{}'.format(k) for k in range(3, 7)))
+		self.assertEqual(levels, perk)
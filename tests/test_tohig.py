@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+\descr: Tests of the networks conversion (contrib/tohig.py): the streaming (-m) and parallel (-p)
+	conversions and the binary form (.hgb) loaded by algorithms/hgb.py.
+"""
+from __future__ import print_function  # Required for stderr output, must be the first import
+import os
+import sys
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+import hgb
+from modularity import parseLinks
+
+_TOHIG = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'contrib', 'tohig.py')
+# Weighted edges with the duplicated link and the self-link
+_NETWORK = '# Test network\n1 2 0.5\n2 3 1\n3 1 2\n1 2 0.5\n4 3 1\n5 5 1\n2 4 1\n'
+# Expected links: {(src, dst): weight}, edges are specified in both directions
+_LINKS = {('1', '2'): 0.5, ('2', '1'): 0.5, ('2', '3'): 1., ('3', '2'): 1., ('1', '3'): 2., ('3', '1'): 2.
+	, ('3', '4'): 1., ('4', '3'): 1., ('2', '4'): 1., ('4', '2'): 1., ('5', '5'): 1.}
+
+
+class TestTohig(unittest.TestCase):
+	"""Conversion of the network to the .hig and .hgb"""
+	def setUp(self):
+		self.workdir = tempfile.mkdtemp()
+		self.netfile = os.path.join(self.workdir, 'net.nse')
+		self.write(_NETWORK)
+
+	def write(self, network):
+		with open(self.netfile, 'w') as fnet:
+			fnet.write(network)
+
+	def tearDown(self):
+		shutil.rmtree(self.workdir)
+
+	def convert(self, *args):
+		"""Convert the network resolving the duplicated links
+
+		return  - links of the .hig and .hgb: {(src, dst): weight}
+		"""
+		with open(os.devnull, 'w') as fnull:
+			subprocess.check_call((sys.executable, _TOHIG, self.netfile, '-f=nse', '-r', '-b') + args
+				, stdout=fnull, stderr=fnull)
+		return self.higLinks(), self.hgbLinks()
+
+	def higLinks(self):
+		"""Links of the .hig"""
+		nodes, srcs, dsts, weights, arcs = parseLinks(os.path.join(self.workdir, 'net.hig'))
+		ids = {i: nid for nid, i in nodes.iteritems()}
+		links = {}
+		for src, dst, weight, arc in zip(srcs, dsts, weights, arcs):
+			links[(ids[src], ids[dst])] = weight
+			if not arc:
+				links[(ids[dst], ids[src])] = weight
+		self.assertEqual(len(srcs), 6, 'Each link should be specified once')
+		return links
+
+	def hgbLinks(self):
+		"""Links of the .hgb"""
+		graph = hgb.load(hgb.binName(self.netfile))
+		self.assertIsNotNone(graph.weights)
+		links = {}
+		for i, src in enumerate(graph.ids):
+			for j in range(graph.offsets[i], graph.offsets[i + 1]):
+				links[(src, graph.ids[graph.neighbors[j]])] = float(graph.weights[j])
+		self.assertEqual(len(links), graph.offsets[-1], 'The links should be unique')
+		return links
+
+	def test_inmemory(self):
+		self.assertEqual(self.convert(), (_LINKS, _LINKS))
+
+	def test_streaming(self):
+		self.assertEqual(self.convert('-m=2'), (_LINKS, _LINKS))
+
+	def test_parallel(self):
+		self.assertEqual(self.convert('-p=2', '-m=2'), (_LINKS, _LINKS))
+
+	def test_parallel_implied_streaming(self):
+		self.assertEqual(self.convert('-p=3'), (_LINKS, _LINKS))
+
+	def test_backward_duplicates(self):
+		# The edge specified in both directions is resolved by the sorted runs
+		self.write(_NETWORK + '3 2 1\n')
+		self.assertEqual(self.convert('-m=2'), (_LINKS, _LINKS))
+		self.assertEqual(self.convert('-p=2', '-m=3'), (_LINKS, _LINKS))
+
+	def test_fresh_binary(self):
+		self.convert()
+		self.assertIsNotNone(hgb.loadFresh(self.netfile))
+		# The binary form is outdated by the modified network
+		mtime = os.path.getmtime(hgb.binName(self.netfile)) + 10
+		os.utime(self.netfile, (mtime, mtime))
+		self.assertIsNone(hgb.loadFresh(self.netfile))
+
+	def test_sink_nodes(self):
+		# Arcs to the nodes without the outbound links, which have empty ranges in the CSR
+		self.write('1 2 0.5\n1 3 1\n4 2 2\n')
+		with open(os.devnull, 'w') as fnull:
+			subprocess.check_call((sys.executable, _TOHIG, self.netfile, '-f=nsa', '-b', '-m=2')
+				, stdout=fnull, stderr=fnull)
+		self.assertEqual(self.hgbLinks(), {('1', '2'): 0.5, ('1', '3'): 1., ('4', '2'): 2.})
+
+	def test_unweighted(self):
+		with open(os.devnull, 'w') as fnull:
+			subprocess.check_call((sys.executable, _TOHIG, self.netfile, '-f=nse', '-r', '-b', '-u', '-m=2')
+				, stdout=fnull, stderr=fnull)
+		graph = hgb.load(hgb.binName(self.netfile))
+		self.assertIsNone(graph.weights)
+		self.assertEqual(sorted(graph.ids), ['1', '2', '3', '4', '5'])